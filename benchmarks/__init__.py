@@ -0,0 +1,7 @@
+"""
+envcon benchmarks, stdlib only. run all of them with `python -m benchmarks`, see `python -m benchmarks --help`.
+"""
+from . import suite  # noqa: F401 registers the benchmarks
+from .runner import Benchmark, Result, benchmark, benchmarks, run
+
+__all__ = ["Benchmark", "Result", "benchmark", "benchmarks", "run"]
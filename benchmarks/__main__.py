@@ -0,0 +1,33 @@
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from . import run
+from .runner import Result, format_result, load_json, to_json
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="measure envcon hot paths")
+    parser.add_argument("selected", nargs="*", help="run only the benchmarks whose name starts with these")
+    parser.add_argument("--json", metavar="PATH", help="save the results to PATH, to compare commits later")
+    parser.add_argument("--compare", metavar="PATH", help="print the change relative to results saved with --json")
+    parser.add_argument("--repeat", type=int, default=5, help="timings per case, the best one is kept")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing, at least")
+    args = parser.parse_args(argv)
+
+    baseline = load_json(args.compare) if args.compare else None
+
+    def report(result: Result) -> None:
+        print(format_result(result, baseline), flush=True)
+
+    results = run(args.selected, repeat=args.repeat, min_time=args.min_time, report=report)
+    if not results:
+        sys.exit(f"no benchmark matches {args.selected}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(to_json(results), file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
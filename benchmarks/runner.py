@@ -0,0 +1,141 @@
+import datetime
+import itertools
+import json
+import platform
+import subprocess
+import timeit
+from typing import Any, Callable, Dict, Generator, Iterable, List, NamedTuple, Optional, Sequence
+
+# a benchmark is a generator function: it sets up, yields the timer of the measured operation, then tears down
+BenchmarkFunction = Callable[..., Generator[timeit.Timer, None, None]]
+
+
+class Benchmark(NamedTuple):
+    name: str
+    function: BenchmarkFunction
+    params: Dict[str, Sequence[Any]]
+
+    def cases(self) -> Iterable[Dict[str, Any]]:
+        names = list(self.params)
+        for values in itertools.product(*(self.params[name] for name in names)):
+            yield dict(zip(names, values))
+
+
+class Result(NamedTuple):
+    name: str
+    params: Dict[str, Any]
+    seconds: float  # best time of a single operation
+    operations: int  # operations timed per repeat
+
+    @property
+    def full_name(self) -> str:
+        return _full_name(self.name, self.params)
+
+
+benchmarks: List[Benchmark] = []
+
+
+def benchmark(name: str, **params: Sequence[Any]) -> Callable[[BenchmarkFunction], BenchmarkFunction]:
+    """
+    register a benchmark, measured once per combination of `params` values
+    """
+
+    def register(function: BenchmarkFunction) -> BenchmarkFunction:
+        benchmarks.append(Benchmark(name, function, params))
+        return function
+
+    return register
+
+
+def run(
+    selected: Optional[Sequence[str]] = None,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    report: Callable[[Result], None] = lambda result: None,
+) -> List[Result]:
+    """
+    run the registered benchmarks whose name starts with one of `selected` (all by default).
+    each case is timed `repeat` times, with enough operations per repeat to take about `min_time` seconds.
+    """
+    results = []
+    for registered in benchmarks:
+        if selected and not any(registered.name.startswith(prefix) for prefix in selected):
+            continue
+        for params in registered.cases():
+            result = _run_case(registered, params, repeat, min_time)
+            report(result)
+            results.append(result)
+    return results
+
+
+def _run_case(registered: Benchmark, params: Dict[str, Any], repeat: int, min_time: float) -> Result:
+    case = registered.function(**params)
+    try:
+        timer = next(case)
+        operations = _operations_per_repeat(timer, min_time)
+        best = min(timer.repeat(repeat, operations))
+    finally:
+        case.close()
+    return Result(registered.name, params, best / operations, operations)
+
+
+def _operations_per_repeat(timer: timeit.Timer, min_time: float) -> int:
+    operations = 1
+    while True:
+        if timer.timeit(operations) >= min_time or operations >= 10**7:
+            return operations
+        operations *= 10
+
+
+def to_json(results: Sequence[Result]) -> Dict[str, Any]:
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "commit": _git_commit(),
+            "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        "results": [
+            {"name": result.name, "params": result.params, "seconds": result.seconds, "operations": result.operations}
+            for result in results
+        ],
+    }
+
+
+def load_json(path: str) -> Dict[str, float]:
+    """
+    seconds per operation of every case of a saved run, by full name
+    """
+    with open(path) as file:
+        content = json.load(file)
+    return {_full_name(result["name"], result["params"]): result["seconds"] for result in content["results"]}
+
+
+def format_result(result: Result, baseline: Optional[Dict[str, float]] = None) -> str:
+    line = f"{result.full_name:<60} {_format_seconds(result.seconds):>12}"
+    baseline_seconds = (baseline or {}).get(result.full_name)
+    if baseline_seconds:
+        line += f" {(result.seconds / baseline_seconds - 1) * 100:+8.1f}%"
+    return line
+
+
+def _full_name(name: str, params: Dict[str, Any]) -> str:
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]" if params else name
+
+
+def _format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import timeit
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+from envcon import configuration, environment_configuration
+from envcon.dot_env_cache import DotEnvCache
+from envcon.extended_environ import ExtendedEnviron
+from envcon.frozen import create_frozen_class_from_another_class
+from envcon.utils import type_utils
+
+from .runner import benchmark
+
+Case = Generator[timeit.Timer, None, None]
+
+_PREFIX = "ENVCON_BENCHMARK_"
+
+
+def _padded_environ(size: int) -> Dict[str, str]:
+    return {f"{_PREFIX}PADDING_{i}": f"value {i}" for i in range(size)}
+
+
+def _configuration_class(fields: int) -> type:
+    return type("Configuration", (), {"__annotations__": {f"FIELD_{i}": int for i in range(fields)}})
+
+
+class _PatchedEnviron:
+    """
+    os.environ with additional variables, restored on exit
+    """
+
+    def __init__(self, variables: Dict[str, str]) -> None:
+        self.variables = variables
+        self._saved: Dict[str, Optional[str]] = {}
+
+    def __enter__(self) -> "_PatchedEnviron":
+        self._saved = {key: os.environ.get(key) for key in self.variables}
+        os.environ.update(self.variables)
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        for key, value in self._saved.items():
+            if value is None:
+                del os.environ[key]
+            else:
+                os.environ[key] = value
+
+
+@benchmark("decorate.mapping", fields=(10, 100, 1000), environ=(100, 10_000))
+def decorate_mapping(fields: int, environ: int) -> Case:
+    source = _padded_environ(environ)
+    source.update({f"{_PREFIX}FIELD_{i}": str(i) for i in range(fields)})
+    yield timeit.Timer(lambda: configuration(prefix=_PREFIX, source=source)(_configuration_class(fields)))
+
+
+@benchmark("decorate.environ", fields=(10, 100, 1000), environ=(100, 10_000))
+def decorate_environ(fields: int, environ: int) -> Case:
+    variables = _padded_environ(environ)
+    variables.update({f"{_PREFIX}FIELD_{i}": str(i) for i in range(fields)})
+    with _PatchedEnviron(variables):
+        yield timeit.Timer(
+            lambda: environment_configuration(prefix=_PREFIX, include_dot_env_file=False)(_configuration_class(fields))
+        )
+
+
+@benchmark("lookup.extended_environ", layer=("environ", "dot_env", "missing"))
+def lookup_extended_environ(layer: str) -> Case:
+    with tempfile.TemporaryDirectory() as directory, _PatchedEnviron({f"{_PREFIX}ENVIRON": "value"}):
+        path = os.path.join(directory, ".env")
+        with open(path, "w") as file:
+            file.write(f"{_PREFIX}DOT_ENV=value\n")
+        source = ExtendedEnviron(True, path)
+        yield timeit.Timer("source.get(key)", globals={"source": source, "key": f"{_PREFIX}{layer.upper()}"})
+
+
+@benchmark("lookup.combined_with_environ", dot_env_lines=(0, 1000))
+def lookup_combined_with_environ(dot_env_lines: int) -> Case:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, ".env")
+        with open(path, "w") as file:
+            file.writelines(f"{_PREFIX}KEY_{i}=value {i}\n" for i in range(dot_env_lines))
+        source = ExtendedEnviron(True, path)
+        yield timeit.Timer(source.get_dot_env_combined_with_environ)
+
+
+@benchmark("dot_env.parse", lines=(100, 10_000), cached=(False, True), parser=("dotenv", "builtin"))
+def parse_dot_env(lines: int, cached: bool, parser: str) -> Case:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, ".env")
+        with open(path, "w") as file:
+            for i in range(lines):
+                file.write(f"# comment {i}\n" if i % 10 == 0 else f'{_PREFIX}KEY_{i}="value {i}"\n')
+        cache = DotEnvCache()
+        cache.load(path, parser)
+
+        def load() -> None:
+            if not cached:
+                cache.invalidate()
+            cache.load(path, parser)
+
+        yield timeit.Timer(load)
+
+
+_CONVERSIONS: Dict[str, Tuple[Any, str]] = {
+    "str": (str, "value"),
+    "int": (int, "4242"),
+    "float": (float, "42.42"),
+    "bool": (bool, "true"),
+    "list[int]x100": (List[int], ",".join(str(i) for i in range(100))),
+    "tuple[str]x100": (Tuple[str, ...], ",".join(f"value{i}" for i in range(100))),
+    "dict": (dict, '{"a": 1, "b": [1, 2, 3], "c": {"d": "e"}}'),
+    "dict[str,int]x100": (Dict[str, int], "{" + ",".join(f'"{i}": {i}' for i in range(100)) + "}"),
+}
+
+
+@benchmark("convert", hint=tuple(_CONVERSIONS))
+def convert(hint: str) -> Case:
+    type_hint, value = _CONVERSIONS[hint]
+    yield timeit.Timer(
+        "converter(value)", globals={"converter": type_utils.compile_converter(type_hint), "value": value}
+    )
+
+
+@benchmark("attribute_read", kind=("plain", "frozen", "frozen_instance", "slots"))
+def attribute_read(kind: str) -> Case:
+    class Plain:
+        VALUE = 42
+
+    if kind == "plain":
+        target: Any = Plain
+    elif kind == "frozen":
+        target = create_frozen_class_from_another_class(Plain)
+    elif kind == "frozen_instance":
+        target = create_frozen_class_from_another_class(Plain)()
+    else:
+        target = configuration(prefix="", source={"VALUE": "42"}, slots=True)(
+            type("Slotted", (), {"__annotations__": {"VALUE": int}})
+        )
+    yield timeit.Timer("target.VALUE", globals={"target": target})
@@ -1,6 +1,66 @@
+from .asynchronous import load_configuration, AsyncSource
+from .compiled_schema import compile_schema, CompiledSchema
 from .configuration import environment_configuration, configuration
-from dataclasses import FrozenInstanceError
+from .conversion_cache import clear_conversion_cache
+from .dot_env_cache import clear_dot_env_cache
+from .errors import ConfigurationErrors, FieldError, UnknownVariablesError, UnknownVariablesWarning
+from .instrumentation import instrument, stats, reset_stats, LoadEvent, ClassStats
+from .prefix_index import PrefixIndex
+from .registry import reload, reload_all, snapshot
+from .sources import BulkSource
+from .utils.immutable import FrozenArray
+from typing import TYPE_CHECKING, Any
 
-FrozenError = FrozenInstanceError  # compat. will be removed next major
+if TYPE_CHECKING:
+    from .bundle import export_bundle
+    from .watcher import WatchedEnviron
+    from dataclasses import FrozenInstanceError as FrozenError  # compat. will be removed next major
 
-__all__ = ["environment_configuration", "configuration", "FrozenError"]
+# imported on first access: they pull in heavy modules (pickle, hashlib, logging, dataclasses) which most
+# processes decorating a few classes never need
+_DEFERRED_ATTRIBUTES = {
+    "export_bundle": (".bundle", "export_bundle"),
+    "WatchedEnviron": (".watcher", "WatchedEnviron"),
+    "FrozenError": ("dataclasses", "FrozenInstanceError"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _DEFERRED_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    module_name, attribute_name = _DEFERRED_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name, __name__), attribute_name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "environment_configuration",
+    "configuration",
+    "load_configuration",
+    "compile_schema",
+    "export_bundle",
+    "CompiledSchema",
+    "AsyncSource",
+    "BulkSource",
+    "PrefixIndex",
+    "clear_dot_env_cache",
+    "clear_conversion_cache",
+    "ConfigurationErrors",
+    "FieldError",
+    "UnknownVariablesError",
+    "UnknownVariablesWarning",
+    "instrument",
+    "stats",
+    "reset_stats",
+    "LoadEvent",
+    "ClassStats",
+    "reload",
+    "reload_all",
+    "snapshot",
+    "WatchedEnviron",
+    "FrozenArray",
+    "FrozenError",
+]
@@ -0,0 +1,69 @@
+import typing
+from typing import Awaitable, Iterable, Optional, Type, TypeVar, Protocol
+
+from .configuration_injector import ConfigurationInjector
+from .schema import class_type_hints
+
+T = TypeVar("T")
+
+
+class AsyncSource(Protocol):
+    def get(self, key: str) -> Awaitable[Optional[str]]:
+        ...
+
+
+async def load_configuration(
+    cls: Type[T],
+    *,
+    prefix: str,
+    source: AsyncSource,
+    frozen: bool = True,
+    override_init: bool = True,
+    override_repr: bool = True,
+    source_name: Optional[str] = None,
+    collect_errors: bool = False,
+    max_concurrency: Optional[int] = None,
+    separator: str = ",",
+    escape: Optional[str] = None,
+    immutable_values: bool = False,
+    slots: bool = False,
+    sensitive: Iterable[str] = (),
+) -> T:
+    """
+    asyncio counterpart of configuration(): all the variables of `cls` are requested from `source` concurrently
+    (at most `max_concurrency` at a time), then converted and injected exactly like configuration() does.
+    the class can't be reloaded by envcon.reload(), call load_configuration() again to pick up changes.
+    """
+    import asyncio  # not imported by envcon unless used, it's a heavy import
+
+    keys = [prefix + variable_name for variable_name in class_type_hints(cls)]
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def get(key: str) -> Optional[str]:
+        if semaphore is None:
+            return await source.get(key)
+        async with semaphore:
+            return await source.get(key)
+
+    values = await asyncio.gather(*(get(key) for key in keys))
+    fetched_values = {key: value for key, value in zip(keys, values) if value is not None}
+    return typing.cast(
+        T,
+        ConfigurationInjector(
+            cls,
+            prefix,
+            fetched_values,
+            frozen,
+            override_init,
+            override_repr,
+            source_name=source_name,
+            named_source=source,  # errors name the async source, not the fetched values
+            collect_errors=collect_errors,
+            reloadable=False,
+            separator=separator,
+            escape=escape,
+            immutable_values=immutable_values,
+            slots=slots,
+            sensitive=sensitive,
+        ).process_class(),
+    )
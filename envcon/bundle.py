@@ -0,0 +1,242 @@
+import copyreg
+import enum
+import hashlib
+import io
+import os
+import pickle
+import sys
+import threading
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .extended_environ import ExtendedEnviron
+from .prefix_index import PrefixIndex
+from .registry import get_injector, registered_injectors
+from .schema_disk_cache import module_source_hash
+
+if TYPE_CHECKING:
+    from .configuration_injector import ConfigurationInjector
+
+_BUNDLE_VERSION = 1
+
+# the arguments of a decoration which change the converted values: separator, escape, immutable_values
+Options = Tuple[str, Optional[str], bool]
+_EntryKey = Tuple[str, str]
+# fingerprint of the raw inputs, variables names, pickled (raw values, values)
+_Entry = Tuple[str, Tuple[str, ...], bytes]
+_FileStat = Tuple[int, int, int]
+
+
+class BundledValues(NamedTuple):
+    names: Tuple[str, ...]
+    raw_values: Dict[str, Optional[str]]
+    values: Dict[str, Any]
+
+
+def export_bundle(path: str, classes: Optional[Iterable[Any]] = None) -> List[type]:
+    """
+    write the resolved values of decorated classes (every decorated class by default) to `path`, so the next process
+    decorating them with `bundle=path` injects them without reading and converting its source.
+    every class is stored with a fingerprint of its raw inputs: the source values, the .env file stat and the source
+    code of the class modules. lazy classes, classes defined in functions and classes holding values other than
+    builtins, Decimal, paths, UUIDs, enums and envcon's read-only containers are skipped. returns the exported classes.
+    loading a bundle never imports a module nor calls anything but the constructors of these types, yet the values are
+    injected as they are: protect the bundle like the .env file, sensitive values are written in clear.
+    """
+    items = registered_injectors() if classes is None else [(cls, get_injector(cls)) for cls in classes]
+    entries: Dict[_EntryKey, _Entry] = {}
+    exported = []
+    for cls, injector in items:
+        entry = _create_entry(injector)
+        if entry is not None:
+            entries[_entry_key(injector.target_class)] = entry
+            exported.append(cls)
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        pickle.dump({"version": _BUNDLE_VERSION, "entries": entries}, file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, path)
+    return exported
+
+
+def bundled_values(
+    path: str, cls: type, prefix: str, options: Options, source: Mapping[str, str]
+) -> Optional[BundledValues]:
+    """
+    the values of `cls` stored in the bundle at `path`, or None when they are missing or their fingerprint doesn't
+    match the current raw inputs
+    """
+    entry = _bundles.entries(path).get(_entry_key(cls))
+    if entry is None:
+        return None
+    fingerprint, names, pickled_values = entry
+    if fingerprint != _fingerprint(cls, prefix, options, names, source):
+        return None
+    try:
+        raw_values, values = _unpickle(pickled_values)
+    except Exception:
+        return None  # e.g. an enum whose module isn't imported yet
+    return BundledValues(names, raw_values, values)
+
+
+def _create_entry(injector: "ConfigurationInjector") -> Optional[_Entry]:
+    cls = injector.target_class
+    if injector.lazy or "<locals>" in cls.__qualname__:
+        return None
+    names = tuple(injector.variables_names)
+    options = (injector.separator, injector.escape, injector.immutable_values)
+    fingerprint = _fingerprint(cls, injector.prefix, options, names, injector.source)
+    if fingerprint is None:
+        return None
+    raw_values = injector.raw_values()
+    current_raw_values = _read_raw_values(injector.source, [injector.prefix + name for name in names])
+    if current_raw_values != [raw_values[name] for name in names]:
+        raise ValueError(f"the source of {cls.__qualname__} changed since it was loaded. reload it before exporting")
+    try:
+        pickled_values = _pickle((raw_values, injector.values()))
+        _unpickle(pickled_values)  # a class which couldn't be loaded from the bundle is read from its source
+    except Exception:
+        return None
+    return fingerprint, names, pickled_values
+
+
+def _entry_key(cls: type) -> _EntryKey:
+    return cls.__module__, cls.__qualname__
+
+
+def _fingerprint(
+    cls: type, prefix: str, options: Options, names: Sequence[str], source: Mapping[str, str]
+) -> Optional[str]:
+    modules_hashes = [_module_hash(base.__module__) for base in cls.__mro__ if base.__module__ != "builtins"]
+    if None in modules_hashes:
+        return None  # e.g. a class of the interactive interpreter
+    lookup_keys = [prefix + name for name in names]
+    inputs = (
+        _BUNDLE_VERSION,
+        _entry_key(cls),
+        modules_hashes,
+        prefix,
+        options,
+        names,
+        _raw_inputs(source, lookup_keys),
+    )
+    return hashlib.sha256(repr(inputs).encode()).hexdigest()
+
+
+def _raw_inputs(source: Mapping[str, str], lookup_keys: Sequence[str]) -> Tuple[List[Optional[str]], Any]:
+    # the .env file is identified by its stat, so a matching fingerprint never parses it
+    if isinstance(source, PrefixIndex):
+        source = source.source
+    if isinstance(source, ExtendedEnviron):
+        environ = os.environ
+        return [environ.get(key) for key in lookup_keys], source.dot_env_fingerprint()
+    return [source.get(key) for key in lookup_keys], None
+
+
+def _read_raw_values(source: Mapping[str, str], lookup_keys: Sequence[str]) -> List[Optional[str]]:
+    if isinstance(source, PrefixIndex):
+        source = source.source
+    if isinstance(source, ExtendedEnviron):
+        source = source.reopened()  # the .env file as it is now, not as the source parsed it
+    return [source.get(key) for key in lookup_keys]
+
+
+_modules_hashes: Dict[str, Optional[str]] = {}
+
+
+def _module_hash(module_name: str) -> Optional[str]:
+    if module_name not in _modules_hashes:
+        _modules_hashes[module_name] = module_source_hash(module_name)
+    return _modules_hashes[module_name]
+
+
+def _pickle(value: Any) -> bytes:
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    # read-only mappings of immutable_values classes can't be pickled as they are
+    pickler.dispatch_table = {**copyreg.dispatch_table, MappingProxyType: _reduce_mapping_proxy}
+    pickler.dump(value)
+    return buffer.getvalue()
+
+
+def _reduce_mapping_proxy(proxy: Mapping[Any, Any]) -> Tuple[Any, Tuple[Dict[Any, Any]]]:
+    return _mapping_proxy, (dict(proxy),)
+
+
+def _mapping_proxy(values: Dict[Any, Any]) -> Mapping[Any, Any]:
+    return MappingProxyType(values)
+
+
+# the globals a bundle may reference, besides the enums of already imported modules. unpickling anything else could
+# run arbitrary code (e.g. os.system), so a bundle is loaded like data, not like code
+_ALLOWED_GLOBALS = {
+    ("builtins", "complex"),
+    ("decimal", "Decimal"),
+    ("uuid", "UUID"),
+    ("envcon.utils.immutable", "FrozenArray"),
+    (__name__, "_mapping_proxy"),
+    *(
+        (module, name)
+        for module in ("pathlib", "pathlib._local")  # where python 3.13 defines the paths
+        for name in ("Path", "PosixPath", "WindowsPath", "PurePath", "PurePosixPath", "PureWindowsPath")
+    ),
+}
+
+
+class _Unpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) in _ALLOWED_GLOBALS:
+            return super().find_class(module, name)
+        # never imported here: importing a module runs its code
+        cls = getattr(sys.modules.get(module), name, None)
+        if isinstance(cls, type) and issubclass(cls, enum.Enum):
+            return cls
+        raise pickle.UnpicklingError(f"{module}.{name} can't be loaded from a bundle")
+
+
+def _unpickle(data: bytes) -> Any:
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+class _BundlesCache:
+    """
+    entries of the bundle files read by this process, validated against the file stat
+    """
+
+    def __init__(self) -> None:
+        self._bundles: Dict[str, Tuple[Optional[_FileStat], Dict[_EntryKey, _Entry]]] = {}
+        self._lock = threading.Lock()
+
+    def entries(self, path: str) -> Dict[_EntryKey, _Entry]:
+        resolved_path = os.path.realpath(path)
+        stat = _file_stat(resolved_path)
+        with self._lock:
+            cached = self._bundles.get(resolved_path)
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+        entries = _read_entries(resolved_path) if stat else {}
+        with self._lock:
+            self._bundles[resolved_path] = stat, entries
+        return entries
+
+
+def _file_stat(path: str) -> Optional[_FileStat]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _read_entries(path: str) -> Dict[_EntryKey, _Entry]:
+    try:
+        with open(path, "rb") as file:
+            content = _Unpickler(file).load()
+    except Exception:
+        return {}  # missing or corrupted bundle, classes are loaded from their source
+    if not isinstance(content, dict) or content.get("version") != _BUNDLE_VERSION:
+        return {}
+    return content["entries"]  # type: ignore[no-any-return]
+
+
+_bundles = _BundlesCache()
@@ -0,0 +1,136 @@
+from typing import Any, Dict, Generic, Iterable, List, Mapping, Optional, Type, TypeVar
+
+from . import conversion_cache
+from .configuration_injector import VariablesResolver
+from .prefix_index import PrefixIndex
+from .registry import get_injector
+from .schema import Schema
+from .slots import create_instance_factory, create_slotted_class
+from .sources import is_bulk_source
+
+T = TypeVar("T")
+
+
+class CompiledSchema(Generic[T]):
+    """
+    a configuration class compiled once (type hints, converters and a slotted class), then materialized into
+    instances for many sources, e.g. one per tenant. materializing looks the variables up and converts them,
+    nothing else. instances are not registered for reload(), materialize the source again instead.
+    """
+
+    def __init__(
+        self,
+        cls: Type[T],
+        *,
+        prefix: str,
+        frozen: bool = True,
+        override_init: bool = True,
+        override_repr: bool = True,
+        collect_errors: bool = False,
+        separator: str = ",",
+        escape: Optional[str] = None,
+        immutable_values: bool = False,
+        sensitive: Iterable[str] = (),
+    ) -> None:
+        if immutable_values and not frozen:
+            raise ValueError("immutable_values requires a frozen class")
+        self.schema = Schema.from_class(cls, prefix, separator, escape, immutable_values, _original_defaults(cls))
+        self.collect_errors = collect_errors
+        # the class of the materialized instances
+        sensitive = frozenset(sensitive)
+        unknown_sensitive_names = sensitive - self.schema.fields_by_name.keys()
+        if unknown_sensitive_names:
+            raise ValueError(f"sensitive names {sorted(unknown_sensitive_names)} are not variables of {cls}")
+        self.cls: type = create_slotted_class(cls, self.schema.fields, frozen, override_init, override_repr, sensitive)
+        self._create_instance = create_instance_factory(self.cls, [field.name for field in self.schema.fields])
+        self._fields = [
+            (
+                field.lookup_key,
+                conversion_cache.cached(field.converter),
+                field.default,
+                field.default is None and not field.optional,
+            )
+            for field in self.schema.fields
+        ]
+
+    def materialize(self, source: Mapping[str, str], source_name: Optional[str] = None) -> T:
+        if is_bulk_source(source) or isinstance(source, PrefixIndex):
+            return self._materialize_with_resolver(source, source_name)
+
+        # the common case (a plain mapping of valid values) in a single loop. on the first missing or invalid
+        # variable, the resolver reads the source again to report the errors exactly like configuration() does
+        values: List[Any] = []
+        get = source.get
+        try:
+            for lookup_key, convert, default, required in self._fields:
+                raw_value = get(lookup_key)
+                if raw_value is not None:
+                    values.append(convert(raw_value))
+                elif required:
+                    break
+                else:
+                    values.append(default)
+            else:
+                return self._create_instance(*values)  # type: ignore[no-any-return]
+        except ValueError:
+            pass
+        return self._materialize_with_resolver(source, source_name)
+
+    def _materialize_with_resolver(self, source: Mapping[str, str], source_name: Optional[str]) -> T:
+        resolved_variables = VariablesResolver(
+            self.schema, source, source_name=source_name, collect_errors=self.collect_errors
+        ).resolve_all()
+        values = [value for _, value in resolved_variables.values()]
+        return self._create_instance(*values)  # type: ignore[no-any-return]
+
+    def materialize_many(self, sources: Iterable[Mapping[str, str]], max_workers: Optional[int] = None) -> List[T]:
+        """
+        materialize every source, in order. with `max_workers` the sources are materialized by a thread pool,
+        which pays off when reading a source blocks (e.g. a remote BulkSource), not for in-memory mappings.
+        the first error is raised.
+        """
+        if not max_workers or max_workers == 1:
+            return [self.materialize(source) for source in sources]
+
+        from concurrent.futures import ThreadPoolExecutor  # not imported by envcon unless used
+
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(self.materialize, sources))
+
+    def __repr__(self) -> str:
+        return f"CompiledSchema({self.schema!r})"
+
+
+def _original_defaults(cls: type) -> Optional[Dict[str, Any]]:
+    # a decorated class holds the values of its own source, which must not become the defaults of every tenant
+    try:
+        return get_injector(cls).defaults
+    except TypeError:
+        return None
+
+
+def compile_schema(
+    cls: Type[T],
+    *,
+    prefix: str,
+    frozen: bool = True,
+    override_init: bool = True,
+    override_repr: bool = True,
+    collect_errors: bool = False,
+    separator: str = ",",
+    escape: Optional[str] = None,
+    immutable_values: bool = False,
+    sensitive: Iterable[str] = (),
+) -> CompiledSchema[T]:
+    return CompiledSchema(
+        cls,
+        prefix=prefix,
+        frozen=frozen,
+        override_init=override_init,
+        override_repr=override_repr,
+        collect_errors=collect_errors,
+        separator=separator,
+        escape=escape,
+        immutable_values=immutable_values,
+        sensitive=sensitive,
+    )
@@ -1,5 +1,5 @@
 import typing
-from typing import Callable, Union, Mapping, TypeVar, Type, Optional, overload
+from typing import Callable, Iterable, Union, Mapping, TypeVar, Type, Optional, overload
 
 from .configuration_injector import ConfigurationInjector
 from .extended_environ import ExtendedEnviron
@@ -21,11 +21,39 @@ def configuration(
     frozen: bool = True,
     override_init: bool = True,
     override_repr: bool = True,
+    source_name: Optional[str] = None,
+    collect_errors: bool = False,
+    lazy: bool = False,
+    strict: Union[bool, str] = False,
+    separator: str = ",",
+    escape: Optional[str] = None,
+    immutable_values: bool = False,
+    slots: bool = False,
+    sensitive: Iterable[str] = (),
+    bundle: Optional[str] = None,
 ) -> Callable[[Type[T]], T]:
     def wrap(cls: Type[T]) -> T:
         # this cast is necessary for code-assistant and has no effect
         return typing.cast(
-            T, ConfigurationInjector(cls, prefix, source, frozen, override_init, override_repr).process_class()
+            T,
+            ConfigurationInjector(
+                cls,
+                prefix,
+                source,
+                frozen,
+                override_init,
+                override_repr,
+                source_name=source_name,
+                collect_errors=collect_errors,
+                lazy=lazy,
+                strict=strict,
+                separator=separator,
+                escape=escape,
+                immutable_values=immutable_values,
+                slots=slots,
+                sensitive=sensitive,
+                bundle=bundle,
+            ).process_class(),
         )
 
     return wrap
@@ -37,9 +65,19 @@ def environment_configuration(
     prefix: str = "",
     include_dot_env_file: bool = True,
     dot_env_path: str = ".env",
+    dot_env_parser: str = "dotenv",
     frozen: bool = True,
     override_init: bool = True,
     override_repr: bool = True,
+    collect_errors: bool = False,
+    lazy: bool = False,
+    strict: Union[bool, str] = False,
+    separator: str = ",",
+    escape: Optional[str] = None,
+    immutable_values: bool = False,
+    slots: bool = False,
+    sensitive: Iterable[str] = (),
+    bundle: Optional[str] = None,
 ) -> Callable[[Class], T]:
     ...
 
@@ -55,15 +93,34 @@ def environment_configuration(
     prefix: str = "",
     include_dot_env_file: bool = True,
     dot_env_path: str = ".env",
+    dot_env_parser: str = "dotenv",
     frozen: bool = True,
     override_init: bool = True,
     override_repr: bool = True,
+    collect_errors: bool = False,
+    lazy: bool = False,
+    strict: Union[bool, str] = False,
+    separator: str = ",",
+    escape: Optional[str] = None,
+    immutable_values: bool = False,
+    slots: bool = False,
+    sensitive: Iterable[str] = (),
+    bundle: Optional[str] = None,
 ) -> Union[Class, Callable[[Type[T]], T]]:
     wrap = configuration(
         prefix=prefix,
-        source=ExtendedEnviron(include_dot_env_file, dot_env_path),
+        source=ExtendedEnviron(include_dot_env_file, dot_env_path, dot_env_parser),
         frozen=frozen,
         override_init=override_init,
         override_repr=override_repr,
+        collect_errors=collect_errors,
+        lazy=lazy,
+        strict=strict,
+        separator=separator,
+        escape=escape,
+        immutable_values=immutable_values,
+        slots=slots,
+        sensitive=sensitive,
+        bundle=bundle,
     )
     return wrap if cls is None else wrap(cls)
@@ -1,14 +1,152 @@
+import collections
+import itertools
+import threading
+import time
+import typing
+import warnings
+import weakref
 from typing import TypeVar
-from typing import get_type_hints, Mapping, Union, Any, NoReturn, Dict, Callable
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Union, Any, NoReturn, Dict, Callable, Optional, Set, Iterable, Tuple
 
+from . import conversion_cache, instrumentation
+from .errors import ConfigurationErrors, FieldError, UnknownVariablesError, UnknownVariablesWarning
 from .extended_environ import ExtendedEnviron
 from .frozen import create_frozen_class_from_another_class
-from .utils import type_utils, inspections
+from .instrumentation import Timings
+from .prefix_index import PrefixIndex
+from .registry import register
+from .schema import DeferredSchema, Schema, Field, class_defaults
+from .slots import create_slotted_class, new_instance
+from .sources import BulkSource, is_bulk_source
+from .utils import codegen, type_utils, inspections
+
+if typing.TYPE_CHECKING:
+    from .bundle import BundledValues
 
 Self = TypeVar("Self")
+Value = Union[str, bool, int, float, list, dict, None]
+
+
+class _Snapshot(NamedTuple):
+    raw_values: Mapping[str, Optional[str]]
+    values: Mapping[str, Value]
+
 
+class VariablesResolver:
+    """
+    reads the variables of a schema from a source and converts them
+    """
 
-class ConfigurationInjector:
+    def __init__(
+        self,
+        schema: Schema,
+        source: Mapping[str, str],
+        *,
+        source_name: Optional[str] = None,
+        named_source: Any = None,
+        collect_errors: bool = False,
+    ) -> None:
+        self.schema = schema
+        self.target_class = schema.cls
+        self.prefix = schema.prefix
+        self.source = source
+        self.source_name = source_name
+        # the object whose variable name is the source name in errors, when it's not `source` itself
+        self.named_source = named_source if named_source is not None else source
+        self.collect_errors = collect_errors
+
+    def resolve_all(self, timings: Optional[Timings] = None) -> Dict[str, Tuple[Optional[str], Value]]:
+        raw_values = self._lookup_many(self.schema.fields_by_name, timings)
+        return self._resolve_variables([(field, raw_values[field.name]) for field in self.schema.fields], timings)
+
+    def _resolve_variables(
+        self, variables: Iterable[Tuple[Field, Optional[str]]], timings: Optional[Timings] = None
+    ) -> Dict[str, Tuple[Optional[str], Value]]:
+        resolved_variables = {}
+        errors = []
+        for field, raw_value in variables:
+            start = time.perf_counter() if timings is not None else 0.0
+            try:
+                resolved_variables[field.name] = raw_value, self._get_variable_value(field, raw_value)
+            except (LookupError, ValueError) as e:
+                if not self.collect_errors:
+                    raise
+                errors.append(FieldError(field.name, field.lookup_key, e))
+            if timings is not None:
+                timings.add_conversion(field.name, time.perf_counter() - start)
+        if errors:
+            raise ConfigurationErrors(self.target_class.__qualname__, errors)
+        return resolved_variables
+
+    def _lookup(self, var_name: str, timings: Optional[Timings] = None) -> Optional[str]:
+        if timings is None:
+            return self._lookup_source().get(self.prefix + var_name, None)
+        start = time.perf_counter()
+        try:
+            return self._lookup_source().get(self.prefix + var_name, None)
+        finally:
+            timings.add_lookup(var_name, time.perf_counter() - start)
+
+    def _lookup_many(self, var_names: Iterable[str], timings: Optional[Timings] = None) -> Dict[str, Optional[str]]:
+        if timings is None:
+            return self._lookup_many_untimed(var_names)
+        if not is_bulk_source(self.source):
+            return {var_name: self._lookup(var_name, timings) for var_name in var_names}
+        start = time.perf_counter()
+        try:
+            values = self._lookup_many_untimed(var_names)
+        except BaseException:
+            timings.lookup += time.perf_counter() - start
+            raise
+        # a single request reads every variable, each one is charged an even share of it
+        seconds = (time.perf_counter() - start) / max(len(values), 1)
+        for var_name in values:
+            timings.add_lookup(var_name, seconds)
+        return values
+
+    def _lookup_many_untimed(self, var_names: Iterable[str]) -> Dict[str, Optional[str]]:
+        if not is_bulk_source(self.source):
+            source = self._lookup_source()
+            return {var_name: source.get(self.prefix + var_name, None) for var_name in var_names}
+
+        lookup_keys = {var_name: self.prefix + var_name for var_name in var_names}
+        values = typing.cast(BulkSource, self.source).get_many(list(lookup_keys.values())) if lookup_keys else {}
+        return {var_name: values.get(lookup_key, None) for var_name, lookup_key in lookup_keys.items()}
+
+    def _lookup_source(self) -> Mapping[str, str]:
+        # an index is partitioned by prefix once, then every class reads from the partition of its own prefix
+        return self.source.with_prefix(self.prefix) if isinstance(self.source, PrefixIndex) else self.source
+
+    def _get_variable_value(self, field: Field, value: Optional[str]) -> Value:
+        if value is None:
+            if field.default is None and not field.optional:
+                self._raise_missing_variable(field.name, field.lookup_key)
+            return field.default  # type: ignore[no-any-return]
+        try:
+            return conversion_cache.convert(field.converter, value)
+        except ValueError as e:
+            raise ValueError(f"couldn't convert {field.name} to {type_utils.name(field.type)}. {e}") from None
+
+    def _raise_missing_variable(self, var_name: str, lookup_key: str) -> NoReturn:
+        source = self.source.source if isinstance(self.source, PrefixIndex) else self.source
+        if isinstance(source, ExtendedEnviron):
+            raise LookupError(
+                f"'{lookup_key}' is not an environment variable, nor has default value"
+                if var_name == lookup_key
+                else f"'{lookup_key}' is not an environment variable, nor '{var_name}' has default value"
+            )
+        raise LookupError(
+            f"'{lookup_key}' does not exist in {self._get_source_name()}, nor has default value"
+            if var_name == lookup_key
+            else f"'{lookup_key}' does not exist in {self._get_source_name()}, nor '{var_name}' has default value"
+        )
+
+    def _get_source_name(self) -> str:
+        return self.source_name or inspections.retrieve_name(self.named_source) or "your source"
+
+
+class ConfigurationInjector(VariablesResolver):
     def __init__(
         self,
         target_class: type,
@@ -17,27 +155,218 @@ class ConfigurationInjector:
         frozen: bool,
         override_init: bool,
         override_repr: bool,
+        *,
+        source_name: Optional[str] = None,
+        named_source: Any = None,
+        collect_errors: bool = False,
+        reloadable: bool = True,
+        lazy: bool = False,
+        strict: Union[bool, str] = False,
+        separator: str = ",",
+        escape: Optional[str] = None,
+        immutable_values: bool = False,
+        slots: bool = False,
+        sensitive: Iterable[str] = (),
+        bundle: Optional[str] = None,
     ) -> None:
-        self.target_class = target_class
-        self.prefix = prefix
-        self.source = source
+        self._check_arguments(prefix, frozen, collect_errors, lazy, strict, immutable_values, slots, bundle)
+
+        # set while instrumented: the timings of the decoration, until the class is processed
+        self._timings = instrumentation.new_timings()
+        start = time.perf_counter() if self._timings is not None else 0.0
+        bundled = self._bundled_values(bundle, target_class, prefix, source, separator, escape, immutable_values)
+        defaults = class_defaults(target_class, bundled.names) if bundled is not None else None
+        super().__init__(
+            (
+                # the values are known, type hints are evaluated only if something needs the fields (e.g. a reload)
+                DeferredSchema(target_class, prefix, separator, escape, immutable_values, defaults)
+                if defaults is not None
+                else Schema.from_class(target_class, prefix, separator, escape, immutable_values)
+            ),
+            source,
+            source_name=source_name,
+            named_source=named_source,
+            collect_errors=collect_errors,
+        )
+        if self._timings is not None:
+            self._timings.schema = time.perf_counter() - start
         self.frozen = frozen
         self.override_init = override_init
         self.override_repr = override_repr
+        self.reloadable = reloadable
+        self.lazy = lazy
+        self.strict = strict
+        self.immutable_values = immutable_values
+        self.slots = slots
+        self.separator = separator
+        self.escape = escape
+        self.variables_names = bundled.names if bundled is not None else tuple(self.schema.fields_by_name)
+        # the values of the class before its variables are injected
+        self.defaults = defaults if defaults is not None else class_defaults(target_class, self.variables_names)
+        self.sensitive = frozenset(sensitive)
+        unknown_sensitive_names = self.sensitive.difference(self.variables_names)
+        if unknown_sensitive_names:
+            raise ValueError(f"sensitive names {sorted(unknown_sensitive_names)} are not variables of {target_class}")
+        self._instance: Optional["weakref.ReferenceType[Any]"] = None
+        # (snapshot, repr) of a frozen class, computed once per snapshot
+        self._cached_repr: Optional[Tuple[_Snapshot, str]] = None
+        # the class returned by process_class(). until then, values are injected by process_class() itself
+        self._processed_class: Optional[type] = None
+
+        # the resolved variables. replaced as a whole (a single attribute assignment) by every reload and lazy
+        # variable access, so snapshot() readers see either every value of a reload or none of them
+        if bundled is not None:
+            self._snapshot = _Snapshot(
+                MappingProxyType(dict(bundled.raw_values)), MappingProxyType(dict(bundled.values))
+            )
+        else:
+            self._snapshot = _Snapshot(MappingProxyType({}), MappingProxyType({}))
+            if not lazy:
+                self._publish(self.resolve_all(self._timings))
+        self._reload_lock = threading.RLock()
+        if strict:
+            self._check_unknown_variables()
+
+    @staticmethod
+    def _bundled_values(
+        bundle: Optional[str],
+        target_class: type,
+        prefix: str,
+        source: Mapping[str, str],
+        separator: str,
+        escape: Optional[str],
+        immutable_values: bool,
+    ) -> Optional["BundledValues"]:
+        if not bundle:
+            return None
+        from .bundle import bundled_values  # pickle and hashlib are imported only by classes using a bundle
 
-        self._target_class_variables_injected_values = self._get_all_variables_values()
+        return bundled_values(bundle, target_class, prefix, (separator, escape, immutable_values), source)
+
+    @staticmethod
+    def _check_arguments(
+        prefix: str,
+        frozen: bool,
+        collect_errors: bool,
+        lazy: bool,
+        strict: Union[bool, str],
+        immutable_values: bool,
+        slots: bool,
+        bundle: Optional[str],
+    ) -> None:
+        if lazy and collect_errors:
+            raise ValueError("collect_errors can't be used with lazy, variables are resolved one by one on access")
+        if strict not in (False, True, "warn"):
+            raise ValueError(f"strict must be True, False or 'warn', got {strict!r}")
+        if strict and not prefix:
+            raise ValueError("strict requires a prefix, otherwise every variable of the source is unknown")
+        if immutable_values and not frozen:
+            raise ValueError("immutable_values requires a frozen class")
+        if lazy and slots:
+            raise ValueError("lazy can't be used with slots, slots are filled when the instance is created")
+        if lazy and bundle:
+            raise ValueError("lazy can't be used with bundle, bundled values are injected when the class is decorated")
+
+    def process_class(self) -> Any:
+        timings, self._timings = self._timings, None
+        if timings is None:
+            return self._process_class()
+        start = time.perf_counter()
+        processed_class = self._process_class()
+        timings.construction = time.perf_counter() - start
+        instrumentation.emit(self.target_class, "load", timings)
+        return processed_class
+
+    def _process_class(self) -> Any:
+        if self.slots:
+            return self._process_slotted_class()
 
-    def process_class(self) -> type:
         if self.override_init:
             self._set_attribute_in_target_class("__init__", self._create_init_function())
 
         if self.override_repr:
             self._set_attribute_in_target_class("__repr__", self._create_repr_function())
 
-        for variable_name, value in self._target_class_variables_injected_values.items():
+        if self.lazy:
+            for field in self.schema.fields:
+                self._set_attribute_in_target_class(field.name, _LazyVariable(self, field))
+
+        for variable_name, value in self._snapshot.values.items():
             self._set_attribute_in_target_class(variable_name, value)
 
-        return self.target_class if not self.frozen else create_frozen_class_from_another_class(self.target_class)
+        processed_class = (
+            self.target_class if not self.frozen else create_frozen_class_from_another_class(self.target_class)
+        )
+        register(processed_class, self)
+        self._processed_class = processed_class
+        return processed_class
+
+    def _process_slotted_class(self) -> Any:
+        slotted_class = create_slotted_class(
+            self.target_class, self.schema.fields, self.frozen, self.override_init, self.override_repr, self.sensitive
+        )
+        instance = new_instance(slotted_class, self._snapshot.values)
+        self._instance = weakref.ref(instance)
+        register(slotted_class, self)
+        self._processed_class = slotted_class
+        return instance
+
+    def reload(self, refresh_source: bool = True) -> Set[str]:
+        """
+        read the source again and inject the variables whose raw value changed. returns the changed variables names.
+        with refresh_source=False, the caller already refreshed the source (see refresh_source()).
+        all changed variables are converted before the first one is injected, so a failing reload changes nothing,
+        then they are published together as a new snapshot().
+        lazy variables which were not accessed yet are left untouched, they'll read the fresh value on first access.
+        """
+        if not self.reloadable:
+            raise TypeError(
+                f"{self.target_class.__qualname__} was loaded from a one-off source, load it again instead of reloading"
+            )
+        timings = instrumentation.new_timings()
+        with self._reload_lock:
+            if refresh_source:
+                self.refresh_source()
+
+            previous_raw_values = self._snapshot.raw_values
+            raw_values = self._lookup_many(previous_raw_values, timings)
+            changed_variables = self._resolve_variables(
+                (
+                    (field, raw_values[field.name])
+                    for field in self.schema.fields
+                    if field.name in raw_values and raw_values[field.name] != previous_raw_values[field.name]
+                ),
+                timings,
+            )
+            self._publish(changed_variables)
+        if timings is not None:
+            instrumentation.emit(self.target_class, "reload", timings)
+        return set(changed_variables)
+
+    def refresh_source(self) -> None:
+        """
+        pick up the changes of a source which takes a snapshot (a PrefixIndex) or caches a file (an ExtendedEnviron)
+        """
+        if isinstance(self.source, (ExtendedEnviron, PrefixIndex)):
+            self.source.refresh()
+
+    def raw_values(self) -> Dict[str, Optional[str]]:
+        """
+        raw value of every resolved variable, as read from the source
+        """
+        return dict(self._snapshot.raw_values)
+
+    def values(self) -> Dict[str, Value]:
+        """
+        converted value of every resolved variable
+        """
+        return dict(self._snapshot.values)
+
+    def snapshot(self) -> Mapping[str, Value]:
+        """
+        read-only mapping of the converted value of every resolved variable, as of a single (re)load
+        """
+        return self._snapshot.values
 
     @staticmethod
     def _create_init_function() -> Callable[[Self], None]:
@@ -48,15 +377,45 @@ class ConfigurationInjector:
 
     def _create_repr_function(self) -> Callable[[Self], str]:
         class_name = self.target_class.__qualname__
-        variables_names = self._target_class_variables_injected_values.keys()
+        variables_names = self.variables_names
+        sensitive = self.sensitive
+        compiled_repr = codegen.create_repr_function(class_name, variables_names, sensitive)
 
-        def __repr__(self: Self) -> str:
+        def repr_existing_variables(self: Self) -> str:
+            # slow path, when a variable was deleted from a non-frozen class
             comma_separated_values = ",".join(
-                f"{var_name}={getattr(self, var_name)}"
+                f"{var_name}={codegen.MASK if var_name in sensitive else getattr(self, var_name)}"
                 for var_name in filter(lambda var_name: hasattr(self, var_name), variables_names)
             )
             return f"{class_name}({comma_separated_values})"
 
+        if self.frozen:
+            return self._create_cached_repr_function(compiled_repr)
+
+        def __repr__(self: Self) -> str:
+            try:
+                return compiled_repr(self)  # type: ignore[no-any-return]
+            except AttributeError:
+                return repr_existing_variables(self)
+
+        return __repr__
+
+    def _create_cached_repr_function(self, compiled_repr: Callable[[Self], str]) -> Callable[[Self], str]:
+        injector = self
+
+        def __repr__(self: Self) -> str:
+            if type(self) is not injector._processed_class:
+                return compiled_repr(self)  # e.g. a subclass, which may override variables
+            # frozen values change only when injected (reload, lazy variable access), so the repr is computed once
+            # per snapshot of the values
+            snapshot = injector._snapshot
+            cached_repr = injector._cached_repr
+            if cached_repr is not None and cached_repr[0] is snapshot:
+                return cached_repr[1]
+            text = compiled_repr(self)
+            injector._cached_repr = snapshot, text
+            return text
+
         return __repr__
 
     def _set_attribute_in_target_class(self, name: str, value: Any) -> None:
@@ -64,35 +423,80 @@ class ConfigurationInjector:
         # because we need to skip _FrozenClassAttributesMeta restrictions if presented any in case of inheritance
         type.__setattr__(self.target_class, name, value)
 
-    def _get_all_variables_values(self) -> Dict[str, Union[str, bool, int, float, list, dict, None]]:
-        return {
-            variable_name: self._get_variable_value(variable_name, variable_type)
-            for variable_name, variable_type in get_type_hints(self.target_class).items()
-        }
-
-    def _get_variable_value(self, var_name: str, var_type: type) -> Union[str, bool, int, float, list, dict, None]:
-        default_value = getattr(self.target_class, var_name, None)
-        lookup_key = self.prefix + var_name
-        value = self.source.get(lookup_key, None)
-        if value is None and default_value is None and not type_utils.is_optional(var_type):
-            self._raise_missing_variable(var_name, lookup_key)
-        try:
-            return default_value if value is None else type_utils.convert(value, var_type)
-        except ValueError as e:
-            raise ValueError(f"couldn't convert {var_name} to {type_utils.name(var_type)}. {e}") from None
+    def _publish(self, resolved_variables: Dict[str, Tuple[Optional[str], Value]]) -> None:
+        """
+        inject resolved variables into the class (or the slots instance), then replace the snapshot
+        """
+        if not resolved_variables:
+            return
+        snapshot = self._snapshot
+        values = {name: value for name, (_, value) in resolved_variables.items()}
+        if self._processed_class is not None:
+            if self._instance is None:
+                _set_attributes(type.__setattr__, self.target_class, values)
+            else:
+                instance = self._instance()
+                if instance is not None:
+                    _set_attributes(object.__setattr__, instance, values)
+        self._snapshot = _Snapshot(
+            MappingProxyType(
+                {**snapshot.raw_values, **{name: raw_value for name, (raw_value, _) in resolved_variables.items()}}
+            ),
+            MappingProxyType({**snapshot.values, **values}),
+        )
 
-    def _raise_missing_variable(self, var_name: str, lookup_key: str) -> NoReturn:
-        if isinstance(self.source, ExtendedEnviron):
-            raise LookupError(
-                f"'{lookup_key}' is not an environment variable, nor has default value"
-                if var_name == lookup_key
-                else f"'{lookup_key}' is not an environment variable, nor '{var_name}' has default value"
-            )
-        raise LookupError(
-            f"'{lookup_key}' does not exist in {self._get_source_name()}, nor has default value"
-            if var_name == lookup_key
-            else f"'{lookup_key}' does not exist in {self._get_source_name()}, nor '{var_name}' has default value"
+    def _resolve_lazy_variable(self, field: Field) -> Any:
+        timings = instrumentation.new_timings()
+        with self._reload_lock:
+            raw_value = self._lookup(field.name, timings)
+            resolved_variables = self._resolve_variables([(field, raw_value)], timings)
+            self._publish(resolved_variables)
+        value = resolved_variables[field.name][1]
+        if timings is not None:
+            instrumentation.emit(self.target_class, "lazy", timings)
+        return value
+
+    def _check_unknown_variables(self) -> None:
+        # one pass over the source (or over the prefix partition of an index), never a scan per variable
+        prefixed_keys = (
+            self.source.keys_with_prefix(self.prefix)
+            if isinstance(self.source, PrefixIndex)
+            else [key for key in self.source if key.startswith(self.prefix)]
         )
+        known_keys = {self.prefix + name for name in self.variables_names}
+        unknown_keys = sorted(key for key in prefixed_keys if key not in known_keys)
+        if not unknown_keys:
+            return
 
-    def _get_source_name(self) -> str:
-        return inspections.retrieve_name(self.source) or "your source"
+        import difflib  # only needed to report typos
+
+        details = ""
+        for key in unknown_keys:
+            close_matches = difflib.get_close_matches(key, known_keys, n=1)
+            details += f"\n  {key}" + (f" (did you mean {close_matches[0]}?)" if close_matches else "")
+        message = f"{self.target_class.__qualname__} has no variables for these '{self.prefix}' keys:{details}"
+        if self.strict == "warn":
+            warnings.warn(message, UnknownVariablesWarning, stacklevel=4)
+        else:
+            raise UnknownVariablesError(message, unknown_keys)
+
+
+def _set_attributes(setter: Callable[[Any, str, Any], None], target: Any, values: Mapping[str, Any]) -> None:
+    # one loop in C, with no bytecode between two writes. the replaced values are still referenced by the previous
+    # snapshot, so none of them is finalized while the attributes are written
+    collections.deque(map(setter, itertools.repeat(target), values.keys(), values.values()), maxlen=0)
+
+
+class _LazyVariable:
+    """
+    placeholder installed by a lazy ConfigurationInjector.
+    the first read resolves and converts the variable, then replaces the placeholder by the value itself,
+    so later reads are plain class attribute reads.
+    """
+
+    def __init__(self, injector: ConfigurationInjector, field: Field) -> None:
+        self._injector = injector
+        self._field = field
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        return self._injector._resolve_lazy_variable(self._field)
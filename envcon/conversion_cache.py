@@ -0,0 +1,91 @@
+import functools
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Hashable, Set, Tuple
+
+from .utils.immutable import FrozenArray
+from .utils import type_utils
+from .utils.type_utils import Converter
+
+_IMMUTABLE_SCALAR_TYPES = (str, int, float, bool, type(None))
+_UNCACHED_CONVERTERS = frozenset(type_utils.compile_converter(type_) for type_ in (str, int, float, bool))
+
+
+class ConversionCache:
+    """
+    process-wide cache of converted values, keyed by the raw string and the converter of the target type.
+    classes reading the same value into the same type (e.g. a long tuple of hosts shared by many classes) convert it
+    once and hold the very same object. only immutable results are kept (including the read-only containers of
+    `immutable_values` classes): a list or a dict is converted for every class, since one class mutating it must
+    not change another.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+        # converters whose results are mutable (list, dict) are not looked up at all
+        self._mutable_results_converters: Set[Converter] = set()
+        self._lock = threading.Lock()
+
+    def convert(self, converter: Converter, value: str) -> Any:
+        if converter in _UNCACHED_CONVERTERS or converter in self._mutable_results_converters:
+            # a raw string is already the value. numbers and bools are cheaper to convert than to look up
+            return converter(value)
+        key = (value, converter)
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            except KeyError:
+                pass
+
+        # converting happens outside the lock. racing threads may convert the same value twice, which is harmless
+        converted = converter(value)
+        if is_immutable(converted):
+            with self._lock:
+                converted = self._entries.setdefault(key, converted)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        else:
+            self._mutable_results_converters.add(converter)
+        return converted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._mutable_results_converters.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def is_immutable(value: Any) -> bool:
+    if isinstance(value, (tuple, frozenset)):
+        return type(value) in (tuple, frozenset) and all(is_immutable(element) for element in value)
+    if type(value) is MappingProxyType:
+        # read-only mappings are only created by envcon, over a dict nobody else holds
+        return all(is_immutable(element) for element in value.values())
+    return type(value) in _IMMUTABLE_SCALAR_TYPES or type(value) is FrozenArray
+
+
+conversion_cache = ConversionCache()
+
+
+def convert(converter: Converter, value: str) -> Any:
+    return conversion_cache.convert(converter, value)
+
+
+def cached(converter: Converter) -> Converter:
+    """
+    `converter` going through the conversion cache, for loops converting values with known converters
+    """
+    if converter in _UNCACHED_CONVERTERS:
+        return converter
+    return functools.partial(conversion_cache.convert, converter)
+
+
+def clear_conversion_cache() -> None:
+    conversion_cache.clear()
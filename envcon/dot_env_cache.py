@@ -0,0 +1,91 @@
+import os
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+DotEnvValues = Mapping[str, Optional[str]]
+# "dotenv" parses with python-dotenv, "builtin" with envcon's own single pass parser (see dot_env_parser.py)
+PARSERS = ("dotenv", "builtin")
+DotEnvFingerprint = Optional[Tuple[int, int, int]]
+
+
+class DotEnvCache:
+    """
+    process-wide cache of parsed .env files.
+    entries are keyed by the resolved path and the parser, and validated against the file stat (mtime, size, inode),
+    so an edited file is parsed again while an unchanged file is parsed once no matter how many classes read it.
+    """
+
+    def __init__(self, max_size: int = 32) -> None:
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[DotEnvFingerprint, DotEnvValues]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path: str, parser: str = "dotenv") -> DotEnvValues:
+        if parser not in PARSERS:
+            raise ValueError(f"parser must be one of {PARSERS}, got {parser!r}")
+        resolved_path = os.path.realpath(path)
+        key = (resolved_path, parser)
+        fingerprint = _fingerprint(resolved_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # parsing happens outside the lock. racing threads may parse the same file twice, which is harmless
+        values: DotEnvValues = MappingProxyType(_parse(resolved_path, parser) if fingerprint else {})
+        with self._lock:
+            self._entries[key] = (fingerprint, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return values
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                resolved_path = os.path.realpath(path)
+                for parser in PARSERS:
+                    self._entries.pop((resolved_path, parser), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _fingerprint(path: str) -> DotEnvFingerprint:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+dot_env_cache = DotEnvCache()
+
+
+def _parse(path: str, parser: str) -> DotEnvValues:
+    if parser == "builtin":
+        from .dot_env_parser import parse_dot_env
+
+        return parse_dot_env(path)
+    import dotenv  # imported by the first .env file actually read
+
+    return dotenv.dotenv_values(path)
+
+
+def dot_env_fingerprint(path: str) -> DotEnvFingerprint:
+    return _fingerprint(os.path.realpath(path))
+
+
+def load_dot_env(path: str, parser: str = "dotenv") -> DotEnvValues:
+    return dot_env_cache.load(path, parser)
+
+
+def clear_dot_env_cache(path: Optional[str] = None) -> None:
+    dot_env_cache.invalidate(path)
@@ -0,0 +1,230 @@
+import bisect
+import os
+import re
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+# the grammar of python-dotenv, matched at a position of the whole file instead of read token by token
+_MULTILINE_WHITESPACE = re.compile(r"\s*")
+_WHITESPACE = re.compile(r"[^\S\r\n]*")
+_EXPORT = re.compile(r"(?:export[^\S\r\n]+)?")
+_SINGLE_QUOTED_KEY = re.compile(r"'([^']+)'")
+_UNQUOTED_KEY = re.compile(r"([^=\#\s]+)")
+_EQUAL_SIGN = re.compile(r"=[^\S\r\n]*")
+_SINGLE_QUOTED_VALUE = re.compile(r"'((?:\\.|[^'\\])*)'", re.DOTALL)
+_DOUBLE_QUOTED_VALUE = re.compile(r'"((?:\\.|[^"\\])*)"', re.DOTALL)
+_UNQUOTED_VALUE = re.compile(r"[^\r\n]*")
+_COMMENT = re.compile(r"(?:[^\S\r\n]*#[^\r\n]*)?")
+_END_OF_LINE = re.compile(r"[^\S\r\n]*(?:\r\n|\n|\r|$)")
+_REST_OF_LINE = re.compile(r"[^\r\n]*(?:\r|\n|\r\n)?")
+_INLINE_COMMENT = re.compile(r"\s+#.*")
+_SINGLE_QUOTE_ESCAPES = re.compile(r"\\[\\']")
+_DOUBLE_QUOTE_ESCAPES = re.compile(r"\\[\\'\"abfnrtv]")
+_ESCAPES = {"\\\\": "\\", "\\'": "'", '\\"': '"', "\\a": "\a", "\\b": "\b", "\\f": "\f", "\\n": "\n", "\\r": "\r"}
+_ESCAPES.update({"\\t": "\t", "\\v": "\v"})
+# fast path for the most common lines, `KEY=value` and `KEY="value"`, parsed exactly like the full grammar parses them
+_SIMPLE_BINDING = re.compile(r"""([^=\#\s'][^=\#\s]*)=(?:"([^"\\]*)"|([^\s#'"][^\s#]*))?(?:\n|\Z)""")
+_POSIX_VARIABLE = re.compile(r"\$\{(?P<name>[^\}:]*)(?::-(?P<default>[^\}]*))?\}")
+
+# kinds of values
+_NO_VALUE = 0  # a key without "=", its value is None
+_EMPTY = 1
+_UNQUOTED = 2
+_SINGLE_QUOTED = 3
+_DOUBLE_QUOTED = 4
+
+# files from this size are mapped in memory rather than read into a buffer first
+MMAP_THRESHOLD = 64 * 1024
+
+_Binding = Tuple[str, int, int, int]  # key, kind of value, start and end of the value in the text
+
+
+class DotEnvFile(Mapping[str, Optional[str]]):
+    """
+    the values of a .env file, as python-dotenv's dotenv_values() reads them (quotes, escapes, comments, `export`,
+    ${VARIABLE:-default} interpolation), parsed in a single pass over the file.
+    the pass only finds the keys and where their values are. a value is unescaped and interpolated on its first read,
+    so a lookup of a few keys in a generated file of thousands of lines never decodes the others.
+    interpolated variables which are not defined earlier in the file are read from os.environ at that first read.
+    """
+
+    def __init__(self, text: str, interpolate: bool = True) -> None:
+        self._text = text
+        self._interpolate = interpolate
+        self._bindings: List[_Binding] = []
+        # key -> index of its last binding. keys keep the order of their first binding, like a dict being updated
+        self._last_bindings: Dict[str, int] = {}
+        self._values: Dict[int, Optional[str]] = {}
+        self._bindings_by_key: Optional[Dict[str, List[int]]] = None
+        self._parse()
+
+    @classmethod
+    def read(cls, path: str, interpolate: bool = True, encoding: str = "utf-8") -> "DotEnvFile":
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < MMAP_THRESHOLD:
+                text = file.read().decode(encoding)
+            else:
+                import mmap
+
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = str(mapped, encoding)
+        if text.startswith("\ufeff"):
+            text = text[1:]
+        if "\r" in text:
+            # python-dotenv reads the file in text mode, which translates every newline to "\n"
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return cls(text, interpolate)
+
+    def __getitem__(self, key: str) -> Optional[str]:
+        return self._value(self._last_bindings[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._last_bindings
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._last_bindings)
+
+    def __len__(self) -> int:
+        return len(self._last_bindings)
+
+    def _parse(self) -> None:
+        text = self._text
+        position = 0
+        while True:
+            position = _skip(_MULTILINE_WHITESPACE, text, position)
+            if position >= len(text):
+                return
+            simple_binding = _SIMPLE_BINDING.match(text, position)
+            if simple_binding is not None:
+                key, double_quoted_value, unquoted_value = simple_binding.groups()
+                if double_quoted_value is not None:
+                    binding = (key, _DOUBLE_QUOTED, simple_binding.start(2), simple_binding.end(2))
+                elif unquoted_value is not None:
+                    binding = (key, _UNQUOTED, simple_binding.start(3), simple_binding.end(3))
+                else:
+                    binding = (key, _EMPTY, position, position)
+                self._last_bindings[key] = len(self._bindings)
+                self._bindings.append(binding)
+                position = simple_binding.end()
+                continue
+            start = position
+            try:
+                position = self._parse_binding(position)
+            except _ParseError as e:
+                position = _skip(_REST_OF_LINE, text, e.position)
+                _warn_invalid_line(text.count("\n", 0, start) + 1)
+
+    def _parse_binding(self, position: int) -> int:
+        text = self._text
+        position = _skip(_EXPORT, text, position)
+        key: Optional[str] = None
+        if not text.startswith("#", position):
+            key_match = (_SINGLE_QUOTED_KEY if text.startswith("'", position) else _UNQUOTED_KEY).match(text, position)
+            if key_match is None:
+                raise _ParseError(position)
+            key = key_match.group(1)
+            position = key_match.end()
+        position = _skip(_WHITESPACE, text, position)
+
+        kind, value_start, value_end = _NO_VALUE, position, position
+        if text.startswith("=", position):
+            equal_sign_end = _skip(_EQUAL_SIGN, text, position)
+            # with whitespace after "=", a "#" starts a comment (`KEY= # comment`), otherwise it's part of the value
+            if equal_sign_end - position > 1 and text.startswith("#", equal_sign_end):
+                kind, position = _EMPTY, equal_sign_end
+            else:
+                kind, value_start, value_end, position = _parse_value(text, equal_sign_end)
+
+        position = _skip(_COMMENT, text, position)
+        end_of_line = _END_OF_LINE.match(text, position)
+        if end_of_line is None:
+            raise _ParseError(position)
+        if key is not None:
+            self._last_bindings[key] = len(self._bindings)
+            self._bindings.append((key, kind, value_start, value_end))
+        return end_of_line.end()
+
+    def _value(self, index: int) -> Optional[str]:
+        try:
+            return self._values[index]
+        except KeyError:
+            pass
+        key, kind, start, end = self._bindings[index]
+        value = _decode_value(kind, self._text[start:end])
+        if value is not None and self._interpolate and "${" in value:
+            value = self._interpolate_variables(value, index)
+        # racing threads may decode the same value twice, which is harmless
+        self._values[index] = value
+        return value
+
+    def _interpolate_variables(self, value: str, index: int) -> str:
+        def resolve(match: "re.Match[str]") -> str:
+            name, default = match.group("name"), match.group("default")
+            # like python-dotenv, the values defined earlier in the file take precedence over os.environ
+            earlier_index = self._earlier_binding(name, index)
+            if earlier_index is not None:
+                resolved = self._value(earlier_index)
+            else:
+                resolved = os.environ.get(name, default if default is not None else "")
+            return resolved if resolved is not None else ""
+
+        return _POSIX_VARIABLE.sub(resolve, value)
+
+    def _earlier_binding(self, key: str, index: int) -> Optional[int]:
+        if self._bindings_by_key is None:
+            bindings_by_key: Dict[str, List[int]] = {}
+            for binding_index, binding in enumerate(self._bindings):
+                bindings_by_key.setdefault(binding[0], []).append(binding_index)
+            self._bindings_by_key = bindings_by_key
+        indices = self._bindings_by_key.get(key)
+        if not indices:
+            return None
+        position = bisect.bisect_left(indices, index)
+        return indices[position - 1] if position else None
+
+
+def _skip(pattern: "re.Pattern[str]", text: str, position: int) -> int:
+    # for patterns which also match the empty string
+    return pattern.match(text, position).end()  # type: ignore[union-attr]
+
+
+class _ParseError(Exception):
+    def __init__(self, position: int) -> None:
+        super().__init__(position)
+        self.position = position
+
+
+def _parse_value(text: str, position: int) -> Tuple[int, int, int, int]:
+    """
+    kind, start and end of the value at `position`, then the position after it
+    """
+    if text.startswith("'", position) or text.startswith('"', position):
+        kind = _SINGLE_QUOTED if text.startswith("'", position) else _DOUBLE_QUOTED
+        quoted_match = (_SINGLE_QUOTED_VALUE if kind == _SINGLE_QUOTED else _DOUBLE_QUOTED_VALUE).match(text, position)
+        if quoted_match is None:
+            raise _ParseError(position)
+        return kind, quoted_match.start(1), quoted_match.end(1), quoted_match.end()
+    if position >= len(text) or text[position] in "\r\n":
+        return _EMPTY, position, position, position
+    end = _skip(_UNQUOTED_VALUE, text, position)
+    return _UNQUOTED, position, end, end
+
+
+def _decode_value(kind: int, raw_value: str) -> Optional[str]:
+    if kind == _NO_VALUE:
+        return None
+    if kind == _UNQUOTED:
+        return _INLINE_COMMENT.sub("", raw_value).rstrip() if "#" in raw_value else raw_value.rstrip()
+    if kind == _EMPTY or "\\" not in raw_value:
+        return raw_value
+    escapes = _SINGLE_QUOTE_ESCAPES if kind == _SINGLE_QUOTED else _DOUBLE_QUOTE_ESCAPES
+    return escapes.sub(lambda match: _ESCAPES[match.group(0)], raw_value)
+
+
+def _warn_invalid_line(line: int) -> None:
+    import logging  # only needed to report invalid lines
+
+    logging.getLogger(__name__.split(".")[0]).warning("could not parse the .env statement starting at line %s", line)
+
+
+def parse_dot_env(path: str, interpolate: bool = True) -> DotEnvFile:
+    return DotEnvFile.read(path, interpolate)
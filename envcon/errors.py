@@ -0,0 +1,38 @@
+from typing import NamedTuple, Sequence, Tuple, Collection
+
+
+class FieldError(NamedTuple):
+    field: str
+    lookup_key: str
+    error: Exception
+
+
+class ConfigurationErrors(LookupError, ValueError):
+    """
+    all missing and unconvertible variables of a configuration class, raised when errors are collected.
+    it is both a LookupError and a ValueError, so handlers of a single-field error keep catching it.
+    """
+
+    def __init__(self, class_name: str, errors: Sequence[FieldError]) -> None:
+        self.class_name = class_name
+        self.errors: Tuple[FieldError, ...] = tuple(errors)
+        details = "".join(f"\n  {error.field}: {error.error}" for error in self.errors)
+        super().__init__(f"{len(self.errors)} invalid variable(s) in {class_name}:{details}")
+
+    @property
+    def exceptions(self) -> Tuple[Exception, ...]:
+        return tuple(error.error for error in self.errors)
+
+
+class UnknownVariablesError(LookupError):
+    """
+    raised in strict mode for source keys under the class prefix which match no annotated variable
+    """
+
+    def __init__(self, message: str, keys: Collection[str]) -> None:
+        self.keys = tuple(keys)
+        super().__init__(message)
+
+
+class UnknownVariablesWarning(UserWarning):
+    pass
@@ -1,30 +1,80 @@
 import os
-from typing import Mapping, Iterator, NoReturn, Any, Optional, Dict
+from typing import Mapping, Iterator, NoReturn, Any, Optional
 
-import dotenv
+from .dot_env_cache import PARSERS, DotEnvFingerprint, dot_env_fingerprint, load_dot_env
+
+_MISSING: Any = object()
 
 
 class ExtendedEnviron(Mapping[str, str]):
-    def __init__(self, read_dot_env_file: bool, dot_env_path: str) -> None:
-        self._dot_env: Dict[str, Optional[str]] = dotenv.dotenv_values(dot_env_path) if read_dot_env_file else {}
+    """
+    read-only view of os.environ layered on top of a .env file.
+    the merged dict is never built: a lookup is at most two dict probes, regardless of the environment size.
+    the .env file is parsed on the first lookup, so a source whose values are never read never parses it.
+    `dot_env_parser` is "dotenv" (python-dotenv) or "builtin" (envcon's own parser, much faster on large files).
+    """
+
+    def __init__(self, read_dot_env_file: bool, dot_env_path: str, dot_env_parser: str = "dotenv") -> None:
+        if dot_env_parser not in PARSERS:
+            raise ValueError(f"dot_env_parser must be one of {PARSERS}, got {dot_env_parser!r}")
+        self._read_dot_env_file = read_dot_env_file
+        self._dot_env_path = dot_env_path
+        self._dot_env_parser = dot_env_parser
+        self._loaded_dot_env: Optional[Mapping[str, Optional[str]]] = None if read_dot_env_file else {}
+
+    @property
+    def _dot_env(self) -> Mapping[str, Optional[str]]:
+        dot_env = self._loaded_dot_env
+        if dot_env is None:
+            self.refresh()
+            dot_env = self._loaded_dot_env
+        return dot_env  # type: ignore[return-value]
+
+    def refresh(self) -> None:
+        """
+        pick up changes of the .env file. os.environ is always read live and needs no refresh.
+        """
+        if self._read_dot_env_file:
+            self._loaded_dot_env = load_dot_env(self._dot_env_path, self._dot_env_parser)
+
+    def reopened(self) -> "ExtendedEnviron":
+        """
+        a new view of os.environ and of the same .env file, reading the file as it is now
+        """
+        return ExtendedEnviron(self._read_dot_env_file, self._dot_env_path, self._dot_env_parser)
+
+    def dot_env_fingerprint(self) -> DotEnvFingerprint:
+        """
+        (mtime, size, inode) of the .env file, None when it's missing or not read. the file is not parsed.
+        """
+        return dot_env_fingerprint(self._dot_env_path) if self._read_dot_env_file else None
 
     def __getitem__(self, key: str) -> str:
         if not isinstance(key, str):
             raise ValueError(f"str expected, not {type(key)}")
 
-        try:
-            return self.get_dot_env_combined_with_environ()[key]
-        except KeyError:
-            raise KeyError(key) from None
+        # os.environ is looked up on every access on purpose: it may be mutated or even replaced at runtime
+        value = os.environ.get(key, _MISSING)
+        if value is _MISSING:
+            value = self._dot_env.get(key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+        return value  # type: ignore[no-any-return]
 
     def __setitem__(self, key: Any, value: Any) -> NoReturn:
         raise NotImplementedError("object is readonly. set is not allowed")
 
+    def __contains__(self, key: object) -> bool:
+        return key in os.environ or key in self._dot_env
+
     def __len__(self) -> int:
-        return len(self.get_dot_env_combined_with_environ())
+        environ = os.environ
+        return len(environ) + sum(1 for key in self._dot_env if key not in environ)
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self.get_dot_env_combined_with_environ())
+        environ = os.environ
+        yield from environ
+        yield from (key for key in self._dot_env if key not in environ)
 
     def get_dot_env_combined_with_environ(self) -> Mapping:
         return {**self._dot_env, **os.environ} if self._dot_env else os.environ
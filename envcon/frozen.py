@@ -1,38 +1,53 @@
 import types
-from dataclasses import FrozenInstanceError
-from typing import Any, NoReturn
+from typing import Any, NoReturn, Dict, Mapping
 
-from .utils.functional import first
-
-_getattr = object.__getattribute__
-
-
-class _AccessBaseClassAttributesIfBaseAndDerivedShareSameNameMeta(type):
-    def __getattribute__(self, name: str) -> Any:
-        self_name = _getattr(self, "__name__")
-        bases = _getattr(self, "__bases__")
-        base = first(lambda b: _getattr(b, "__name__") == self_name, bases)
-        return _getattr(base, name) if base else _getattr(self, name)
+# attributes describing the class itself. they are copied to the frozen class so it is indistinguishable from the
+# original one, while every other attribute is found by a regular MRO lookup (no custom __getattribute__)
+_IDENTITY_ATTRIBUTES = ("__module__", "__qualname__", "__doc__")
+_class_namespace = type.__dict__["__dict__"].__get__
 
 
 class _FrozenInstanceAttributesBase:
     def __setattr__(self, name: str, value: Any) -> NoReturn:
-        raise FrozenInstanceError()
+        _raise_frozen_instance_error()
 
     def __delattr__(self, name: str) -> NoReturn:
-        raise FrozenInstanceError()
+        _raise_frozen_instance_error()
+
+
+class _FrozenClassAttributesMeta(_FrozenInstanceAttributesBase, type):
+    @property  # type: ignore[misc]
+    def __dict__(cls) -> Mapping[str, Any]:  # type: ignore[override]
+        # the values live in the original class, so vars() of a frozen class lists the original class attributes
+        bases = cls.__bases__
+        if len(bases) == 2 and bases[1] is _FrozenInstanceAttributesBase:
+            return bases[0].__dict__
+        return class_namespace(cls)
 
 
-class _FrozenClassAttributesMeta(
-    _FrozenInstanceAttributesBase,
-    _AccessBaseClassAttributesIfBaseAndDerivedShareSameNameMeta,
-):
-    pass
+def class_namespace(cls: type) -> Mapping[str, Any]:
+    """
+    the attributes defined by `cls` itself, even for a frozen class (whose __dict__ is the original class one)
+    """
+    return _class_namespace(cls)
+
+
+def _raise_frozen_instance_error() -> NoReturn:
+    # dataclasses is a heavy import (inspect, re, ...), only needed once a frozen attribute is actually assigned
+    from dataclasses import FrozenInstanceError
+
+    raise FrozenInstanceError()
 
 
 def create_frozen_class_from_another_class(cls: type) -> type:
+    def copy_identity_attributes(namespace: Dict[str, Any]) -> None:
+        namespace.update({name: getattr(cls, name) for name in _IDENTITY_ATTRIBUTES})
+        if "__annotations__" in cls.__dict__:
+            namespace["__annotations__"] = cls.__dict__["__annotations__"]
+
     return types.new_class(
         cls.__name__,
         (cls, _FrozenInstanceAttributesBase),
         kwds={"metaclass": _FrozenClassAttributesMeta},
+        exec_body=copy_identity_attributes,
     )
@@ -0,0 +1,165 @@
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+class LoadEvent(NamedTuple):
+    """
+    timings of one operation of a decorated class: its decoration ("load"), a reload, or a lazy variable access
+    ("lazy"). fields_seconds holds the conversion time of every converted variable, fields_lookup_seconds the time of
+    reading every variable from the source (a bulk source reads them all at once, its time is shared evenly).
+    """
+
+    class_name: str
+    kind: str
+    schema_seconds: float
+    lookup_seconds: float
+    conversion_seconds: float
+    construction_seconds: float
+    fields_seconds: Dict[str, float]
+    fields_lookup_seconds: Dict[str, float]
+
+    @property
+    def total_seconds(self) -> float:
+        return self.schema_seconds + self.lookup_seconds + self.conversion_seconds + self.construction_seconds
+
+
+class ClassStats(NamedTuple):
+    """
+    sum of the timings of every event of a decorated class
+    """
+
+    class_name: str
+    events: int
+    schema_seconds: float
+    lookup_seconds: float
+    conversion_seconds: float
+    construction_seconds: float
+    fields_seconds: Dict[str, float]
+    fields_lookup_seconds: Dict[str, float]
+
+    @property
+    def total_seconds(self) -> float:
+        return self.schema_seconds + self.lookup_seconds + self.conversion_seconds + self.construction_seconds
+
+
+LoadHook = Callable[[LoadEvent], object]
+
+
+class Timings:
+    """
+    timings of a single operation, filled while it runs
+    """
+
+    __slots__ = ("schema", "lookup", "conversion", "construction", "fields", "fields_lookup")
+
+    def __init__(self) -> None:
+        self.schema = 0.0
+        self.lookup = 0.0
+        self.conversion = 0.0
+        self.construction = 0.0
+        self.fields: Dict[str, float] = {}
+        self.fields_lookup: Dict[str, float] = {}
+
+    def add_lookup(self, name: str, seconds: float) -> None:
+        self.lookup += seconds
+        self.fields_lookup[name] = self.fields_lookup.get(name, 0.0) + seconds
+
+    def add_conversion(self, name: str, seconds: float) -> None:
+        self.conversion += seconds
+        self.fields[name] = self.fields.get(name, 0.0) + seconds
+
+
+# read by the injectors before timing anything. while False, an operation costs one attribute read per field
+enabled = False
+_instrumentations = 0
+_hooks: List[LoadHook] = []
+_stats: Dict[str, ClassStats] = {}
+_lock = threading.Lock()
+
+
+def instrument(hook: Optional[LoadHook] = None) -> Callable[[], None]:
+    """
+    start recording the timings of decorated classes: reading the source, converting every variable and
+    constructing the class. `hook` (if given) is called with a LoadEvent after every operation, and the timings are
+    summed in stats(). returns a function stopping this instrumentation, recording stops once every one is stopped.
+    """
+    global enabled, _instrumentations
+    with _lock:
+        _instrumentations += 1
+        if hook is not None:
+            _hooks.append(hook)
+        enabled = True
+    stopped = False
+
+    def stop() -> None:
+        global enabled, _instrumentations
+        nonlocal stopped
+        with _lock:
+            if stopped:
+                return
+            stopped = True
+            _instrumentations -= 1
+            if hook is not None:
+                _hooks.remove(hook)
+            enabled = _instrumentations > 0
+
+    return stop
+
+
+def new_timings() -> Optional[Timings]:
+    return Timings() if enabled else None
+
+
+def emit(cls: type, kind: str, timings: Timings) -> None:
+    class_name = f"{cls.__module__}.{cls.__qualname__}"
+    event = LoadEvent(
+        class_name,
+        kind,
+        timings.schema,
+        timings.lookup,
+        timings.conversion,
+        timings.construction,
+        timings.fields,
+        timings.fields_lookup,
+    )
+    with _lock:
+        previous = _stats.get(class_name) or ClassStats(class_name, 0, 0.0, 0.0, 0.0, 0.0, {}, {})
+        _stats[class_name] = ClassStats(
+            class_name,
+            previous.events + 1,
+            previous.schema_seconds + event.schema_seconds,
+            previous.lookup_seconds + event.lookup_seconds,
+            previous.conversion_seconds + event.conversion_seconds,
+            previous.construction_seconds + event.construction_seconds,
+            _add_fields_seconds(previous.fields_seconds, timings.fields),
+            _add_fields_seconds(previous.fields_lookup_seconds, timings.fields_lookup),
+        )
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            import logging  # only needed to report a broken hook
+
+            # a broken hook must not break loading the configuration
+            logging.getLogger(__name__.split(".")[0]).exception("instrumentation hook %r failed", hook)
+
+
+def _add_fields_seconds(total: Dict[str, float], added: Dict[str, float]) -> Dict[str, float]:
+    total = dict(total)
+    for name, seconds in added.items():
+        total[name] = total.get(name, 0.0) + seconds
+    return total
+
+
+def stats() -> Dict[str, ClassStats]:
+    """
+    timings recorded while instrumented, summed by decorated class (`module.QualifiedName`), slowest class first
+    """
+    with _lock:
+        return dict(sorted(_stats.items(), key=lambda item: item[1].total_seconds, reverse=True))
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.clear()
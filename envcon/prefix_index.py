@@ -0,0 +1,65 @@
+import bisect
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, NamedTuple
+
+
+class _Snapshot(NamedTuple):
+    values: Dict[str, str]
+    sorted_keys: List[str]
+    partitions: Dict[str, Mapping[str, str]]
+
+
+class PrefixIndex(Mapping[str, str]):
+    """
+    snapshot of a source with its keys sorted, so the keys sharing a prefix are found by binary search.
+    configuration classes decorated with an index read from the sub-mapping of their prefix, and listing the keys
+    under a prefix costs O(log n + keys under prefix) instead of a scan of the whole source.
+    the snapshot is taken once. call refresh() to pick up changes of the underlying source.
+    """
+
+    def __init__(self, source: Mapping[str, str]) -> None:
+        self.source = source
+        self._snapshot = _Snapshot({}, [], {})
+        self.refresh()
+
+    def refresh(self) -> None:
+        refresh_source = getattr(self.source, "refresh", None)
+        if callable(refresh_source):
+            refresh_source()
+        values = dict(self.source)
+        # a single attribute assignment: readers see either the old snapshot or the new one
+        self._snapshot = _Snapshot(values, sorted(values), {})
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        return _keys_with_prefix(self._snapshot.sorted_keys, prefix)
+
+    def with_prefix(self, prefix: str) -> Mapping[str, str]:
+        """
+        read-only sub-mapping of the keys starting with `prefix`. keys keep their prefix.
+        """
+        snapshot = self._snapshot
+        partition = snapshot.partitions.get(prefix)
+        if partition is None:
+            values = snapshot.values
+            partition = MappingProxyType(
+                {key: values[key] for key in _keys_with_prefix(snapshot.sorted_keys, prefix)} if prefix else values
+            )
+            snapshot.partitions[prefix] = partition
+        return partition
+
+    def __getitem__(self, key: str) -> str:
+        return self._snapshot.values[key]
+
+    def __len__(self) -> int:
+        return len(self._snapshot.values)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.values)
+
+
+def _keys_with_prefix(sorted_keys: List[str], prefix: str) -> List[str]:
+    start = bisect.bisect_left(sorted_keys, prefix)
+    end = start
+    while end < len(sorted_keys) and sorted_keys[end].startswith(prefix):
+        end += 1
+    return sorted_keys[start:end]
@@ -0,0 +1,102 @@
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Set, List, Tuple, Optional, Mapping
+
+from .frozen import class_namespace
+from .prefix_index import PrefixIndex
+
+if TYPE_CHECKING:
+    from .configuration_injector import ConfigurationInjector
+
+# every decorated class holds its injector, which references the class back. the registry only references the classes
+# weakly, so a class and its injector are collected together, like any reference cycle
+_INJECTOR_ATTRIBUTE = "__envcon_injector__"
+_classes: "weakref.WeakKeyDictionary[type, None]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def register(cls: type, injector: "ConfigurationInjector") -> None:
+    # skips the restrictions of a frozen class metaclass
+    type.__setattr__(cls, _INJECTOR_ATTRIBUTE, injector)
+    with _lock:
+        _classes[cls] = None
+
+
+def registered_classes() -> List[type]:
+    with _lock:
+        return list(_classes.keys())
+
+
+def registered_injectors() -> List[Tuple[type, "ConfigurationInjector"]]:
+    return [(cls, class_namespace(cls)[_INJECTOR_ATTRIBUTE]) for cls in registered_classes()]
+
+
+def get_injector(cls: Any) -> "ConfigurationInjector":
+    """
+    the injector which processed a decorated class (or a slots configuration instance)
+    """
+    # the class own attribute only: a subclass of a decorated class is not a configuration class itself
+    injector = class_namespace(cls if isinstance(cls, type) else type(cls)).get(_INJECTOR_ATTRIBUTE)
+    if injector is None:
+        raise TypeError(f"{cls!r} is not a configuration class")
+    return injector
+
+
+def reload(cls: Any) -> Set[str]:
+    """
+    re-read the source of a decorated class (or of a slots configuration instance) and inject the values which
+    changed since the last (re)load. returns the names of the changed variables.
+    """
+    return get_injector(cls).reload()
+
+
+def snapshot(cls: Any) -> Mapping[str, Any]:
+    """
+    read-only mapping of the values of a decorated class (or of a slots configuration instance), as of its last
+    (re)load. a reload replaces it as a whole, so reading several values from one snapshot never mixes two loads,
+    unlike reading them one by one from the class.
+    """
+    return get_injector(cls).snapshot()
+
+
+def reload_all() -> Dict[type, Set[str]]:
+    """
+    reload every decorated class, except those loaded by load_configuration(). a failing class doesn't prevent
+    reloading the others, the first error is raised once all the classes were attempted.
+    """
+    return _reload([(cls, injector) for cls, injector in registered_injectors() if injector.reloadable])
+
+
+def reload_using(source: Mapping[str, str]) -> Dict[type, Set[str]]:
+    """
+    reload every class decorated with `source` (or with a PrefixIndex of `source`), same as reload_all() otherwise.
+    """
+    return _reload(
+        [
+            (cls, injector)
+            for cls, injector in registered_injectors()
+            if injector.reloadable and _reads(injector.source, source)
+        ]
+    )
+
+
+def _reads(class_source: Mapping[str, str], source: Mapping[str, str]) -> bool:
+    return class_source is source or (isinstance(class_source, PrefixIndex) and _reads(class_source.source, source))
+
+
+def _reload(items: List[Tuple[type, "ConfigurationInjector"]]) -> Dict[type, Set[str]]:
+    # a source shared by many classes (e.g. a PrefixIndex, which copies and sorts the whole source) is refreshed once
+    sources = {id(injector.source): injector for _, injector in items}
+    for injector in sources.values():
+        injector.refresh_source()
+
+    reloaded = {}
+    first_error: Optional[Exception] = None
+    for cls, injector in items:
+        try:
+            reloaded[cls] = injector.reload(refresh_source=False)
+        except (LookupError, ValueError) as e:
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
+    return reloaded
@@ -0,0 +1,175 @@
+import atexit
+import sys
+import weakref
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Mapping, NamedTuple, Optional, Sequence, Tuple, get_type_hints
+
+from .utils import type_utils
+from .utils.immutable import freeze
+
+if TYPE_CHECKING:
+    from .schema_disk_cache import SchemaDiskCache
+
+
+class Field(NamedTuple):
+    name: str
+    lookup_key: str
+    type: type
+    default: Any
+    converter: type_utils.Converter
+    optional: bool
+
+
+class Schema:
+    """
+    compiled description of a configuration class: for every annotated variable its lookup key, default value,
+    converter and whether it's optional. built once per decoration and reused by reloads.
+    """
+
+    def __init__(self, cls: type, prefix: str, fields: Sequence[Field]) -> None:
+        self.cls = cls
+        self.prefix = prefix
+        self.fields: Tuple[Field, ...] = tuple(fields)
+        self.fields_by_name: Dict[str, Field] = {field.name: field for field in self.fields}
+
+    @classmethod
+    def from_class(
+        cls,
+        target_class: type,
+        prefix: str = "",
+        separator: str = ",",
+        escape: Optional[str] = None,
+        immutable_values: bool = False,
+        defaults: Optional[Mapping[str, Any]] = None,
+    ) -> "Schema":
+        """
+        `defaults` replaces the values of the class attributes, e.g. for a class whose variables were injected
+        """
+
+        def default(variable_name: str) -> Any:
+            value = getattr(target_class, variable_name, None) if defaults is None else defaults.get(variable_name)
+            return freeze(value) if immutable_values else value
+
+        return cls(
+            target_class,
+            prefix,
+            [
+                Field(
+                    name=variable_name,
+                    lookup_key=prefix + variable_name,
+                    type=variable_type,
+                    default=default(variable_name),
+                    converter=type_utils.compile_converter(variable_type, separator, escape, immutable_values),
+                    optional=type_utils.is_optional(variable_type),
+                )
+                for variable_name, variable_type in class_type_hints(target_class).items()
+            ],
+        )
+
+    def __repr__(self) -> str:
+        return f"Schema({self.cls.__qualname__}, prefix={self.prefix!r}, fields={[f.name for f in self.fields]})"
+
+
+class DeferredSchema(Schema):
+    """
+    schema compiled on the first access of its fields, for classes whose values are already known (e.g. read from a
+    bundle) and may never need their type hints evaluated
+    """
+
+    def __init__(
+        self,
+        cls: type,
+        prefix: str,
+        separator: str,
+        escape: Optional[str],
+        immutable_values: bool,
+        defaults: Mapping[str, Any],
+    ) -> None:
+        self.cls = cls
+        self.prefix = prefix
+        self._arguments = separator, escape, immutable_values, defaults
+
+    def __getattr__(self, name: str) -> Any:
+        # only called while fields and fields_by_name are not set yet
+        if name not in ("fields", "fields_by_name"):
+            raise AttributeError(name)
+        compiled = Schema.from_class(self.cls, self.prefix, *self._arguments)
+        self.fields = compiled.fields
+        self.fields_by_name = compiled.fields_by_name
+        return getattr(self, name)
+
+
+def class_defaults(cls: type, names: Iterable[str]) -> Dict[str, Any]:
+    """
+    the values of `names` in `cls`, None for a variable without a value. read them before injecting variables.
+    """
+    return {name: getattr(cls, name, None) for name in names}
+
+
+def class_type_hints(cls: type) -> Dict[str, Any]:
+    """
+    same as typing.get_type_hints(cls), but the annotations of every class in the MRO are evaluated only once.
+    decorating a subclass reuses the hints already evaluated for its bases.
+    """
+    hints: Dict[str, Any] = {}
+    for base in reversed(cls.__mro__):
+        hints.update(_own_type_hints(base))
+    return hints
+
+
+_own_type_hints_cache: "weakref.WeakKeyDictionary[type, Tuple[Dict[str, Any], int, Dict[str, Any]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _own_type_hints(cls: type) -> Dict[str, Any]:
+    annotations = cls.__dict__.get("__annotations__")
+    if not isinstance(annotations, dict) or not annotations:
+        return {}
+
+    entry = _own_type_hints_cache.get(cls)
+    if entry is not None and entry[0] is annotations and entry[1] == len(annotations):
+        return entry[2]
+
+    hints = _disk_cache.get(cls) if _disk_cache is not None else None
+    if hints is None:
+        hints = _evaluate_own_type_hints(cls, annotations)
+        if _disk_cache is not None:
+            _disk_cache.put(cls, hints)
+    _own_type_hints_cache[cls] = (annotations, len(annotations), hints)
+    return hints
+
+
+def _evaluate_own_type_hints(cls: type, annotations: Dict[str, Any]) -> Dict[str, Any]:
+    # a stand-in class carrying only `cls` own annotations, so get_type_hints doesn't walk (and re-evaluate) the MRO
+    holder = type(cls.__name__, (), {"__annotations__": annotations, "__module__": cls.__module__})
+    module_globals = getattr(sys.modules.get(cls.__module__), "__dict__", {})
+    if sys.version_info >= (3, 10):
+        # the lookup order of get_type_hints(cls): the module globals, then the class namespace, then the builtins
+        return get_type_hints(holder, globalns=dict(vars(cls)), localns=module_globals)
+    return get_type_hints(holder, globalns=module_globals, localns=module_globals)
+
+
+_disk_cache: Optional["SchemaDiskCache"] = None
+
+
+def enable_disk_cache(path: str) -> None:
+    """
+    persist evaluated type hints to `path` (written at exit) and reuse them on the next process start
+    """
+    from .schema_disk_cache import SchemaDiskCache  # json and hashlib are imported only when the cache is used
+
+    global _disk_cache
+    if _disk_cache is not None and _disk_cache.path == path:
+        return
+    if _disk_cache is not None:
+        disable_disk_cache()
+    _disk_cache = SchemaDiskCache(path)
+    atexit.register(_disk_cache.flush)
+
+
+def disable_disk_cache() -> None:
+    global _disk_cache
+    if _disk_cache is not None:
+        atexit.unregister(_disk_cache.flush)
+        _disk_cache.flush()
+        _disk_cache = None
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import typing
+from typing import Any, Dict, List, Optional, Tuple
+
+_DISK_CACHE_VERSION = 2
+
+# a hint is stored as data, never as code: None, "...", {"class": [module, qualname]},
+# {"alias": [module, name], "args": [...]} or {"value": literal}. decoding only looks up classes (and typing forms) of
+# modules already imported and subscripts them, so a tampered file can't run anything
+_Encoded = Any
+_Entries = Dict[Tuple[str, str], Tuple[str, Dict[str, _Encoded]]]
+_LITERAL_TYPES = (str, int, bool, type(None))
+
+
+class SchemaDiskCache:
+    """
+    evaluated type hints persisted as json, so short-lived processes skip evaluating string annotations
+    (e.g. `from __future__ import annotations`). entries are keyed by the class module and qualified name,
+    and are valid only as long as the module source hash is unchanged.
+    hints which can't be rebuilt identically from their classes names (e.g. Callable) are not persisted.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: _Entries = self._read()
+        self._sources_hashes: Dict[str, Optional[str]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def get(self, cls: type) -> Optional[Dict[str, Any]]:
+        key, source_hash = self._key(cls)
+        entry = self._entries.get(key) if source_hash else None
+        if entry is None or entry[0] != source_hash:
+            return None
+        try:
+            return {name: _decode(hint) for name, hint in entry[1].items()}
+        except Exception:
+            return None  # e.g. a class moved to another module
+
+    def put(self, cls: type, hints: Dict[str, Any]) -> None:
+        key, source_hash = self._key(cls)
+        if not source_hash:
+            return
+        try:
+            encoded_hints = {name: _encode(hint) for name, hint in hints.items()}
+            decoded_hints = {name: _decode(hint) for name, hint in encoded_hints.items()}
+        except Exception:
+            return  # e.g. hints referring to local classes
+        if repr(decoded_hints) != repr(hints) or decoded_hints != hints:
+            return
+        with self._lock:
+            self._entries[key] = (source_hash, encoded_hints)
+            self._dirty = True
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [
+                [module, qualname, source_hash, hints]
+                for (module, qualname), (source_hash, hints) in self._entries.items()
+            ]
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            # a private file with an unpredictable name, renamed over the cache once complete
+            descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".envcon-schema-", suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, "w") as file:
+                    json.dump({"version": _DISK_CACHE_VERSION, "entries": entries}, file)
+                os.replace(temporary_path, self.path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+            self._dirty = False
+
+    def _read(self) -> _Entries:
+        try:
+            with open(self.path) as file:
+                content = json.load(file)
+            if not isinstance(content, dict) or content.get("version") != _DISK_CACHE_VERSION:
+                return {}
+            return {
+                (module, qualname): (source_hash, hints) for module, qualname, source_hash, hints in content["entries"]
+            }
+        except Exception:
+            return {}  # missing or corrupted cache, it's rebuilt at exit
+
+    def _key(self, cls: type) -> Tuple[Tuple[str, str], Optional[str]]:
+        key = (cls.__module__, cls.__qualname__)
+        if "<locals>" in cls.__qualname__:
+            return key, None  # several classes may share this name
+        if cls.__module__ not in self._sources_hashes:
+            self._sources_hashes[cls.__module__] = module_source_hash(cls.__module__)
+        return key, self._sources_hashes[cls.__module__]
+
+
+def _encode(hint: Any) -> _Encoded:
+    if hint is None or hint is type(None):
+        return None
+    if hint is Ellipsis:
+        return "..."
+    origin = typing.get_origin(hint)
+    if origin is None:
+        if not isinstance(hint, type):
+            raise TypeError(f"can't store {hint!r}")
+        return {"class": [hint.__module__, hint.__qualname__]}
+    name = getattr(hint, "_name", None)
+    if not isinstance(origin, type):
+        alias = ["typing", origin._name]  # a special form: Union (Optional included), Literal
+    elif type(hint).__module__ == "typing" and name and getattr(typing, name, None) is not None:
+        alias = ["typing", name]  # List[int] and list[int] are different hints
+    else:
+        alias = [origin.__module__, origin.__qualname__]
+    if origin is typing.Literal:
+        if not all(type(arg) in _LITERAL_TYPES for arg in typing.get_args(hint)):
+            raise TypeError(f"can't store {hint!r}")
+        return {"alias": alias, "args": [{"value": arg} for arg in typing.get_args(hint)]}
+    return {"alias": alias, "args": [_encode(arg) for arg in typing.get_args(hint)]}
+
+
+def _decode(encoded: _Encoded) -> Any:
+    if encoded is None:
+        return type(None)
+    if encoded == "...":
+        return Ellipsis
+    if "value" in encoded:
+        if type(encoded["value"]) not in _LITERAL_TYPES:
+            raise TypeError(f"invalid literal {encoded['value']!r}")
+        return encoded["value"]
+    if "class" in encoded:
+        cls = _lookup(*encoded["class"])
+        if not isinstance(cls, type):
+            raise TypeError(f"{encoded['class']} is not a class")
+        return cls
+    alias = _lookup(*encoded["alias"])
+    if not isinstance(alias, type) and encoded["alias"][0] != "typing":
+        raise TypeError(f"{encoded['alias']} is not a class")
+    args: List[Any] = [_decode(arg) for arg in encoded["args"]]
+    return alias[args[0] if len(args) == 1 else tuple(args)]
+
+
+def _lookup(module_name: str, qualname: str) -> Any:
+    # never imported, nor read through a module __getattr__: both run code
+    value: Any = sys.modules[module_name]
+    for name in qualname.split("."):
+        value = vars(value)[name]
+    return value
+
+
+def module_source_hash(module_name: str) -> Optional[str]:
+    path = getattr(sys.modules.get(module_name), "__file__", None)
+    if not path:
+        return None
+    try:
+        with open(path, "rb") as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
@@ -0,0 +1,145 @@
+import types
+from typing import Any, Callable, Collection, Mapping, Sequence
+
+from .frozen import _FrozenClassAttributesMeta, _FrozenInstanceAttributesBase
+from .registry import _INJECTOR_ATTRIBUTE
+from .schema import Field
+from .utils.codegen import create_function, create_repr_function, is_attribute_name, tuple_of
+
+_REPLACED_ATTRIBUTES = ("__dict__", "__weakref__", _INJECTOR_ATTRIBUTE)
+_GENERATED_FUNCTIONS_NAMES = ("__init__", "__repr__", "__eq__", "__hash__")
+
+
+def create_slotted_class(
+    cls: type,
+    fields: Sequence[Field],
+    frozen: bool,
+    override_init: bool,
+    override_repr: bool,
+    sensitive: Collection[str] = (),
+) -> type:
+    """
+    recreate `cls` (same name, bases, methods) with a slot per field instead of class attributes, so instances
+    hold their own values: reading one is a plain slot read and an instance takes the memory of a small tuple.
+    __repr__, __eq__ and __hash__ are generated for the fields, once per class.
+    """
+    names = [field.name for field in fields]
+    invalid_names = [name for name in names if not is_attribute_name(name)]
+    if invalid_names:
+        raise ValueError(f"can't create slots for {invalid_names}, variables names must be identifiers, not keywords")
+
+    namespace = {
+        name: value for name, value in cls.__dict__.items() if name not in names and name not in _REPLACED_ATTRIBUTES
+    }
+    namespace["__slots__"] = tuple(names) + (
+        # weakly referenced by the reload registry. a base with a __dict__ already has one
+        ("__weakref__",)
+        if not any(hasattr(base, "__weakref__") for base in cls.__bases__)
+        else ()
+    )
+    if override_init:
+        namespace["__init__"] = _create_init_function(fields)
+    if override_repr:
+        namespace["__repr__"] = create_repr_function(cls.__qualname__, names, sensitive)
+    namespace.setdefault("__eq__", _create_eq_function(names))
+    if frozen:
+        namespace.setdefault("__hash__", create_function("__hash__", "self", f"return hash({tuple_of('self', names)})"))
+        namespace.setdefault("__setattr__", _FrozenInstanceAttributesBase.__setattr__)
+        namespace.setdefault("__delattr__", _FrozenInstanceAttributesBase.__delattr__)
+    else:
+        namespace.setdefault("__hash__", None)  # mutable and comparable by value, like a dataclass
+
+    for value in namespace.values():
+        if getattr(value, "__qualname__", None) in _GENERATED_FUNCTIONS_NAMES:
+            value.__qualname__ = f"{cls.__qualname__}.{value.__name__}"
+
+    metaclass = _FrozenClassAttributesMeta if frozen else type(cls)
+    slotted_class = types.new_class(
+        cls.__name__, cls.__bases__, kwds={"metaclass": metaclass}, exec_body=lambda ns: ns.update(namespace)
+    )
+    for name, value in namespace.items():
+        with_class_cell = _with_class_cell(value, cls, slotted_class)
+        if with_class_cell is not value:
+            type.__setattr__(slotted_class, name, with_class_cell)
+    return slotted_class
+
+
+def _with_class_cell(value: Any, cls: type, slotted_class: type) -> Any:
+    """
+    `value` (a function, property, classmethod or staticmethod) calling super() without arguments, copied with its
+    __class__ cell holding `slotted_class`. other values are returned as they are. the methods of `cls` are left as is.
+    """
+    if isinstance(value, (classmethod, staticmethod)):
+        function = _with_class_cell(value.__func__, cls, slotted_class)
+        return value if function is value.__func__ else type(value)(function)
+    if isinstance(value, property):
+        accessors = [
+            _with_class_cell(accessor, cls, slotted_class) for accessor in (value.fget, value.fset, value.fdel)
+        ]
+        changed = any(new is not old for new, old in zip(accessors, (value.fget, value.fset, value.fdel)))
+        return type(value)(accessors[0], accessors[1], accessors[2], value.__doc__) if changed else value
+    if not isinstance(value, types.FunctionType) or "__class__" not in value.__code__.co_freevars:
+        return value
+    index = value.__code__.co_freevars.index("__class__")
+    closure = list(value.__closure__ or ())
+    if closure[index].cell_contents is not cls:
+        return value
+    closure[index] = types.CellType(slotted_class)
+    function = types.FunctionType(value.__code__, value.__globals__, value.__name__, value.__defaults__, tuple(closure))
+    function.__kwdefaults__ = value.__kwdefaults__
+    function.__dict__.update(value.__dict__)
+    function.__qualname__, function.__doc__, function.__module__ = value.__qualname__, value.__doc__, value.__module__
+    function.__annotations__ = value.__annotations__
+    return function
+
+
+def new_instance(cls: type, values: Mapping[str, Any]) -> Any:
+    """
+    an instance of a slotted class holding `values`, created without calling (a possibly user defined) __init__
+    """
+    instance: Any = object.__new__(cls)
+    for name, value in values.items():
+        object.__setattr__(instance, name, value)
+    return instance
+
+
+def create_instance_factory(cls: type, names: Sequence[str]) -> Callable[..., Any]:
+    """
+    same as new_instance(), with the values given positionally in `names` order
+    """
+    body = "\n".join(
+        ["_envcon_instance = _envcon_new(_envcon_cls)"]
+        + [f"_envcon_setattr(_envcon_instance, {name!r}, {name})" for name in names]
+        + ["return _envcon_instance"]
+    )
+    return create_function(
+        "create_instance",
+        ", ".join(names),
+        body,
+        {"_envcon_new": object.__new__, "_envcon_setattr": object.__setattr__, "_envcon_cls": cls},
+    )
+
+
+def _create_init_function(fields: Sequence[Field]) -> Callable[..., None]:
+    defaults = {f"_envcon_default_{field.name}": field.default for field in fields}
+    parameters = ", ".join(
+        field.name if field.default is None and not field.optional else f"{field.name}=_envcon_default_{field.name}"
+        for field in fields
+    )
+    body = "\n".join(f"_envcon_setattr(self, {field.name!r}, {field.name})" for field in fields) or "pass"
+    return create_function(
+        "__init__",
+        f"self, *, {parameters}" if parameters else "self",
+        body,
+        {"_envcon_setattr": object.__setattr__, **defaults},
+    )
+
+
+def _create_eq_function(names: Sequence[str]) -> Callable[[Any, Any], bool]:
+    return create_function(
+        "__eq__",
+        "self, other",
+        f"if other.__class__ is self.__class__:\n"
+        f"    return {tuple_of('self', names)} == {tuple_of('other', names)}\n"
+        f"return NotImplemented",
+    )
@@ -0,0 +1,18 @@
+from typing import Mapping, Optional, Protocol, Sequence, runtime_checkable
+
+
+@runtime_checkable
+class BulkSource(Protocol):
+    """
+    a source which can fetch many keys in one call. ConfigurationInjector prefers get_many() over per-key get()
+    when the source has it, so sources with a fixed cost per call (remote stores, vaults) are called once per class.
+    keys missing from the source should be missing from the result (or mapped to None).
+    """
+
+    def get_many(self, keys: Sequence[str]) -> Mapping[str, Optional[str]]:
+        ...
+
+
+def is_bulk_source(source: object) -> bool:
+    # same as isinstance(source, BulkSource), without the (slow) runtime protocol check
+    return callable(getattr(source, "get_many", None))
@@ -0,0 +1,51 @@
+import keyword
+from typing import Any, Collection, Dict, Optional, Sequence
+
+MASK = "***"
+
+
+def create_function(name: str, parameters: str, body: str, globals_: Optional[Dict[str, Any]] = None) -> Any:
+    # the methods are generated with the fields names written in their code, so calling them loops over nothing
+    source = f"def {name}({parameters}):\n" + "".join(f"    {line}\n" for line in body.splitlines())
+    namespace: Dict[str, Any] = {}
+    exec(source, dict(globals_ or {}), namespace)
+    return namespace[name]
+
+
+def create_repr_function(class_name: str, names: Sequence[str], sensitive: Collection[str] = ()) -> Any:
+    """
+    __repr__ formatting `names` as `ClassName(NAME=value,...)`, in a single f-string.
+    the values of `sensitive` names are masked and never read.
+    the class name and the names which aren't identifiers are read from the function globals, never written in its code
+    """
+    values = []
+    for index, name in enumerate(names):
+        if name in sensitive:
+            values.append(f"{{_envcon_masked[{index}]}}")
+        elif is_attribute_name(name):
+            values.append(f"{name}={{self.{name}}}")
+        else:  # a name set in __annotations__ by hand. it can't be written as an attribute access
+            values.append(f"{{_envcon_names[{index}]}}={{_envcon_getattr(self, _envcon_names[{index}])}}")
+    comma_separated_values = ",".join(values)
+    return create_function(
+        "__repr__",
+        "self",
+        f'return f"{{_envcon_class_name}}({comma_separated_values})"',
+        {
+            "_envcon_class_name": class_name,
+            "_envcon_names": tuple(names),
+            "_envcon_masked": tuple(f"{name}={MASK}" for name in names),
+            "_envcon_getattr": getattr,
+        },
+    )
+
+
+def is_attribute_name(name: str) -> bool:
+    """
+    whether `name` can be written as an attribute access in generated code (`self.name`)
+    """
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def tuple_of(variable: str, names: Sequence[str]) -> str:
+    return f"({''.join(f'{variable}.{name}, ' for name in names)})"
@@ -0,0 +1,81 @@
+from array import array
+from types import MappingProxyType
+from typing import Any, Iterable, Iterator, Sequence, Union, overload
+
+INT_TYPECODE = "q"  # 64 bits signed
+FLOAT_TYPECODE = "d"
+
+
+class FrozenArray(Sequence):
+    """
+    read-only sequence of ints or floats stored unboxed in an array.array (8 bytes per element, instead of a pointer
+    and a python object per element in a list). it behaves like a tuple, and equals tuples of the same numbers.
+    """
+
+    __slots__ = ("_array",)
+    _array: "array[Any]"
+
+    def __init__(self, typecode: str, values: Iterable[Union[int, float]] = ()) -> None:
+        object.__setattr__(self, "_array", array(typecode, values))
+
+    @property
+    def typecode(self) -> str:
+        return self._array.typecode
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "FrozenArray":
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return FrozenArray(self.typecode, self._array[index])
+        return self._array[index]
+
+    def __len__(self) -> int:
+        return len(self._array)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._array)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenArray):
+            return self._array == other._array
+        if isinstance(other, tuple):
+            return len(self) == len(other) and all(a == b for a, b in zip(self._array, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self._array))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.typecode!r}, {self._array.tolist()})"
+
+    def __reduce__(self) -> Any:
+        return FrozenArray, (self.typecode, self._array.tolist())
+
+    def tolist(self) -> list:
+        return self._array.tolist()
+
+
+def freeze(value: Any) -> Any:
+    """
+    read-only counterpart of a converted value: lists become tuples, sets become frozensets and dicts become
+    read-only mappings, recursively. other values are returned as is.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(element) for element in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(element) for key, element in value.items()})
+    return value
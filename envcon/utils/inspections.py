@@ -1,10 +1,27 @@
-import inspect
+import sys
+from types import FrameType
 from typing import Any, Optional
 
+_ENVCON_PACKAGE = __name__.split(".")[0]
 
-def retrieve_name(variable: Any) -> Optional[str]:
-    for frame_info in reversed(inspect.stack()):
-        for name, value in frame_info.frame.f_locals.items():
-            if value is variable:
-                return name
+
+def retrieve_name(variable: Any, max_depth: int = 32) -> Optional[str]:
+    """
+    name of the variable holding `variable` in the nearest calling frame outside envcon.
+    walks raw frame objects (no source lines are read) and gives up after `max_depth` frames.
+    """
+    frame: Optional[FrameType] = sys._getframe(1)
+    for _ in range(max_depth):
+        if frame is None:
+            break
+        if not _is_envcon_frame(frame):
+            for name, value in frame.f_locals.items():
+                if value is variable:
+                    return name
+        frame = frame.f_back
     return None
+
+
+def _is_envcon_frame(frame: FrameType) -> bool:
+    module_name = frame.f_globals.get("__name__", "")
+    return module_name == _ENVCON_PACKAGE or module_name.startswith(_ENVCON_PACKAGE + ".")
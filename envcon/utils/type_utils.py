@@ -1,8 +1,8 @@
-import json
-import re
-from typing import Final, Union, get_args, get_origin, List, Any
+import functools
+from typing import Callable, Dict, NoReturn, Union, get_args, get_origin, Any, Optional, Iterable, Iterator, List, Tuple
 
 from .functional import first
+from .immutable import FLOAT_TYPECODE, INT_TYPECODE, FrozenArray, freeze
 
 try:
     # list[T], dict[T,U] etc'. python 38 compatibility
@@ -13,25 +13,95 @@ except ImportError:
 _FALSY_VALUES = ["", "0", "n", "no", "false"]
 _TRUTHY_VALUES = ["1", "y", "yes", "true"]
 
+Converter = Callable[[str], Any]
+
+_COLLECTION_TYPES = (list, tuple, set, frozenset)
+_IMMUTABLE_COLLECTION_TYPES: Dict[type, type] = {list: tuple, set: frozenset}
+_ARRAY_TYPECODES = {int: INT_TYPECODE, float: FLOAT_TYPECODE}
+_JSON_SCALAR_TYPES = {str: str, int: int, bool: bool}
+# classes which can't be created from a single string (typing.Any is a class since python 3.11)
+_NOT_FROM_STRING_TYPES = [bytes, bytearray, memoryview, object, type, Any]
+
 
 def name(type_: type) -> str:
-    match = re.match(r"^<class '(.+)'>$", str(type_))
-    return match.group(1) if match else str(type_)
+    text = str(type_)
+    # "<class 'int'>" -> "int"
+    return text[8:-2] if text.startswith("<class '") and text.endswith("'>") else text
+
+
+def convert(value: str, to: type, separator: str = ",", escape: Optional[str] = None, immutable: bool = False) -> Any:
+    return compile_converter(to, separator, escape, immutable)(value)
 
 
-def convert(value: str, to: type) -> Union[str, bool, int, float, list, dict, None]:
+def compile_converter(
+    to: type, separator: str = ",", escape: Optional[str] = None, immutable: bool = False
+) -> Converter:
+    """
+    turn a type hint into a converter of raw strings. the type hint is inspected once, converters are memoized.
+    unsupported type hints are not an error until a value actually needs to be converted.
+    `separator` splits list, tuple, set and frozenset values. `escape` (None by default) escapes the next character,
+    e.g. with escape="\\", "a\\,b,c" is ["a,b", "c"]. a value ending with the escape character is invalid.
+    values (and collection elements) of a class other than str, int, float and bool are converted by calling it
+    (e.g. Decimal), its errors are raised as ValueError. classes which aren't created from a string (bytes, Any...)
+    are unsupported.
+    `immutable` converters return read-only values: tuples for lists (unboxed FrozenArray for list[int] and
+    list[float]), frozensets for sets and read-only mappings for dicts.
+    """
+    try:
+        return _compile_converter_cached(to, separator, escape, immutable)
+    except TypeError:
+        # unhashable type hint (e.g. with unhashable metadata), compile without caching
+        return _compile_converter(to, separator, escape, immutable)
+
+
+def _compile_converter(
+    to: type, separator: str = ",", escape: Optional[str] = None, immutable: bool = False
+) -> Converter:
     if is_optional(to):
-        return convert(value, _get_first_optional_subtypes(to))
+        return compile_converter(_get_first_optional_subtypes(to), separator, escape, immutable)
+    if to in [str, int, float] or to is bool:
+        return _compile_scalar_converter(to)
+    if _is_collection(to):
+        return _compile_collection_converter(to, separator, escape, immutable)
+    if _is_dict(to):
+        return _freezing(_load_json) if immutable else _load_json
+    if get_origin(to) is dict:
+        return _freezing(_compile_typed_dict_converter(to)) if immutable else _compile_typed_dict_converter(to)
+    return _compile_scalar_converter(to)
+
+
+_compile_converter_cached = functools.lru_cache(maxsize=256)(_compile_converter)
+
+
+def _compile_scalar_converter(to: type) -> Converter:
     if to in [str, int, float]:
-        return to(value)
+        return to
     if to is bool:
-        return _to_bool(value)
-    if _is_list(to):
-        return _to_list(value, to)
-    if _is_dict(to):
-        return json.loads(value)
+        return _to_bool
+    if isinstance(to, type) and not isinstance(to, _GenericAlias) and to not in _NOT_FROM_STRING_TYPES:
+        # other classes (Decimal, Path, UUID, enums...) are converted by calling them
+        return _compile_class_converter(to)
+    return _unsupported(to)
+
+
+def _compile_class_converter(to: type) -> Converter:
+    def convert_class(value: str) -> Any:
+        try:
+            return to(value)
+        except ValueError:
+            raise
+        except Exception as e:
+            # e.g. decimal.InvalidOperation, which only value errors are expected to report
+            raise ValueError(f"can't create {name(to)} from {value!r} ({type(e).__name__})") from e
 
-    raise ValueError(f"unsupported type for convert(): '{to}'")
+    return convert_class
+
+
+def _unsupported(to: type) -> Converter:
+    def unsupported(value: str) -> NoReturn:
+        raise ValueError(f"unsupported type for convert(): '{to}'")
+
+    return unsupported
 
 
 def _get_first_optional_subtypes(type_: type) -> type:
@@ -68,10 +138,168 @@ def _is_generic_alias_dict_without_subscription(type_: type) -> bool:
     return get_origin(type_) is dict and get_args(type_) == ()
 
 
-def _to_list(value: str, value_type: type) -> List[Union[str, bool, int, float]]:
-    type_args: Final[tuple] = get_args(value_type)
-    generic_type: Final[type] = type_args[0] if type_args else str
-    return list(value.split(",")) if generic_type is str else [generic_type(element) for element in value.split(",")]
+def _is_collection(type_: type) -> bool:
+    return type_ in _COLLECTION_TYPES or get_origin(type_) in _COLLECTION_TYPES
+
+
+def _freezing(converter: Converter) -> Converter:
+    return lambda value: freeze(converter(value))
+
+
+def _compile_collection_converter(
+    collection_type: type, separator: str, escape: Optional[str], immutable: bool = False
+) -> Converter:
+    if not separator:
+        raise ValueError("separator can't be empty")
+    if escape is not None and (len(escape) != 1 or escape in separator):
+        raise ValueError(f"escape must be a single character which is not part of the separator, got {escape!r}")
+
+    origin: type = get_origin(collection_type) or collection_type
+    type_args = get_args(collection_type)
+    if origin is tuple and type_args and type_args[-1] is not Ellipsis:
+        return _compile_fixed_length_tuple_converter(type_args, separator, escape)
+
+    element_converter = _compile_scalar_converter(type_args[0] if type_args else str)
+
+    def split(value: str) -> Iterable[str]:
+        return (
+            value.split(separator)
+            if escape is None or escape not in value
+            else _split_escaped(value, separator, escape)
+        )
+
+    if immutable:
+        if origin is list and element_converter in _ARRAY_TYPECODES:
+            return _compile_array_converter(element_converter, split)
+        origin = _IMMUTABLE_COLLECTION_TYPES.get(origin, origin)
+
+    if element_converter is str:
+        if origin is list and escape is None:
+            return lambda value: value.split(separator)
+        return lambda value: origin(split(value))
+    # one pass: the split elements are converted while the collection is being built
+    return lambda value: origin(map(element_converter, split(value)))
+
+
+def _compile_array_converter(element_converter: Converter, split: Callable[[str], Iterable[str]]) -> Converter:
+    typecode = _ARRAY_TYPECODES[element_converter]  # type: ignore[index]
+
+    def convert_array(value: str) -> Any:
+        try:
+            return FrozenArray(typecode, map(element_converter, split(value)))
+        except OverflowError:
+            return tuple(map(element_converter, split(value)))  # ints which don't fit 64 bits
+
+    return convert_array
+
+
+def _compile_fixed_length_tuple_converter(
+    elements_types: Tuple[type, ...], separator: str, escape: Optional[str]
+) -> Converter:
+    elements_converters = tuple(_compile_scalar_converter(element_type) for element_type in elements_types)
+    split = compile_converter(tuple, separator, escape)
+
+    def convert_tuple(value: str) -> tuple:
+        elements = split(value)
+        if len(elements) != len(elements_converters):
+            raise ValueError(f"expected {len(elements_converters)} elements, got {len(elements)}")
+        return tuple(converter(element) for converter, element in zip(elements_converters, elements))
+
+    return convert_tuple
+
+
+def _split_escaped(value: str, separator: str, escape: str) -> Iterator[str]:
+    parts: List[str] = []
+    position = 0
+    separator_position = value.find(separator)
+    escape_position = value.find(escape)
+    while True:
+        if separator_position != -1 and separator_position < position:
+            separator_position = value.find(separator, position)
+        if escape_position != -1 and escape_position < position:
+            escape_position = value.find(escape, position)
+
+        if escape_position != -1 and (separator_position == -1 or escape_position < separator_position):
+            if escape_position == len(value) - 1:
+                raise ValueError(f"{value!r} ends with the escape character {escape!r}, which escapes nothing")
+            parts.append(value[position:escape_position])
+            escaped_position, position = escape_position + 1, escape_position + 2
+            parts.append(value[escaped_position:position])
+        elif separator_position != -1:
+            parts.append(value[position:separator_position])
+            yield "".join(parts)
+            parts.clear()
+            position = separator_position + len(separator)
+        else:
+            parts.append(value[position:])
+            yield "".join(parts)
+            return
+
+
+def _load_json(value: str) -> Any:
+    import json  # imported by the first dict conversion, most configurations have none
+
+    return json.loads(value)
+
+
+def _compile_typed_dict_converter(dict_type: type) -> Converter:
+    key_type, value_type = get_args(dict_type)
+    key_converter = _compile_scalar_converter(key_type)
+    try:
+        validate_value = _compile_json_validator(value_type)
+    except ValueError:
+        return _unsupported(dict_type)
+
+    def convert_dict(value: str) -> dict:
+        loaded = _load_json(value)
+        if not isinstance(loaded, dict):
+            raise ValueError(f"expected a JSON object, got {type(loaded).__name__}")
+        # JSON keys are always strings, so they are converted like any other raw value
+        return {key_converter(k): validate_value(v) for k, v in loaded.items()}
+
+    return convert_dict
+
+
+def _compile_json_validator(type_: Any) -> Callable[[Any], Any]:
+    """
+    validator (and normalizer, e.g. int to float) of an already loaded JSON value against a type hint
+    """
+    if type_ is Any or type_ in (list, dict) or _is_dict(type_):
+        return _identity
+    if is_optional(type_):
+        validate_subtype = _compile_json_validator(_get_first_optional_subtypes(type_))
+        return lambda value: None if value is None else validate_subtype(value)
+    if type_ is float:
+        return _validate_float
+    if type_ in _JSON_SCALAR_TYPES:
+        return functools.partial(_validate_instance, _JSON_SCALAR_TYPES[type_])
+    if _is_list(type_):
+        validate_element = _compile_json_validator((get_args(type_) or (Any,))[0])
+        return lambda value: [validate_element(element) for element in _validate_instance(list, value)]
+    if get_origin(type_) is dict:
+        key_type, value_type = get_args(type_)
+        convert_key, validate_nested_value = _compile_scalar_converter(key_type), _compile_json_validator(value_type)
+        return lambda value: {
+            convert_key(k): validate_nested_value(v) for k, v in _validate_instance(dict, value).items()
+        }
+    raise ValueError(f"unsupported type for JSON values: '{type_}'")
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _validate_instance(expected_type: type, value: Any) -> Any:
+    # bool is a subclass of int, but true/false are not valid JSON integers
+    if not isinstance(value, expected_type) or (isinstance(value, bool) and expected_type is not bool):
+        raise ValueError(f"expected {expected_type.__name__}, got {value!r}")
+    return value
+
+
+def _validate_float(value: Any) -> float:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        raise ValueError(f"expected float, got {value!r}")
+    return float(value)
 
 
 def _to_bool(value: str) -> bool:
@@ -0,0 +1,119 @@
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Set, Any
+
+from .extended_environ import ExtendedEnviron
+from .registry import reload_using
+
+Subscriber = Callable[[str, Optional[str], Optional[str]], Any]
+
+_logger = logging.getLogger(__name__.split(".")[0])
+
+
+class WatchedEnviron(ExtendedEnviron):
+    """
+    ExtendedEnviron whose .env file is watched by a background thread.
+    the file is polled with os.stat every `interval` seconds and parsed only when it changed. each parse publishes a
+    new immutable snapshot, so readers never do file I/O and never observe a partially parsed file.
+    subscribers are called with (key, old value, new value) for every changed key which os.environ doesn't override.
+    with reload_configurations=True, classes decorated with this source are reloaded on every change.
+    """
+
+    def __init__(
+        self,
+        dot_env_path: str = ".env",
+        interval: float = 1.0,
+        reload_configurations: bool = True,
+        dot_env_parser: str = "dotenv",
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        super().__init__(True, dot_env_path, dot_env_parser)
+        self.refresh()  # changes are reported against the file as it was when watching started
+        # the .env values last reported to subscribers. anything may refresh the source in between two polls (e.g. a
+        # reload of a class decorated with it), so changes are found against these, not against the previous refresh
+        self._published_dot_env = self._dot_env
+        self.interval = interval
+        self.reload_configurations = reload_configurations
+        self._subscribers: Dict[Optional[str], List[Subscriber]] = {}
+        self._subscribers_lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Subscriber, key: Optional[str] = None) -> Callable[[], None]:
+        """
+        call `callback` when `key` changes, or when any key changes if `key` is None. returns an unsubscribe function.
+        """
+        with self._subscribers_lock:
+            self._subscribers.setdefault(key, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._subscribers_lock:
+                self._subscribers.get(key, []).remove(callback)
+
+        return unsubscribe
+
+    def poll(self) -> Set[str]:
+        """
+        check the .env file once. returns the changed keys.
+        subscribers are notified even if reloading a class fails, then the error is raised.
+        """
+        with self._poll_lock:
+            self.refresh()
+            previous_dot_env, current_dot_env = self._published_dot_env, self._dot_env
+            self._published_dot_env = current_dot_env
+        if current_dot_env is previous_dot_env:
+            return set()
+
+        environ = os.environ
+        changed_keys = {
+            key
+            for key in previous_dot_env.keys() | current_dot_env.keys()
+            if key not in environ and previous_dot_env.get(key) != current_dot_env.get(key)
+        }
+        try:
+            if changed_keys and self.reload_configurations:
+                reload_using(self)
+        finally:
+            # a class failing to reload (e.g. an invalid new value) doesn't hide the change from subscribers
+            for key in sorted(changed_keys):
+                self._notify(key, previous_dot_env.get(key), current_dot_env.get(key))
+        return changed_keys
+
+    def start(self) -> "WatchedEnviron":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name=f"envcon-watcher({self._dot_env_path})", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "WatchedEnviron":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                _logger.exception("failed to refresh %s", self._dot_env_path)
+
+    def _notify(self, key: str, old_value: Optional[str], new_value: Optional[str]) -> None:
+        with self._subscribers_lock:
+            subscribers = [*self._subscribers.get(key, ()), *self._subscribers.get(None, ())]
+        for subscriber in subscribers:
+            try:
+                subscriber(key, old_value, new_value)
+            except Exception:
+                _logger.exception("subscriber of %s failed", key)
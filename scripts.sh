@@ -23,6 +23,10 @@ function mypy() {
   poetry run python -m mypy envcon
 }
 
+function benchmark() {
+  poetry run python -m benchmarks "$@"
+}
+
 function mypy_all() {
   poetry run python -m mypy envcon tests \
     --show-error-codes \
@@ -0,0 +1 @@
+from helpers import patch_environ  # noqa: F401 shared by the test modules
@@ -1,5 +1,8 @@
+import contextlib
+import os
 import sys
-from typing import Callable
+from pathlib import Path
+from typing import Callable, Dict, Iterator
 
 import pytest
 
@@ -13,6 +16,11 @@ skip_if_python38_is_presented = pytest.mark.skipif(
     ),
 )
 
+# wall-clock comparisons depend on the machine load, so they only run when asked: ENVCON_PERF_TESTS=1 pytest
+perf_test = pytest.mark.skipif(
+    not os.environ.get("ENVCON_PERF_TESTS"), reason="timing dependent, set ENVCON_PERF_TESTS=1 to run it"
+)
+
 sample_configuration: dict = {
     "SOME_A": "value_a",
     "SOME_B": "value_b",
@@ -32,3 +40,35 @@ def not_test(func: Callable) -> Callable:
     """
     func.__test__ = False  # type: ignore[attr-defined]
     return func
+
+
+@contextlib.contextmanager
+def patched_environ(environ: Dict[str, str]) -> Iterator[Dict[str, str]]:
+    """
+    replace os.environ by `environ`, which the tests can then change freely
+    """
+    os_environ_dump = os.environ
+    os.environ = environ  # type: ignore[assignment]
+    try:
+        yield environ
+    finally:
+        os.environ = os_environ_dump
+
+
+@pytest.fixture
+def patch_environ() -> Iterator[Dict[str, str]]:
+    """
+    an empty os.environ for the duration of a test. registered for every test module by conftest.py
+    """
+    with patched_environ({}) as environ:
+        yield environ
+
+
+def rewrite(path: Path, content: str) -> None:
+    """
+    rewrite a .env file and move its mtime a second forward: the file caches compare (mtime, size, inode),
+    and a rewrite of the same size within the file system timestamp resolution would go unnoticed
+    """
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
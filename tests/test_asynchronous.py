@@ -0,0 +1,148 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+import pytest
+
+import envcon
+from envcon import ConfigurationErrors, load_configuration
+from envcon.utils import inspections
+
+T = TypeVar("T")
+
+_LOOKUP_DELAY = 0.05
+
+
+class SecretsServer:
+    """
+    stand-in for a secrets agent: answers a "KEY\\n" request with "VALUE\\n" (or "\\n" when missing) after a delay
+    """
+
+    def __init__(self, secrets: Dict[str, str]) -> None:
+        self.secrets = secrets
+        self.port = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def __aenter__(self) -> "SecretsServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        assert self._server is not None
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        key = (await reader.readline()).decode().strip()
+        await asyncio.sleep(_LOOKUP_DELAY)
+        writer.write(f"{self.secrets.get(key, '')}\n".encode())
+        await writer.drain()
+        writer.close()
+
+
+class SecretsClient:
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.requested_keys: List[str] = []
+        self.pending = 0
+        self.max_pending = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        self.requested_keys.append(key)
+        self.pending += 1
+        self.max_pending = max(self.max_pending, self.pending)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+            writer.write(f"{key}\n".encode())
+            await writer.drain()
+            value = (await reader.readline()).decode().rstrip("\n")
+            writer.close()
+        finally:
+            self.pending -= 1
+        return value or None
+
+
+def run_with_server(secrets: Dict[str, str], test: Callable[[SecretsClient], Awaitable[T]]) -> T:
+    async def main() -> T:
+        async with SecretsServer(secrets) as server:
+            return await test(SecretsClient(server.port))
+
+    return asyncio.run(main())
+
+
+secrets = {f"SERVICE_VALUE_{i}": str(i) for i in range(10)}
+secrets.update({"SERVICE_NAME": "envcon", "SERVICE_TAGS": "a,b"})
+
+
+class Service:
+    NAME: str
+    TAGS: List[str]
+    MISSING: Optional[int]
+    DEFAULT: int = 42
+
+
+def test_load_configuration() -> None:
+    async def test(client: SecretsClient) -> Any:
+        return await load_configuration(Service, prefix="SERVICE_", source=client, frozen=False)
+
+    configuration = run_with_server(secrets, test)
+    assert configuration.NAME == "envcon"
+    assert configuration.TAGS == ["a", "b"]
+    assert configuration.MISSING is None
+    assert configuration.DEFAULT == 42
+
+
+def test_source_is_named_only_on_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    def retrieve_name(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("source named without an error")
+
+    monkeypatch.setattr(inspections, "retrieve_name", retrieve_name)
+
+    async def test(client: SecretsClient) -> Any:
+        return await load_configuration(Service, prefix="SERVICE_", source=client)
+
+    assert run_with_server(secrets, test).NAME == "envcon"
+
+
+def test_reload_raises(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(envcon.registry, "_classes", weakref.WeakKeyDictionary())
+
+    async def test(client: SecretsClient) -> Any:
+        return await load_configuration(Service, prefix="SERVICE_", source=client)
+
+    configuration = run_with_server(secrets, test)
+    with pytest.raises(TypeError, match="load it again"):
+        envcon.reload(configuration)
+    assert envcon.reload_all() == {}
+
+
+@pytest.mark.parametrize("max_concurrency, expected_pending", [(None, 10), (5, 5)])
+def test_lookups_are_concurrent(max_concurrency: Optional[int], expected_pending: int) -> None:
+    class Values:
+        pass
+
+    Values.__annotations__ = {f"VALUE_{i}": int for i in range(10)}
+
+    async def test(client: SecretsClient) -> int:
+        configuration = await load_configuration(
+            Values, prefix="SERVICE_", source=client, max_concurrency=max_concurrency
+        )
+        assert [getattr(configuration, f"VALUE_{i}") for i in range(10)] == list(range(10))
+        assert len(client.requested_keys) == 10
+        return client.max_pending
+
+    # sequential lookups would be pending one at a time
+    assert run_with_server(secrets, test) == expected_pending
+
+
+def test_missing_variable() -> None:
+    class Missing:
+        NOT_EXIST: str
+        ANOTHER_NOT_EXIST: int
+
+    async def test(client: SecretsClient) -> None:
+        await load_configuration(Missing, prefix="SERVICE_", source=client, collect_errors=True)
+
+    with pytest.raises(ConfigurationErrors, match="does not exist in client"):
+        run_with_server(secrets, test)
@@ -0,0 +1,39 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import benchmarks
+from benchmarks.__main__ import main
+
+
+def test_run() -> None:
+    results = benchmarks.run(["convert", "attribute_read"], repeat=1, min_time=0)
+    assert {result.name for result in results} == {"convert", "attribute_read"}
+    assert all(result.seconds > 0 and result.operations == 1 for result in results)
+    assert "convert[hint=list[int]x100]" in {result.full_name for result in results}
+
+
+def test_environ_is_restored() -> None:
+    environ = dict(os.environ)
+    benchmarks.run(["decorate.environ", "lookup"], repeat=1, min_time=0)
+    assert dict(os.environ) == environ
+
+
+def test_json_output_and_compare(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    path = str(tmp_path / "results.json")
+    main(["convert.", "attribute_read", "--repeat", "1", "--min-time", "0", "--json", path])
+    with open(path) as file:
+        content = json.load(file)
+    assert set(content["metadata"]) == {"python", "implementation", "platform", "commit", "date"}
+    assert {result["name"] for result in content["results"]} == {"attribute_read"}
+
+    capsys.readouterr()
+    main(["attribute_read", "--repeat", "1", "--min-time", "0", "--compare", path])
+    assert all(line.endswith("%") for line in capsys.readouterr().out.splitlines())
+
+
+def test_nothing_selected() -> None:
+    with pytest.raises(SystemExit):
+        main(["not a benchmark"])
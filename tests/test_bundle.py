@@ -0,0 +1,193 @@
+import enum
+import os
+import pickle
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+import pytest
+
+from envcon import configuration, environment_configuration, export_bundle, reload
+from envcon.schema import Schema
+from envcon.utils.immutable import FrozenArray
+
+
+class Service:
+    HOST: str
+    PORTS: List[int]
+    LIMITS: Dict[str, int]
+    DEBUG: bool = False
+
+
+class EnvironService:
+    HOST: str
+    PORTS: List[int]
+
+
+class Flags:
+    DEBUG: bool = False
+
+
+class Tag(str):
+    pass
+
+
+class Tagged:
+    TAGS: List[Tag]
+
+
+class Level(enum.Enum):
+    INFO = "info"
+
+
+class Logging:
+    LEVELS: List[Level]
+    ROOTS: List[Path]
+    RATIOS: List[Decimal]
+
+
+calls: List[str] = []
+
+
+def call(name: str) -> None:
+    calls.append(name)
+
+
+class _Call:
+    def __reduce__(self) -> Any:
+        return call, ("bundle",)
+
+
+@pytest.fixture
+def source() -> Dict[str, str]:
+    return {"SERVICE_HOST": "localhost", "SERVICE_PORTS": "1,2", "SERVICE_LIMITS": '{"a": 1}'}
+
+
+@pytest.fixture
+def bundle(tmp_path: Path) -> str:
+    return str(tmp_path / "envcon.bundle")
+
+
+def decorate(source: Mapping[str, str], bundle: str, **kwargs: Any) -> Any:
+    return configuration(prefix="SERVICE_", source=source, bundle=bundle, **kwargs)(Service)
+
+
+def test_bundled_values_are_injected(source: Dict[str, str], bundle: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    service = decorate(source, bundle)
+    assert export_bundle(bundle, [service]) == [service]
+
+    def from_class(*args: Any, **kwargs: Any) -> Schema:
+        raise AssertionError("schema compiled")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Schema, "from_class", from_class)
+        service = decorate(source, bundle)
+        assert (service.HOST, service.PORTS, service.LIMITS, service.DEBUG) == ("localhost", [1, 2], {"a": 1}, False)
+        assert repr(service()) == "Service(HOST=localhost,PORTS=[1, 2],LIMITS={'a': 1},DEBUG=False)"
+
+    # a reload compiles the schema when it's first needed
+    source["SERVICE_HOST"] = "remotehost"
+    assert reload(service) == {"HOST"}
+    assert service.HOST == "remotehost"
+
+
+def test_reload_falls_back_to_default(bundle: str) -> None:
+    source = {"FLAG_DEBUG": "true"}
+    assert export_bundle(bundle, [configuration(prefix="FLAG_", source=source, frozen=False)(Flags)]) == [Flags]
+    Flags.DEBUG = False  # the class as its module defines it, in a new process
+    flags = configuration(prefix="FLAG_", source=source, frozen=False, bundle=bundle)(Flags)
+    assert flags.DEBUG is True
+    del source["FLAG_DEBUG"]
+    assert reload(flags) == {"DEBUG"}
+    assert flags.DEBUG is False
+
+
+def test_changed_source_is_read_again(source: Dict[str, str], bundle: str) -> None:
+    export_bundle(bundle, [decorate(source, bundle)])
+    # a different separator converts to different values
+    with pytest.raises(ValueError, match="PORTS"):
+        decorate(source, bundle, separator=";")
+    source["SERVICE_PORTS"] = "3"
+    assert decorate(source, bundle).PORTS == [3]
+
+
+def test_immutable_values(source: Dict[str, str], bundle: str) -> None:
+    export_bundle(bundle, [decorate(source, bundle, immutable_values=True)])
+    service = decorate(source, bundle, immutable_values=True)
+    assert service.PORTS == FrozenArray("q", [1, 2])
+    with pytest.raises(TypeError):
+        service.LIMITS["a"] = 2
+
+
+def test_slots(source: Dict[str, str], bundle: str) -> None:
+    export_bundle(bundle, [decorate(source, bundle, slots=True)])
+    service = decorate(source, bundle, slots=True)
+    assert service.PORTS == [1, 2]
+    source["SERVICE_PORTS"] = "3"
+    reload(service)
+    assert service.PORTS == [3]
+
+
+def test_export_changed_source(source: Dict[str, str], bundle: str) -> None:
+    service = decorate(source, bundle)
+    source["SERVICE_HOST"] = "remotehost"
+    with pytest.raises(ValueError, match="reload it before exporting"):
+        export_bundle(bundle, [service])
+
+
+def test_skipped_classes(source: Dict[str, str], bundle: str) -> None:
+    class Local:
+        HOST: str
+
+    local = configuration(prefix="SERVICE_", source=source)(Local)
+    lazy = configuration(prefix="SERVICE_", source=source, lazy=True)(Service)
+    assert export_bundle(bundle, [local, lazy]) == []
+    with pytest.raises(ValueError):
+        decorate(source, bundle, lazy=True)
+    with pytest.raises(TypeError):
+        export_bundle(bundle, [object])
+
+
+def test_values_of_other_classes_are_not_bundled(bundle: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    tagged = configuration(prefix="", source={"TAGS": "a"})(Tagged)
+    assert type(tagged.TAGS[0]) is Tag
+    source = {"LEVELS": "info", "ROOTS": "/var/log", "RATIOS": "0.5"}
+    logging = configuration(prefix="", source=source)(Logging)
+    assert export_bundle(bundle, [tagged, logging]) == [logging]
+    monkeypatch.setattr(Schema, "from_class", None)  # injected from the bundle
+    logging = configuration(prefix="", source=source, bundle=bundle)(Logging)
+    assert (logging.LEVELS, logging.ROOTS, logging.RATIOS) == ([Level.INFO], [Path("/var/log")], [Decimal("0.5")])
+
+
+def test_bundle_is_loaded_as_data(source: Dict[str, str], bundle: str) -> None:
+    Path(bundle).write_bytes(pickle.dumps({"version": 1, "entries": _Call()}))
+    assert decorate(source, bundle).HOST == "localhost"
+    assert calls == []
+
+
+def test_missing_or_corrupted_bundle(source: Dict[str, str], bundle: str) -> None:
+    assert decorate(source, bundle).HOST == "localhost"
+    Path(bundle).write_bytes(b"not a bundle")
+    assert decorate(source, bundle).HOST == "localhost"
+
+
+def test_dot_env_file_is_not_parsed(tmp_path: Path, bundle: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    dot_env_path = tmp_path / ".env"
+    dot_env_path.write_text("SERVICE_HOST=localhost\n")
+    monkeypatch.setitem(os.environ, "SERVICE_PORTS", "1,2")
+
+    def decorate_environ() -> Any:
+        return environment_configuration(prefix="SERVICE_", dot_env_path=str(dot_env_path), bundle=bundle)(
+            EnvironService
+        )
+
+    export_bundle(bundle, [decorate_environ()])
+    parsed: List[str] = []
+    with monkeypatch.context() as patch:
+        patch.setattr("dotenv.dotenv_values", lambda path: parsed.append(path))
+        service = decorate_environ()
+    assert (service.HOST, service.PORTS, parsed) == ("localhost", [1, 2], [])
+
+    dot_env_path.write_text("SERVICE_HOST=remotehost\n")
+    os.utime(dot_env_path, ns=(0, 0))
+    assert decorate_environ().HOST == "remotehost"
@@ -0,0 +1,142 @@
+import threading
+import timeit
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import pytest
+
+import envcon
+from envcon import ConfigurationErrors, compile_schema, configuration
+from envcon.schema import Schema
+from helpers import perf_test
+
+
+class Tenant:
+    NAME: str
+    REGION: str
+    MAX_USERS: int
+    RATIO: float
+    FEATURES: List[str]
+    BETA: bool = False
+    PLAN: Optional[str]
+
+
+def tenant_source(i: int) -> Dict[str, str]:
+    return {
+        "TENANT_NAME": f"tenant-{i}",
+        "TENANT_REGION": "eu" if i % 2 else "us",
+        "TENANT_MAX_USERS": str(i),
+        "TENANT_RATIO": "0.5",
+        "TENANT_FEATURES": "a,b,c",
+    }
+
+
+def test_materialize() -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_")
+    tenant: Any = compiled.materialize(tenant_source(1))
+    assert (tenant.NAME, tenant.REGION, tenant.MAX_USERS, tenant.RATIO) == ("tenant-1", "eu", 1, 0.5)
+    assert (tenant.FEATURES, tenant.BETA, tenant.PLAN) == (["a", "b", "c"], False, None)
+    # after the attributes reads: mypy narrows an Any checked by isinstance() to object
+    assert isinstance(tenant, compiled.cls)
+    assert tenant == compiled.materialize(tenant_source(1))
+    assert tenant != compiled.materialize(tenant_source(2))
+
+
+def test_materialize_many() -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_", immutable_values=True)
+    tenants: List[Any] = compiled.materialize_many(tenant_source(i) for i in range(100))
+    assert [tenant.MAX_USERS for tenant in tenants] == list(range(100))
+    # immutable values read from several tenants are shared
+    assert tenants[0].FEATURES is tenants[1].FEATURES
+
+
+def test_errors() -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_", collect_errors=True)
+    source = tenant_source(1)
+    del source["TENANT_NAME"]
+    source["TENANT_MAX_USERS"] = "many"
+    with pytest.raises(ConfigurationErrors) as e:
+        compiled.materialize(source, source_name="tenant 1")
+    assert [error.field for error in e.value.errors] == ["NAME", "MAX_USERS"]
+    assert "does not exist in tenant 1" in str(e.value)
+
+
+def test_schema_is_compiled_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_")
+
+    def from_class(*args: Any, **kwargs: Any) -> Schema:
+        raise AssertionError("schema compiled again")
+
+    monkeypatch.setattr(Schema, "from_class", from_class)
+    compiled.materialize_many([tenant_source(1), tenant_source(2)])
+
+
+@pytest.mark.parametrize("frozen", (True, False))
+def test_compile_decorated_class(frozen: bool) -> None:
+    @configuration(prefix="T_", source={"T_NAME": "tenant-a", "T_MAX": "5", "T_BETA": "true"}, frozen=frozen)
+    class DecoratedTenant:
+        NAME: str
+        MAX: int
+        BETA: bool = False
+
+    compiled = compile_schema(DecoratedTenant, prefix="T_")
+    # the values injected from the decoration source are not defaults of the other sources
+    with pytest.raises(LookupError):
+        compiled.materialize({})
+    tenant: Any = compiled.materialize({"T_NAME": "tenant-b", "T_MAX": "7"})
+    assert (tenant.NAME, tenant.MAX, tenant.BETA) == ("tenant-b", 7, False)
+    with pytest.raises(TypeError):
+        envcon.reload(tenant)
+
+
+class BlockingSource:
+    """a remote source answering a bulk request once every source sharing `barrier` is requested"""
+
+    def __init__(self, values: Mapping[str, str], barrier: threading.Barrier) -> None:
+        self.values = values
+        self.barrier = barrier
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Sequence[str]) -> Mapping[str, Optional[str]]:
+        self.barrier.wait()
+        return {key: self.values.get(key) for key in keys}
+
+
+def test_materialize_many_thread_pool() -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_")
+    # sequential requests would never get past the barrier
+    barrier = threading.Barrier(8, timeout=10)
+    sources: Any = [BlockingSource(tenant_source(i), barrier) for i in range(8)]
+    tenants: List[Any] = compiled.materialize_many(sources, max_workers=8)
+    assert [tenant.MAX_USERS for tenant in tenants] == list(range(8))
+
+
+def test_thread_pool_raises_first_error() -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_")
+    with pytest.raises(LookupError):
+        compiled.materialize_many([tenant_source(1), {}], max_workers=2)
+
+
+@perf_test
+def test_per_tenant_cost_is_dominated_by_conversions() -> None:
+    compiled = compile_schema(Tenant, prefix="TENANT_", frozen=False)
+    sources = [tenant_source(i) for i in range(2_000)]
+    fields = compiled.schema.fields
+
+    def conversions_only() -> None:
+        for source in sources:
+            for field in fields:
+                value = source.get(field.lookup_key)
+                if value is not None:
+                    field.converter(value)
+
+    def redecorate() -> None:
+        for source in sources[:200]:
+            configuration(prefix="TENANT_", source=source, slots=True)(Tenant)
+
+    materialized = min(timeit.repeat(lambda: compiled.materialize_many(sources), number=1, repeat=5))
+    converted = min(timeit.repeat(conversions_only, number=1, repeat=5))
+    redecorated = min(timeit.repeat(redecorate, number=1, repeat=3)) * 10
+    assert materialized < converted * 5
+    assert materialized * 5 < redecorated
@@ -1,7 +1,8 @@
-from typing import List
+from decimal import Decimal
+from typing import Any, List, Tuple
 
 import pytest
-from envcon import configuration
+from envcon import configuration, ConfigurationErrors
 from dataclasses import FrozenInstanceError
 
 from helpers import sample_configuration
@@ -34,6 +35,120 @@ def test_missing_field() -> None:
             NOT_EXIST: List[int]
 
 
+def test_missing_field_error_names_the_source() -> None:
+    my_source = {"SOME_A": "value_a"}
+    with pytest.raises(LookupError, match="'NOT_EXIST' does not exist in my_source"):
+
+        @configuration(prefix="", source=my_source)
+        class Test:
+            NOT_EXIST: str
+
+
+def test_missing_field_error_with_explicit_source_name() -> None:
+    with pytest.raises(LookupError, match="'ZXC_NOT_EXIST' does not exist in vault, nor 'NOT_EXIST' has default value"):
+
+        @configuration(prefix="ZXC_", source=sample_configuration, source_name="vault")
+        class Test:
+            NOT_EXIST: str
+
+
+def test_collect_errors() -> None:
+    with pytest.raises(ConfigurationErrors) as exc_info:
+
+        @configuration(prefix="", source=sample_configuration, collect_errors=True)
+        class Test:
+            SOME_A: str
+            NOT_EXIST: str
+            SOME_B: int
+            SOME_INT: int
+            ANOTHER_NOT_EXIST: List[int]
+
+    errors = exc_info.value.errors
+    assert [error.field for error in errors] == ["NOT_EXIST", "SOME_B", "ANOTHER_NOT_EXIST"]
+    assert [type(error.error) for error in errors] == [LookupError, ValueError, LookupError]
+    assert exc_info.value.exceptions == tuple(error.error for error in errors)
+    assert isinstance(exc_info.value, LookupError) and isinstance(exc_info.value, ValueError)
+    assert "NOT_EXIST" in str(exc_info.value)
+
+
+def test_collect_errors_with_prefix() -> None:
+    with pytest.raises(ConfigurationErrors) as exc_info:
+
+        @configuration(prefix="ZXC_", source=sample_configuration, collect_errors=True)
+        class Test:
+            SOME_A: str
+            NOT_EXIST: str
+
+    assert [(error.field, error.lookup_key) for error in exc_info.value.errors] == [("NOT_EXIST", "ZXC_NOT_EXIST")]
+
+
+def test_collect_errors_valid_configuration() -> None:
+    @configuration(prefix="", source=sample_configuration, collect_errors=True)
+    class Test:
+        SOME_A: str
+        SOME_INT: int
+
+    assert Test.SOME_INT == 42
+
+
+class _CountingSource(dict):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.requested_keys: List[str] = []
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self.requested_keys.append(key)
+        return super().get(key, default)
+
+
+@pytest.mark.parametrize("frozen", (True, False))
+def test_lazy(frozen: bool) -> None:
+    source = _CountingSource(sample_configuration)
+
+    @configuration(prefix="", source=source, frozen=frozen, lazy=True)
+    class Test:
+        SOME_A: str
+        SOME_INT: int
+        DICT_ENV: dict
+        NOT_EXIST: str
+
+    assert source.requested_keys == []
+    assert Test.SOME_INT == 42
+    assert Test.SOME_INT == 42
+    assert Test().SOME_INT == 42
+    assert source.requested_keys == ["SOME_INT"]
+    with pytest.raises(LookupError):
+        Test.NOT_EXIST
+    assert Test.DICT_ENV == {"key": "value", "a": 42}
+
+
+def test_lazy_frozen() -> None:
+    @configuration(prefix="", source=sample_configuration, lazy=True)
+    class Test:
+        SOME_A: str
+
+    with pytest.raises(FrozenInstanceError):
+        Test.SOME_A = "should fail"
+    assert Test.SOME_A == "value_a"
+
+
+def test_lazy_repr() -> None:
+    @configuration(prefix="", source=sample_configuration, lazy=True)
+    class Test:
+        SOME_A: str
+        SOME_INT: int = 0
+
+    assert repr(Test()) == f"{Test.__qualname__}(SOME_A=value_a,SOME_INT=42)"
+
+
+def test_lazy_with_collect_errors() -> None:
+    with pytest.raises(ValueError):
+
+        @configuration(prefix="", source=sample_configuration, lazy=True, collect_errors=True)
+        class Test:
+            SOME_A: str
+
+
 def test_set_attribute_in_frozen_class() -> None:
     @configuration(prefix="", source=sample_configuration, frozen=True)
     class Test:
@@ -111,3 +226,12 @@ def test_delete_attribute_in_unfrozen_class_instance() -> None:
     t = Test()
     del t.SOME_B
     assert not hasattr(t, "SOME_B")
+
+
+@pytest.mark.parametrize("type_", [Decimal, List[Decimal], Tuple[str, Decimal, str]])
+def test_conversion_error_of_other_classes(type_: type) -> None:
+    with pytest.raises(ValueError, match="couldn't convert LIST_STRING"):
+
+        @configuration(prefix="", source=sample_configuration)
+        class Test:
+            LIST_STRING: type_  # type: ignore[valid-type]
@@ -0,0 +1,109 @@
+from typing import Any, FrozenSet, List, Tuple
+
+import pytest
+
+from envcon import configuration, clear_conversion_cache
+from envcon.conversion_cache import ConversionCache, is_immutable
+from envcon.utils.type_utils import compile_converter
+
+
+@pytest.fixture
+def converted_values() -> List[str]:
+    return []
+
+
+def counting_converter(converted_values: List[str], result: Any) -> Any:
+    def converter(value: str) -> Any:
+        converted_values.append(value)
+        return result() if callable(result) else result
+
+    return converter
+
+
+def test_immutable_values_are_converted_once(converted_values: List[str]) -> None:
+    cache = ConversionCache()
+    converter = counting_converter(converted_values, ("a", "b"))
+    first = cache.convert(converter, "a,b")
+    assert cache.convert(converter, "a,b") is first
+    assert converted_values == ["a,b"]
+    assert len(cache) == 1
+
+
+def test_mutable_values_are_not_shared(converted_values: List[str]) -> None:
+    cache = ConversionCache()
+    converter = counting_converter(converted_values, lambda: ["a", "b"])
+    first = cache.convert(converter, "a,b")
+    second = cache.convert(converter, "a,b")
+    assert first == second and first is not second
+    assert converted_values == ["a,b", "a,b"]
+    assert len(cache) == 0
+
+
+def test_failed_conversions_are_not_cached() -> None:
+    cache = ConversionCache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache.convert(int, "not an int")
+    assert len(cache) == 0
+
+
+def test_least_recently_used_value_is_evicted(converted_values: List[str]) -> None:
+    cache = ConversionCache(max_size=2)
+    converter = counting_converter(converted_values, 42)
+    for value in ["a", "b", "a", "c", "a", "b"]:
+        cache.convert(converter, value)
+    assert converted_values == ["a", "b", "c", "b"]
+
+
+def test_invalid_max_size() -> None:
+    with pytest.raises(ValueError):
+        ConversionCache(max_size=0)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("a", True),
+        (4.2, True),
+        (None, True),
+        ((1, ("a", frozenset({True}))), True),
+        ((1, ["a"]), False),
+        ([1], False),
+        ({"a": 1}, False),
+        ({1}, False),
+    ],
+)
+def test_is_immutable(value: Any, expected: bool) -> None:
+    assert is_immutable(value) is expected
+
+
+def test_classes_share_converted_values() -> None:
+    clear_conversion_cache()
+    source = {"SHARED_HOSTS": "a,b,c", "SHARED_REGIONS": "x,y", "SHARED_PORTS": "1,2"}
+
+    class First:
+        HOSTS: Tuple[str, ...]
+        REGIONS: FrozenSet[str]
+        PORTS: List[int]
+
+    class Second:
+        HOSTS: Tuple[str, ...]
+        REGIONS: FrozenSet[str]
+        PORTS: List[int]
+
+    first = configuration(prefix="SHARED_", source=source)(First)
+    second = configuration(prefix="SHARED_", source=source)(Second)
+    assert first.HOSTS is second.HOSTS  # type: ignore[attr-defined]
+    assert first.REGIONS is second.REGIONS  # type: ignore[attr-defined]
+    assert first.PORTS == second.PORTS  # type: ignore[attr-defined]
+    assert first.PORTS is not second.PORTS  # type: ignore[attr-defined]
+
+
+def test_same_raw_value_different_types() -> None:
+    cache = ConversionCache()
+    assert cache.convert(compile_converter(int), "1") == 1
+    assert cache.convert(compile_converter(float), "1") == 1.0
+    assert isinstance(cache.convert(compile_converter(float), "1"), float)
+    tuple_type: Any = Tuple[str, ...]
+    assert cache.convert(compile_converter(tuple_type, separator=";"), "a,b;c") == ("a,b", "c")
+    assert cache.convert(compile_converter(tuple_type), "a,b;c") == ("a", "b;c")
@@ -0,0 +1,90 @@
+from pathlib import Path
+from typing import Any, List
+
+import dotenv
+import pytest
+
+from envcon import dot_env_cache as dot_env_cache_module
+from envcon.dot_env_cache import DotEnvCache
+from envcon.extended_environ import ExtendedEnviron
+from helpers import rewrite
+
+
+@pytest.fixture
+def parsed_paths(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    parsed: List[str] = []
+    dotenv_values = dotenv.dotenv_values
+
+    def counting_dotenv_values(path: str, *args: Any, **kwargs: Any) -> Any:
+        parsed.append(path)
+        return dotenv_values(path, *args, **kwargs)
+
+    monkeypatch.setattr(dotenv, "dotenv_values", counting_dotenv_values)
+    return parsed
+
+
+@pytest.fixture
+def dot_env_file(tmp_path: Path) -> Path:
+    path = tmp_path / ".env"
+    path.write_text("KEY=value\n")
+    return path
+
+
+def test_parse_once(parsed_paths: List[str], dot_env_file: Path) -> None:
+    cache = DotEnvCache()
+    first = cache.load(str(dot_env_file))
+    second = cache.load(str(dot_env_file.parent / ".." / dot_env_file.parent.name / ".env"))
+    assert first is second
+    assert dict(first) == {"KEY": "value"}
+    assert len(parsed_paths) == 1
+
+
+def test_values_are_readonly(dot_env_file: Path) -> None:
+    values = DotEnvCache().load(str(dot_env_file))
+    with pytest.raises(TypeError):
+        values["KEY"] = "other"  # type: ignore[index]
+
+
+def test_changed_file_is_parsed_again(parsed_paths: List[str], dot_env_file: Path) -> None:
+    cache = DotEnvCache()
+    cache.load(str(dot_env_file))
+    rewrite(dot_env_file, "KEY=another value\n")
+    assert cache.load(str(dot_env_file))["KEY"] == "another value"
+    assert len(parsed_paths) == 2
+
+
+def test_missing_file(parsed_paths: List[str], tmp_path: Path) -> None:
+    assert DotEnvCache().load(str(tmp_path / "not_exist.env")) == {}
+    assert parsed_paths == []
+
+
+def test_invalidate(parsed_paths: List[str], dot_env_file: Path) -> None:
+    cache = DotEnvCache()
+    cache.load(str(dot_env_file))
+    cache.invalidate(str(dot_env_file))
+    cache.load(str(dot_env_file))
+    cache.invalidate()
+    assert len(cache) == 0
+    cache.load(str(dot_env_file))
+    assert len(parsed_paths) == 3
+
+
+def test_bounded_size(tmp_path: Path) -> None:
+    cache = DotEnvCache(max_size=2)
+    for i in range(5):
+        path = tmp_path / f"{i}.env"
+        path.write_text(f"KEY={i}\n")
+        cache.load(str(path))
+    assert len(cache) == 2
+
+    with pytest.raises(ValueError):
+        DotEnvCache(max_size=0)
+
+
+def test_extended_environ_shares_parsed_file(parsed_paths: List[str], dot_env_file: Path) -> None:
+    dot_env_cache_module.clear_dot_env_cache()
+    environs = [ExtendedEnviron(True, str(dot_env_file)) for _ in range(30)]
+    assert parsed_paths == []  # parsed on first lookup
+    for environ in environs:
+        environ.get("KEY")
+    assert len(parsed_paths) == 1
@@ -0,0 +1,150 @@
+import os
+import random
+from pathlib import Path
+from typing import Dict, Optional
+
+import dotenv
+import pytest
+
+from envcon import environment_configuration
+from envcon.dot_env_cache import DotEnvCache
+from envcon.dot_env_parser import MMAP_THRESHOLD, DotEnvFile, parse_dot_env
+from envcon.extended_environ import ExtendedEnviron
+
+# .env files python-dotenv has to agree with, edge cases of its grammar included
+CORPUS = [
+    "",
+    "A=1",
+    "A=1\nB=2\n",
+    "A=1\r\nB=2\r\n",
+    "A=1\rB=2\r",
+    "\ufeffA=1\n",
+    "export A=1\nexport  B = 2 \nexportC=3\nexport=4\n",
+    "A = spaced value  \n",
+    "A=value # comment\nB=value#not a comment\nC= # only a comment\nD=#novalue\n",
+    "# a comment\n  # indented comment\nA=1 # trailing\n",
+    "A='single quoted'\nB=\"double quoted\"\nC='with # hash'\nD=\"with # hash\" # and comment\n",
+    "A=\"escapes \\n \\t \\\\ \\\" \\' \\x41 \\u0041\"\nB='escapes \\n \\\\ \\' \\\"'\n",
+    'A="multi\nline\nvalue"\nB=after\n',
+    "A='multi\nline'\nB=after\n",
+    'A="unterminated\nB=2\nC=3\n',
+    "A='unterminated\nB=2\n",
+    "A\nB=\nC= \nD\t=\t\n",
+    "A B\nC=1\n",
+    "=no key\nA=1\n",
+    "'quoted key'=1\n'unterminated key=2\nB=3\n",
+    'A="quoted" junk\nB=1\n',
+    "A=1\nA=2\nB=${A}\n",
+    "A=1\nB=${A}\nA=2\nC=${A}\n",
+    "B=${UNDEFINED_ENVCON_VARIABLE:-fallback}\nC=${UNDEFINED_ENVCON_VARIABLE}\nD=${EMPTY:-x}\nEMPTY=\nE=${EMPTY:-x}\n",
+    "A\nB=${A:-default}\n",
+    "HOME_COPY=${HOME}\nHOME=overridden\nHOME_COPY2=${HOME}\n",
+    "A='${HOME}'\nB=\"${HOME}\"\nC=$HOME\nD=${}\nE=${A\n",
+    "A=1\n\n\n   \n\t\nB=2",
+    "A=\"a\\\"b\"\nB='a\\'b'\n",
+    'A=caf\u00e9\nB="\u65e5\u672c"\n',
+    "A=x\\\nB=y\n",
+    "A=  # comment\nB=\t#tab comment\n",
+    "A=value  \t# comment  \n",
+    "export\nexport A\n",
+    "A=1 ; B=2\n",
+    "KEY.WITH-DOTS=1\nkey_lower=2\n",
+    "A==1\nB=a=b\n",
+    'A=""\nB=\'\'\nC="" # comment\n',
+]
+
+
+def dotenv_values(path: Path) -> Dict[str, Optional[str]]:
+    return dict(dotenv.dotenv_values(path))
+
+
+def write(path: Path, text: str) -> Path:
+    path.write_bytes(text.encode())
+    return path
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_same_values_as_dotenv(tmp_path: Path, text: str) -> None:
+    path = write(tmp_path / ".env", text)
+    parsed = parse_dot_env(str(path))
+    assert dict(parsed) == dotenv_values(path)
+    assert list(parsed) == list(dotenv_values(path))
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_same_values_as_dotenv_without_interpolation(tmp_path: Path, text: str) -> None:
+    path = write(tmp_path / ".env", text)
+    assert dict(parse_dot_env(str(path), interpolate=False)) == dict(dotenv.dotenv_values(path, interpolate=False))
+
+
+def test_same_values_as_dotenv_on_random_files(tmp_path: Path) -> None:
+    fragments = ["A", "B", "export ", "=", " ", "\t", "\n", "\r\n", "#", "'", '"', "\\", "\\n", "${A}", "${B:-x}", "v"]
+    generator = random.Random(42)
+    path = tmp_path / ".env"
+    for _ in range(1000):
+        text = "".join(generator.choice(fragments) for _ in range(generator.randint(1, 30)))
+        write(path, text)
+        assert dict(parse_dot_env(str(path))) == dotenv_values(path), repr(text)
+
+
+def test_large_file_mapped(tmp_path: Path) -> None:
+    lines = [f'KEY_{i}="value {i}" # comment\n' if i % 2 else f"KEY_{i}=value\\n{i}\n" for i in range(10_000)]
+    path = write(tmp_path / ".env", "".join(lines))
+    assert path.stat().st_size >= MMAP_THRESHOLD
+    assert dict(parse_dot_env(str(path))) == dotenv_values(path)
+
+
+def test_values_decoded_on_first_read() -> None:
+    parsed = DotEnvFile('A="a\\nb"\nB=${A}\nC=c\n')
+    assert len(parsed) == 3
+    assert parsed._values == {}
+    assert parsed["B"] == "a\nb"
+    assert set(parsed._values) == {0, 1}
+    assert parsed["B"] is parsed["B"]
+
+
+def test_interpolation_reads_environ_on_first_read(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("ENVCON_TEST_VARIABLE", raising=False)
+    parsed = DotEnvFile("A=${ENVCON_TEST_VARIABLE}\n")
+    monkeypatch.setenv("ENVCON_TEST_VARIABLE", "value")
+    assert parsed["A"] == "value"
+
+
+def test_invalid_line_logged(caplog: pytest.LogCaptureFixture) -> None:
+    assert dict(DotEnvFile('A=1\nB="unterminated\nC=3\n')) == {"A": "1", "C": "3"}
+    assert "line 2" in caplog.text
+
+
+def test_cache_parser(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = write(tmp_path / ".env", "KEY=value\n")
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("python-dotenv used by the builtin parser")
+
+    monkeypatch.setattr(dotenv, "dotenv_values", fail)
+    cache = DotEnvCache()
+    parsed = cache.load(str(path), "builtin")
+    assert cache.load(str(path), "builtin") is parsed
+    assert dict(parsed) == {"KEY": "value"}
+
+
+def test_invalid_parser(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        ExtendedEnviron(True, str(tmp_path / ".env"), "unknown")
+    with pytest.raises(ValueError):
+        DotEnvCache().load(str(tmp_path / ".env"), "unknown")
+
+
+def test_environment_configuration(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = write(tmp_path / ".env", "ENVCON_TEST_PORT=8080\nENVCON_TEST_HOSTS='a,b' # hosts\n")
+    monkeypatch.delenv("ENVCON_TEST_PORT", raising=False)
+    monkeypatch.delenv("ENVCON_TEST_HOSTS", raising=False)
+
+    @environment_configuration(prefix="ENVCON_TEST_", dot_env_path=str(path), dot_env_parser="builtin")
+    class Configuration:
+        PORT: int
+        HOSTS: list
+
+    assert Configuration.PORT == 8080
+    assert Configuration.HOSTS == ["a", "b"]
+    assert os.environ.get("ENVCON_TEST_PORT") is None
@@ -1,20 +1,17 @@
 import itertools
-import os
 from dataclasses import dataclass
-from typing import List, Dict, Generator, Iterable
+from typing import List, Dict, Iterable, Iterator
 
 import pytest
 
 from envcon import environment_configuration
-from helpers import sample_configuration, skip_if_python38_is_presented, not_test
+from helpers import sample_configuration, skip_if_python38_is_presented, not_test, patched_environ
 
 
 @pytest.fixture(scope="module", autouse=True)
-def patch_environ() -> Generator:
-    os_environ_dump = os.environ
-    os.environ = sample_configuration  # type: ignore[assignment]
-    yield
-    os.environ = os_environ_dump
+def sample_environ() -> Iterator[Dict[str, str]]:
+    with patched_environ(sample_configuration) as environ:
+        yield environ
 
 
 def test_empty_configuration_class() -> None:
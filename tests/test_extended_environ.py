@@ -0,0 +1,76 @@
+from pathlib import Path
+from typing import Dict, NoReturn
+
+import pytest
+
+from envcon.extended_environ import ExtendedEnviron
+from helpers import patched_environ
+
+
+@pytest.fixture
+def dot_env_file(tmp_path: Path, patch_environ: Dict[str, str]) -> str:
+    patch_environ.update(FROM_ENVIRON="environ", SHARED="environ")
+    path = tmp_path / ".env"
+    path.write_text("FROM_DOT_ENV=dot_env\nSHARED=dot_env\n")
+    return str(path)
+
+
+def test_lookup_layers(patch_environ: Dict[str, str], dot_env_file: str) -> None:
+    environ = ExtendedEnviron(True, dot_env_file)
+    assert environ["FROM_ENVIRON"] == "environ"
+    assert environ["FROM_DOT_ENV"] == "dot_env"
+    assert environ["SHARED"] == "environ"
+    assert environ.get("NOT_EXIST") is None
+    assert "FROM_DOT_ENV" in environ
+    assert "NOT_EXIST" not in environ
+    with pytest.raises(KeyError):
+        environ["NOT_EXIST"]
+
+
+def test_len_and_iter_match_merged_dict(patch_environ: Dict[str, str], dot_env_file: str) -> None:
+    environ = ExtendedEnviron(True, dot_env_file)
+    merged = environ.get_dot_env_combined_with_environ()
+    assert len(environ) == len(merged)
+    assert sorted(environ) == sorted(merged)
+    assert dict(environ) == dict(merged)
+
+
+def test_environ_changes_are_visible(patch_environ: Dict[str, str], dot_env_file: str) -> None:
+    environ = ExtendedEnviron(True, dot_env_file)
+    patch_environ["FROM_DOT_ENV"] = "overridden"
+    patch_environ["NEW"] = "new"
+    del patch_environ["SHARED"]
+    assert environ["FROM_DOT_ENV"] == "overridden"
+    assert environ["NEW"] == "new"
+    assert environ["SHARED"] == "dot_env"
+    assert len(environ) == len(environ.get_dot_env_combined_with_environ())
+
+
+def test_non_str_key(patch_environ: Dict[str, str]) -> None:
+    with pytest.raises(ValueError):
+        ExtendedEnviron(False, "")[42]  # type: ignore[index]
+
+
+class _NotIterableEnviron(Dict[str, str]):
+    def __iter__(self) -> NoReturn:
+        raise AssertionError("os.environ iterated")
+
+    def keys(self) -> NoReturn:  # type: ignore[override]
+        raise AssertionError("os.environ iterated")
+
+    def items(self) -> NoReturn:  # type: ignore[override]
+        raise AssertionError("os.environ iterated")
+
+    def copy(self) -> NoReturn:
+        raise AssertionError("os.environ copied")
+
+
+def test_lookup_does_not_iterate_environ(dot_env_file: str) -> None:
+    environ = ExtendedEnviron(True, dot_env_file)
+    environ.refresh()  # python-dotenv reads os.environ while parsing
+    # a merged dict rebuilt per lookup would cost as much as the environment size
+    with patched_environ(_NotIterableEnviron({f"VAR_{i}": str(i) for i in range(10_000)})):
+        assert environ.get("FROM_DOT_ENV") == "dot_env"
+        assert environ["VAR_42"] == "42"
+        assert "SHARED" in environ
+        assert environ.get("NOT_EXIST") is None
@@ -1,15 +1,14 @@
+import timeit
 from dataclasses import FrozenInstanceError
 from typing import Any, Optional
 
 import pytest
 
+from envcon import configuration, reload, snapshot
+
 # noinspection PyProtectedMember
-from envcon.frozen import (
-    _AccessBaseClassAttributesIfBaseAndDerivedShareSameNameMeta,
-    _FrozenClassAttributesMeta,
-    create_frozen_class_from_another_class,
-)
-from helpers import not_test
+from envcon.frozen import _FrozenClassAttributesMeta, create_frozen_class_from_another_class
+from helpers import not_test, perf_test
 
 
 @not_test
@@ -26,19 +25,70 @@ def test_freeze_class_parameterization(metaclass: Optional[type] = None) -> tupl
     return EmptyClass, WithClassAttributes
 
 
-def test_access_base_class_attributes_if_base_and_subclass_share_same_name_meta() -> None:
+def test_frozen_class_looks_like_the_original_class() -> None:
+    class Bla:
+        """bla docs"""
+
+        attr: int = 42
+
+    FrozenBla: Any = create_frozen_class_from_another_class(Bla)
+
+    assert FrozenBla.attr == 42
+    assert FrozenBla.__name__ == Bla.__name__
+    assert FrozenBla.__qualname__ == Bla.__qualname__
+    assert FrozenBla.__module__ == Bla.__module__
+    assert FrozenBla.__doc__ == Bla.__doc__
+    assert FrozenBla.__annotations__ == Bla.__annotations__
+    assert issubclass(FrozenBla, Bla)
+
+
+def test_frozen_class_reads_changes_of_the_original_class() -> None:
+    class Bla:
+        attr: int = 42
+
+    FrozenBla: Any = create_frozen_class_from_another_class(Bla)
+    Bla.attr = 420
+    assert FrozenBla.attr == 420
+
+
+def test_vars_of_frozen_class_lists_the_original_class_attributes() -> None:
     class Bla:
         attr: int = 42
 
-    class Blu(Bla, metaclass=_AccessBaseClassAttributesIfBaseAndDerivedShareSameNameMeta):
-        attr: int = 420
+    FrozenBla: Any = create_frozen_class_from_another_class(Bla)
+
+    assert vars(FrozenBla)["attr"] == 42
+    assert FrozenBla.__dict__ is not None and "attr" in FrozenBla.__dict__
+
+
+def test_vars_of_decorated_frozen_class_lists_the_values() -> None:
+    @configuration(prefix="", source={"A": "a", "B": "42"})
+    class FrozenConfig:
+        A: str
+        B: int
+
+    assert [name for name in vars(FrozenConfig) if not name.startswith("_")] == ["A", "B"]
+    assert vars(FrozenConfig)["B"] == 42
+    assert snapshot(FrozenConfig) == {"A": "a", "B": 42}
+    assert reload(FrozenConfig) == set()
+
+
+def test_frozen_class_attribute_read_is_a_regular_lookup() -> None:
+    Frozen = create_frozen_class_from_another_class(type("Plain", (), {"attr": 42}))
+    assert type(Frozen).__getattribute__ is type.__getattribute__
+
+
+@perf_test
+def test_frozen_class_attribute_read_is_as_fast_as_plain_class() -> None:
+    class Plain:
+        attr: int = 42
 
-    class Bla(Bla, metaclass=_AccessBaseClassAttributesIfBaseAndDerivedShareSameNameMeta):  # type: ignore[no-redef]
-        attr: int = 0x420
+    Frozen: Any = create_frozen_class_from_another_class(Plain)
 
-    assert Blu.attr == 420
-    assert Bla.attr == 42
-    assert object.__getattribute__(Bla, "attr") == 0x420
+    plain = min(timeit.repeat(lambda: Plain.attr, number=20_000, repeat=7))
+    frozen = min(timeit.repeat(lambda: Frozen.attr, number=20_000, repeat=7))
+    # a python level __getattribute__ is about an order of magnitude slower than a plain read
+    assert frozen < plain * 2
 
 
 @pytest.mark.parametrize("cls", test_freeze_class_parameterization(metaclass=_FrozenClassAttributesMeta))
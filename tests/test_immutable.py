@@ -0,0 +1,123 @@
+import pickle
+import tracemalloc
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Set
+
+import pytest
+
+from envcon import FrozenArray, configuration
+from envcon.utils import type_utils
+from envcon.utils.immutable import freeze
+
+
+def test_frozen_array() -> None:
+    array = FrozenArray("q", [1, 2, 3])
+    assert len(array) == 3
+    assert array[0] == 1 and array[-1] == 3
+    assert array[1:] == FrozenArray("q", [2, 3])
+    assert list(array) == [1, 2, 3]
+    assert array.tolist() == [1, 2, 3]
+    assert array == (1, 2, 3) and (1, 2, 3) == array
+    assert array != (1, 2) and array != [1, 2, 3]
+    assert hash(array) == hash((1, 2, 3))
+    assert 2 in array and array.index(3) == 2
+    assert repr(array) == "FrozenArray('q', [1, 2, 3])"
+    assert pickle.loads(pickle.dumps(array)) == array
+
+
+def test_frozen_array_is_read_only() -> None:
+    array = FrozenArray("d", [4.2])
+    with pytest.raises(TypeError):
+        array[0] = 42  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        array._array = None  # type: ignore[assignment]
+    with pytest.raises(AttributeError):
+        del array._array
+
+
+def test_freeze() -> None:
+    frozen = freeze({"a": [1, {"b": {2}}], "c": "d"})
+    assert isinstance(frozen, MappingProxyType)
+    assert frozen == {"a": (1, {"b": frozenset({2})}), "c": "d"}
+    assert isinstance(frozen["a"][1], MappingProxyType)
+    with pytest.raises(TypeError):
+        frozen["c"] = "e"  # type: ignore[index]
+
+
+@pytest.mark.parametrize(
+    "type_, value, expected",
+    [
+        (list, "a,b", ("a", "b")),
+        (List[str], "a,b", ("a", "b")),
+        (List[bool], "yes,no", (True, False)),
+        (List[int], "1,2", FrozenArray("q", [1, 2])),
+        (List[int], f"1,{2 ** 64}", (1, 2**64)),
+        (List[float], "1,2.5", FrozenArray("d", [1.0, 2.5])),
+        (Set[int], "1,2", frozenset({1, 2})),
+        (Optional[List[int]], "1", FrozenArray("q", [1])),
+        (dict, '{"a": [1]}', MappingProxyType({"a": (1,)})),
+        (Dict[str, List[int]], '{"a": [1]}', MappingProxyType({"a": (1,)})),
+    ],
+)
+def test_immutable_converters(type_: type, value: str, expected: Any) -> None:
+    converted = type_utils.convert(value, type_, immutable=True)
+    assert converted == expected
+    assert type(converted) is type(expected)
+
+
+def test_immutable_values() -> None:
+    source = {"RO_HOSTS": "a,b", "RO_PORTS": "1,2", "RO_FLAGS": '{"a": [true]}'}
+
+    @configuration(prefix="RO_", source=source, immutable_values=True)
+    class ReadOnly:
+        HOSTS: List[str]
+        PORTS: List[int]
+        FLAGS: Dict[str, List[bool]]
+        DEFAULTS: List[str] = ["x"]
+
+    assert ReadOnly.HOSTS == ("a", "b")
+    assert ReadOnly.PORTS == (1, 2)
+    assert ReadOnly.FLAGS == {"a": (True,)}
+    assert ReadOnly.DEFAULTS == ("x",)
+    with pytest.raises(TypeError):
+        ReadOnly.FLAGS["b"] = (False,)  # type: ignore[assignment]
+
+
+def test_immutable_values_are_shared() -> None:
+    source = {"A_PORTS": "1,2", "B_PORTS": "1,2"}
+
+    @configuration(prefix="A_", source=source, immutable_values=True)
+    class A:
+        PORTS: List[int]
+
+    @configuration(prefix="B_", source=source, immutable_values=True)
+    class B:
+        PORTS: List[int]
+
+    assert A.PORTS is B.PORTS
+
+
+def test_immutable_values_requires_frozen() -> None:
+    with pytest.raises(ValueError, match="frozen"):
+
+        @configuration(prefix="RO_", source={}, frozen=False, immutable_values=True)
+        class NotFrozen:
+            pass
+
+
+def test_int_array_memory() -> None:
+    value = ",".join(str(i) for i in range(1_000, 101_000))
+
+    def allocated(converter: type_utils.Converter) -> int:
+        tracemalloc.start()
+        try:
+            converted = converter(value)
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(converted) == 100_000
+        return size
+
+    as_list = allocated(type_utils.compile_converter(List[int]))  # type: ignore[arg-type]
+    as_array = allocated(type_utils.compile_converter(List[int], immutable=True))  # type: ignore[arg-type]
+    assert as_array < as_list / 3
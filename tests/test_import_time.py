@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from helpers import perf_test
+
+# imported by features which most processes never use: reading a .env file, dict conversions, bundles, the schema
+# disk cache, instrumentation hooks, watching, async sources, frozen errors
+DEFERRED_MODULES = ["dotenv", "json", "dataclasses", "inspect", "pickle", "hashlib", "logging", "asyncio", "concurrent"]
+IMPORT_TIME_BUDGET_SECONDS = 0.030
+
+
+def run_python(code: str, tmp_path: Path, *options: str) -> subprocess.CompletedProcess:
+    env: Dict[str, str] = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+    # bytecode is cached out of the tree, import time is measured the way installed packages are imported
+    env["PYTHONPYCACHEPREFIX"] = str(tmp_path / "pycache")
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        env=env,
+    )
+
+
+def test_heavy_modules_are_deferred(tmp_path: Path) -> None:
+    result = run_python(
+        f"import sys, envcon; print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))", tmp_path
+    )
+    assert result.stdout.strip() == ""
+
+
+@pytest.mark.parametrize(
+    "code, module",
+    [
+        ("envcon.FrozenError", "dataclasses"),
+        ("envcon.WatchedEnviron", "logging"),
+        ("envcon.export_bundle", "pickle"),
+        (
+            "envcon.configuration(prefix='', source={'A': '{}'})(type('C', (), {'__annotations__': {'A': dict}}))",
+            "json",
+        ),
+    ],
+)
+def test_deferred_modules_are_imported_on_use(tmp_path: Path, code: str, module: str) -> None:
+    result = run_python(f"import sys, envcon; {code}; print({module!r} in sys.modules)", tmp_path)
+    assert result.stdout.strip() == "True"
+
+
+@perf_test
+def test_import_time_budget(tmp_path: Path) -> None:
+    run_python("import envcon", tmp_path)  # writes the bytecode
+    times: List[float] = []
+    for _ in range(3):
+        lines = run_python("import envcon", tmp_path, "-X", "importtime").stderr.splitlines()
+        # "import time: self [us] | cumulative | imported package"
+        envcon_line = next(line for line in lines if line.split("|")[-1].strip() == "envcon")
+        times.append(int(envcon_line.split("|")[1]) / 1e6)
+    assert min(times) < IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,150 @@
+import time
+import timeit
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import pytest
+
+import envcon
+from envcon import LoadEvent, configuration
+from helpers import perf_test
+
+
+@pytest.fixture
+def events() -> Iterator[List[LoadEvent]]:
+    recorded: List[LoadEvent] = []
+    envcon.reset_stats()
+    stop = envcon.instrument(recorded.append)
+    yield recorded
+    stop()
+    envcon.reset_stats()
+
+
+@pytest.fixture
+def source() -> Dict[str, str]:
+    return {"APP_HOST": "localhost", "APP_PORTS": "1,2,3"}
+
+
+@pytest.fixture
+def app_class() -> type:
+    # decorating injects into the class itself, so every test gets its own
+    class App:
+        HOST: str
+        PORTS: List[int]
+        DEBUG: bool = False
+
+    return App
+
+
+def test_load_event(events: List[LoadEvent], source: Dict[str, str], app_class: type) -> None:
+    configuration(prefix="APP_", source=source)(app_class)
+    [event] = events
+    assert event.class_name == f"{__name__}.{app_class.__qualname__}"
+    assert event.kind == "load"
+    assert list(event.fields_seconds) == ["HOST", "PORTS", "DEBUG"]
+    assert event.conversion_seconds == pytest.approx(sum(event.fields_seconds.values()))
+    assert all(seconds > 0 for seconds in event[2:6])
+    assert event.total_seconds == pytest.approx(sum(event[2:6]))
+
+
+class BulkDict(Dict[str, str]):
+    def get_many(self, keys: Sequence[str]) -> Mapping[str, Optional[str]]:
+        return {key: self[key] for key in keys if key in self}
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_lookup_of_every_field(events: List[LoadEvent], source: Dict[str, str], app_class: type, bulk: bool) -> None:
+    configuration(prefix="APP_", source=BulkDict(source) if bulk else source)(app_class)
+    [event] = events
+    assert list(event.fields_lookup_seconds) == ["HOST", "PORTS", "DEBUG"]
+    assert event.lookup_seconds == pytest.approx(sum(event.fields_lookup_seconds.values()))
+    if bulk:
+        assert len(set(event.fields_lookup_seconds.values())) == 1  # one request, shared evenly
+
+
+def test_reload_and_lazy_events(events: List[LoadEvent], source: Dict[str, str], app_class: type) -> None:
+    app: Any = configuration(prefix="APP_", source=source, lazy=True)(app_class)
+    assert app.HOST == "localhost"
+    source["APP_HOST"] = "remotehost"
+    envcon.reload(app)
+    assert [event.kind for event in events] == ["load", "lazy", "reload"]
+    assert list(events[1].fields_seconds) == ["HOST"]
+    assert list(events[2].fields_seconds) == ["HOST"]
+    assert list(events[1].fields_lookup_seconds) == ["HOST"]
+    assert list(events[2].fields_lookup_seconds) == ["HOST"]
+
+
+def test_stats(events: List[LoadEvent], source: Dict[str, str], app_class: type) -> None:
+    configuration(prefix="APP_", source=source)(app_class)
+    configuration(prefix="APP_", source=source, slots=True)(app_class)
+    app_stats = envcon.stats()[f"{__name__}.{app_class.__qualname__}"]
+    assert app_stats.events == 2
+    assert app_stats.lookup_seconds == pytest.approx(sum(event.lookup_seconds for event in events))
+    assert app_stats.fields_seconds["PORTS"] == pytest.approx(sum(event.fields_seconds["PORTS"] for event in events))
+    assert app_stats.fields_lookup_seconds["HOST"] == pytest.approx(
+        sum(event.fields_lookup_seconds["HOST"] for event in events)
+    )
+    envcon.reset_stats()
+    assert envcon.stats() == {}
+
+
+def test_stop(source: Dict[str, str], app_class: type) -> None:
+    recorded: List[LoadEvent] = []
+    stop = envcon.instrument(recorded.append)
+    stop()
+    stop()
+    configuration(prefix="APP_", source=source)(app_class)
+    assert recorded == []
+    assert not envcon.instrumentation.enabled
+
+
+def test_failing_hook_is_logged(source: Dict[str, str], app_class: type, caplog: pytest.LogCaptureFixture) -> None:
+    def hook(event: LoadEvent) -> None:
+        raise RuntimeError("broken hook")
+
+    stop = envcon.instrument(hook)
+    try:
+        app: Any = configuration(prefix="APP_", source=source)(app_class)
+    finally:
+        stop()
+    assert app.HOST == "localhost"
+    assert "broken hook" in caplog.text
+
+
+def _decorate_many() -> None:
+    class Many:
+        pass
+
+    Many.__annotations__ = {f"VALUE_{i}": int for i in range(100)}
+    configuration(prefix="", source={f"VALUE_{i}": str(i) for i in range(100)}, frozen=False)(Many)
+
+
+def test_nothing_is_timed_when_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[float] = []
+
+    def perf_counter() -> float:
+        calls.append(0.0)
+        return 0.0
+
+    monkeypatch.setattr(time, "perf_counter", perf_counter)
+    _decorate_many()
+    assert calls == []
+
+    stop = envcon.instrument()
+    try:
+        _decorate_many()
+    finally:
+        stop()
+        envcon.reset_stats()
+    assert calls
+
+
+@perf_test
+def test_overhead_when_disabled() -> None:
+    disabled = min(timeit.repeat(_decorate_many, number=50, repeat=5))
+    stop = envcon.instrument()
+    try:
+        enabled = min(timeit.repeat(_decorate_many, number=50, repeat=5))
+    finally:
+        stop()
+        envcon.reset_stats()
+    assert disabled < enabled * 1.2
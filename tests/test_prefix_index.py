@@ -0,0 +1,143 @@
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+import envcon
+from envcon import PrefixIndex, WatchedEnviron, configuration
+from envcon.extended_environ import ExtendedEnviron
+from helpers import rewrite, sample_configuration
+
+
+def test_keys_with_prefix() -> None:
+    index = PrefixIndex(sample_configuration)
+    assert index.keys_with_prefix("SOME_") == ["SOME_A", "SOME_B", "SOME_INT"]
+    assert index.keys_with_prefix("ZXC_") == ["ZXC_SOME_A", "ZXC_SOME_B"]
+    assert index.keys_with_prefix("NOT_EXIST_") == []
+    assert index.keys_with_prefix("") == sorted(sample_configuration)
+
+
+def test_with_prefix() -> None:
+    index = PrefixIndex(sample_configuration)
+    partition = index.with_prefix("ZXC_")
+    assert dict(partition) == {"ZXC_SOME_A": "prefixed_a", "ZXC_SOME_B": "prefixed_a"}
+    assert index.with_prefix("ZXC_") is partition
+    assert dict(index.with_prefix("")) == sample_configuration
+    with pytest.raises(TypeError):
+        partition["ZXC_SOME_A"] = "value"  # type: ignore[index]
+
+
+def test_mapping() -> None:
+    index = PrefixIndex(sample_configuration)
+    assert dict(index) == sample_configuration
+    assert len(index) == len(sample_configuration)
+    assert index["SOME_A"] == "value_a"
+
+
+def test_refresh() -> None:
+    source = dict(sample_configuration)
+    index = PrefixIndex(source)
+    partition = index.with_prefix("ZXC_")
+    source["ZXC_SOME_C"] = "c"
+    assert "ZXC_SOME_C" not in index.with_prefix("ZXC_")
+    index.refresh()
+    assert index.with_prefix("ZXC_") is not partition
+    assert index.with_prefix("ZXC_")["ZXC_SOME_C"] == "c"
+
+
+def test_configuration_reads_from_prefix_partition() -> None:
+    index = PrefixIndex(sample_configuration)
+
+    @configuration(prefix="SOME_", source=index)
+    class Some:
+        A: str
+        INT: int
+
+    @configuration(prefix="ZXC_", source=index)
+    class Zxc:
+        SOME_A: str
+
+    assert (Some.A, Some.INT, Zxc.SOME_A) == ("value_a", 42, "prefixed_a")
+    with pytest.raises(LookupError, match="does not exist in index"):
+
+        @configuration(prefix="ZXC_", source=index)
+        class Missing:
+            INT: int
+
+
+def test_reload_refreshes_index() -> None:
+    source = dict(sample_configuration)
+    index = PrefixIndex(source)
+
+    @configuration(prefix="SOME_", source=index)
+    class Some:
+        INT: int
+
+    source["SOME_INT"] = "420"
+    assert envcon.reload(Some) == {"INT"}
+    assert Some.INT == 420
+
+
+def test_reload_all_refreshes_a_shared_index_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(envcon.registry, "_classes", weakref.WeakKeyDictionary())
+    source = dict(sample_configuration)
+    index = PrefixIndex(source)
+    classes: List[type] = [
+        configuration(prefix="SOME_", source=index)(type("Some", (), {"__annotations__": {"INT": int}}))
+    ]
+    classes += [configuration(prefix="ZXC_", source=index)(type("Zxc", (), {"__annotations__": {"SOME_A": str}}))]
+    refreshes: List[None] = []
+    refresh = index.refresh
+    monkeypatch.setattr(index, "refresh", lambda: refreshes.append(refresh()))
+
+    source["SOME_INT"] = "420"
+    assert envcon.reload_all() == {classes[0]: {"INT"}, classes[1]: set()}
+    assert len(refreshes) == 1
+
+
+def test_watched_environ_reloads_classes_of_its_index(tmp_path: Path) -> None:
+    dot_env_file = tmp_path / ".env"
+    dot_env_file.write_text("ENVCON_TEST_POOL_SIZE=4\n")
+    environ = WatchedEnviron(str(dot_env_file))
+
+    @configuration(prefix="ENVCON_TEST_", source=PrefixIndex(environ))
+    class Pool:
+        POOL_SIZE: int
+
+    rewrite(dot_env_file, "ENVCON_TEST_POOL_SIZE=8\n")
+    assert environ.poll() == {"ENVCON_TEST_POOL_SIZE"}
+    assert Pool.POOL_SIZE == 8
+
+
+def test_index_over_environ(patch_environ: Dict[str, str]) -> None:
+    patch_environ["MONGO_USER"] = "user"
+    index = PrefixIndex(ExtendedEnviron(False, ""))
+    assert index.keys_with_prefix("MONGO_") == ["MONGO_USER"]
+    with pytest.raises(LookupError, match="is not an environment variable"):
+
+        @configuration(prefix="MONGO_", source=index)
+        class Mongo:
+            PASSWORD: str
+
+
+class _CountedKey(str):
+    touched = 0
+
+    def __lt__(self, other: str) -> bool:
+        _CountedKey.touched += 1
+        return str.__lt__(self, other)
+
+    def startswith(self, *args: Any) -> bool:
+        _CountedKey.touched += 1
+        return str.startswith(self, *args)
+
+
+def test_keys_with_prefix_does_not_scan_the_source() -> None:
+    source: Dict[str, str] = {_CountedKey(f"UNRELATED_{i}"): str(i) for i in range(50_000)}
+    source.update({_CountedKey(f"MONGO_{i}"): str(i) for i in range(10)})
+    index = PrefixIndex(source)
+    _CountedKey.touched = 0
+    assert len(index.keys_with_prefix("MONGO_")) == 10
+    # a binary search (log2(50_010) < 16 comparisons) and the keys under the prefix, plus the one after them
+    assert _CountedKey.touched <= 16 + 11
@@ -0,0 +1,214 @@
+import gc
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+import envcon
+from envcon import configuration, environment_configuration
+from helpers import rewrite
+
+
+@pytest.fixture
+def source() -> Dict[str, str]:
+    return {"HOST": "localhost", "PORT": "8080", "TAGS": "a,b"}
+
+
+@pytest.mark.parametrize("frozen", (True, False))
+def test_reload(source: Dict[str, str], frozen: bool) -> None:
+    @configuration(prefix="", source=source, frozen=frozen)
+    class Test:
+        HOST: str
+        PORT: int
+        TAGS: List[str]
+
+    tags = Test.TAGS
+    source["PORT"] = "9090"
+    assert envcon.reload(Test) == {"PORT"}
+    assert Test.PORT == 9090
+    assert Test.TAGS is tags
+    assert envcon.reload(Test) == set()
+
+
+def test_reload_falls_back_to_default(source: Dict[str, str]) -> None:
+    @configuration(prefix="", source=source)
+    class Test:
+        PORT: int = 42
+
+    del source["PORT"]
+    assert envcon.reload(Test) == {"PORT"}
+    assert Test.PORT == 42
+
+
+def test_failed_reload_changes_nothing(source: Dict[str, str]) -> None:
+    @configuration(prefix="", source=source)
+    class Test:
+        HOST: str
+        PORT: int
+
+    source["HOST"] = "remote"
+    source["PORT"] = "not a number"
+    with pytest.raises(ValueError):
+        envcon.reload(Test)
+    assert Test.HOST == "localhost"
+    assert Test.PORT == 8080
+
+
+def test_reload_collect_errors(source: Dict[str, str]) -> None:
+    @configuration(prefix="", source=source, collect_errors=True)
+    class Test:
+        HOST: str
+        PORT: int
+
+    del source["HOST"]
+    source["PORT"] = "not a number"
+    with pytest.raises(envcon.ConfigurationErrors) as exc_info:
+        envcon.reload(Test)
+    assert [error.field for error in exc_info.value.errors] == ["HOST", "PORT"]
+
+
+def test_reload_lazy(source: Dict[str, str]) -> None:
+    @configuration(prefix="", source=source, lazy=True)
+    class Test:
+        HOST: str
+        PORT: int
+
+    assert Test.PORT == 8080
+    source["HOST"] = "remote"
+    source["PORT"] = "9090"
+    assert envcon.reload(Test) == {"PORT"}
+    assert Test.PORT == 9090
+    assert Test.HOST == "remote"
+
+
+@pytest.mark.parametrize("frozen", (True, False))
+def test_reload_publishes_every_value_at_once(source: Dict[str, str], frozen: bool) -> None:
+    source.update({"FIRST": "0", "SECOND": "0"})
+
+    @configuration(prefix="", source=source, frozen=frozen)
+    class Test:
+        FIRST: int
+        SECOND: int
+
+    stopped = threading.Event()
+    mismatches = []
+
+    def read() -> None:
+        while not stopped.is_set():
+            values = envcon.snapshot(Test)
+            if values["FIRST"] != values["SECOND"]:
+                mismatches.append((values["FIRST"], values["SECOND"]))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(1, 2000):
+            source.update({"FIRST": str(i), "SECOND": str(i)})
+            envcon.reload(Test)
+    finally:
+        stopped.set()
+        reader.join()
+    assert mismatches == []
+    assert envcon.snapshot(Test) == {"FIRST": 1999, "SECOND": 1999}
+    assert (Test.FIRST, Test.SECOND) == (1999, 1999)
+
+
+def test_snapshot_is_read_only(source: Dict[str, str]) -> None:
+    @configuration(prefix="", source=source)
+    class Test:
+        PORT: int
+
+    values = envcon.snapshot(Test)
+    with pytest.raises(TypeError):
+        values["PORT"] = 1  # type: ignore[index]
+    source["PORT"] = "9090"
+    envcon.reload(Test)
+    assert values == {"PORT": 8080}
+    assert envcon.snapshot(Test) == {"PORT": 9090}
+
+
+@pytest.fixture
+def empty_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    # the module level classes of other test modules are alive, reading a source which is no longer valid
+    monkeypatch.setattr(envcon.registry, "_classes", weakref.WeakKeyDictionary())
+
+
+@pytest.mark.parametrize("frozen", (True, False))
+@pytest.mark.parametrize("slots", (True, False))
+def test_registry_does_not_keep_classes_alive(source: Dict[str, str], frozen: bool, slots: bool) -> None:
+    def decorate() -> List[weakref.ReferenceType]:
+        references = []
+        for _ in range(100):
+
+            @configuration(prefix="", source=source, frozen=frozen, slots=slots)
+            class Test:
+                PORT: int
+
+            references.append(weakref.ref(Test if not slots else type(Test)))
+        return references
+
+    references = decorate()
+    gc.collect()
+    assert [reference for reference in references if reference() is not None] == []
+
+
+def test_reload_all(source: Dict[str, str], empty_registry: None) -> None:
+    @configuration(prefix="", source=source)
+    class First:
+        PORT: int
+
+    @configuration(prefix="", source=source, frozen=False)
+    class Second:
+        HOST: str
+
+    source["PORT"] = "9090"
+    source["HOST"] = "remote"
+    reloaded = envcon.reload_all()
+    assert reloaded[First] == {"PORT"}
+    assert reloaded[Second] == {"HOST"}
+    assert First.PORT == 9090
+    assert Second.HOST == "remote"
+
+
+def test_reload_all_reloads_every_class_before_raising(source: Dict[str, str], empty_registry: None) -> None:
+    @configuration(prefix="", source=source)
+    class First:
+        PORT: int
+
+    @configuration(prefix="", source=source)
+    class Second:
+        HOST: str
+
+    source["PORT"] = "not a number"
+    source["HOST"] = "remote"
+    with pytest.raises(ValueError):
+        envcon.reload_all()
+    assert First.PORT == 8080
+    assert Second.HOST == "remote"
+
+
+def test_reload_not_a_configuration_class() -> None:
+    class Test:
+        pass
+
+    with pytest.raises(TypeError):
+        envcon.reload(Test)
+
+
+def test_reload_environment_configuration(patch_environ: Dict[str, str], tmp_path: Path) -> None:
+    dot_env_file = tmp_path / ".env"
+    dot_env_file.write_text("SECRET=old\nTIMEOUT=1\n")
+
+    @environment_configuration(dot_env_path=str(dot_env_file))
+    class Test:
+        SECRET: str
+        TIMEOUT: int
+
+    rewrite(dot_env_file, "SECRET=rotated\nTIMEOUT=1\n")
+    patch_environ["TIMEOUT"] = "2"
+
+    assert envcon.reload(Test) == {"SECRET", "TIMEOUT"}
+    assert Test.SECRET == "rotated"
+    assert Test.TIMEOUT == 2
@@ -0,0 +1,144 @@
+import timeit
+from typing import Any, Dict, List
+
+import pytest
+
+import envcon
+from envcon import compile_schema, configuration
+from helpers import perf_test
+
+
+@pytest.fixture
+def source() -> Dict[str, str]:
+    return {"DB_HOST": "localhost", "DB_PASSWORD": "hunter2", "DB_PORTS": "1,2"}
+
+
+class Database:
+    HOST: str
+    PASSWORD: str
+    PORTS: List[int]
+
+
+@pytest.mark.parametrize("frozen", [True, False])
+def test_sensitive_variables_are_masked(source: Dict[str, str], frozen: bool) -> None:
+    database: Any = configuration(prefix="DB_", source=source, frozen=frozen, sensitive=["PASSWORD"])(Database)
+    assert repr(database()) == "Database(HOST=localhost,PASSWORD=***,PORTS=[1, 2])"
+    assert database.PASSWORD == "hunter2"
+
+
+def test_sensitive_variables_are_masked_in_slots_and_compiled_schema(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True, sensitive=["PASSWORD"])(Database)
+    tenant = compile_schema(Database, prefix="DB_", sensitive=["PASSWORD"]).materialize(source)
+    assert repr(database) == repr(tenant) == "Database(HOST=localhost,PASSWORD=***,PORTS=[1, 2])"
+
+
+def test_unknown_sensitive_variable(source: Dict[str, str]) -> None:
+    with pytest.raises(ValueError, match="PASSWROD"):
+        configuration(prefix="DB_", source=source, sensitive=["PASSWROD"])(Database)
+    with pytest.raises(ValueError, match="PASSWROD"):
+        compile_schema(Database, prefix="DB_", sensitive=["PASSWROD"])
+
+
+def test_frozen_repr_is_updated_on_reload(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source)(Database)
+    assert repr(database()) == "Database(HOST=localhost,PASSWORD=hunter2,PORTS=[1, 2])"
+    assert repr(database()) is repr(database())
+    source["DB_HOST"] = "remotehost"
+    envcon.reload(database)
+    assert repr(database()) == "Database(HOST=remotehost,PASSWORD=hunter2,PORTS=[1, 2])"
+
+
+def test_frozen_lazy_repr(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, lazy=True)(Database)
+    assert repr(database()) == "Database(HOST=localhost,PASSWORD=hunter2,PORTS=[1, 2])"
+    assert repr(database()) == "Database(HOST=localhost,PASSWORD=hunter2,PORTS=[1, 2])"
+
+
+def test_mutable_repr_reads_current_values(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, frozen=False)(Database)
+    instance = database()
+    instance.HOST = "remotehost"
+    assert repr(instance) == "Database(HOST=remotehost,PASSWORD=hunter2,PORTS=[1, 2])"
+    del database.PASSWORD
+    assert repr(database()) == "Database(HOST=localhost,PORTS=[1, 2])"
+
+
+def test_annotations_which_are_not_identifiers() -> None:
+    class Odd:
+        pass
+
+    Odd.__annotations__ = {"NOT-AN-IDENTIFIER": str, "OK": str}
+    odd: Any = configuration(prefix="", source={"NOT-AN-IDENTIFIER": "a", "OK": "b"})(Odd)
+    assert repr(odd()) == f"{Odd.__qualname__}(NOT-AN-IDENTIFIER=a,OK=b)"
+
+
+@pytest.mark.parametrize("frozen", [True, False])
+def test_keyword_annotations(frozen: bool) -> None:
+    class Keywords:
+        pass
+
+    Keywords.__annotations__ = {"class": str, "OK": str}
+    keywords: Any = configuration(prefix="", source={"class": "a", "OK": "b"}, frozen=frozen)(Keywords)
+    assert repr(keywords()) == f"{Keywords.__qualname__}(class=a,OK=b)"
+    with pytest.raises(ValueError, match="keywords"):
+        configuration(prefix="", source={"class": "a", "OK": "b"}, slots=True)(Keywords)
+
+
+_ODD_NAME = "Conf\"ig{A!r:>30}'"
+
+
+@pytest.mark.parametrize("frozen", [True, False])
+def test_quotes_and_braces_in_names(frozen: bool) -> None:
+    odd: Any = type(_ODD_NAME, (), {"__annotations__": {"A{B}": str, "A": str}})
+    odd = configuration(prefix="", source={"A{B}": "secret", "A": "a"}, frozen=frozen, sensitive=["A{B}"])(odd)
+    assert repr(odd()) == f"{_ODD_NAME}(A{{B}}=***,A=a)"
+
+
+def test_quotes_and_braces_in_names_of_slots_and_compiled_schema() -> None:
+    odd: Any = type(_ODD_NAME, (), {"__annotations__": {"A": str, "B": str}})
+    source = {"A": "secret", "B": "b"}
+    assert repr(configuration(prefix="", source=source, slots=True, sensitive=["A"])(odd)) == f"{_ODD_NAME}(A=***,B=b)"
+    assert repr(compile_schema(odd, prefix="", sensitive=["A"]).materialize(source)) == f"{_ODD_NAME}(A=***,B=b)"
+
+
+@pytest.mark.parametrize("subclass_first", [True, False])
+def test_frozen_repr_of_subclass(source: Dict[str, str], subclass_first: bool) -> None:
+    database: Any = configuration(prefix="DB_", source=source)(Database)
+
+    class Replica(database):  # type: ignore[misc,valid-type]
+        HOST = "replica"
+
+    if subclass_first:
+        assert repr(Replica()) == "Database(HOST=replica,PASSWORD=hunter2,PORTS=[1, 2])"
+    assert repr(database()) == "Database(HOST=localhost,PASSWORD=hunter2,PORTS=[1, 2])"
+    assert repr(Replica()) == "Database(HOST=replica,PASSWORD=hunter2,PORTS=[1, 2])"
+
+
+def _many_values() -> Any:
+    class Many:
+        pass
+
+    Many.__annotations__ = {f"VALUE_{i}": List[int] for i in range(20)}
+    return configuration(prefix="", source={f"VALUE_{i}": "1,2,3" for i in range(20)})(Many)
+
+
+def _filtering_repr(instance: Any) -> str:
+    # the repr of envcon before it was compiled
+    names = list(type(instance).__annotations__)
+    values = ",".join(f"{name}={getattr(instance, name)}" for name in filter(lambda n: hasattr(instance, n), names))
+    return f"{type(instance).__qualname__}({values})"
+
+
+def test_frozen_repr_is_cached() -> None:
+    instance = _many_values()()
+    assert repr(instance) == _filtering_repr(instance)
+    # computed once: the same string is returned until a reload
+    assert repr(instance) is repr(instance)
+
+
+@perf_test
+def test_frozen_repr_time() -> None:
+    instance = _many_values()()
+    cached = min(timeit.repeat(lambda: repr(instance), number=2_000, repeat=5))
+    filtered = min(timeit.repeat(lambda: _filtering_repr(instance), number=2_000, repeat=5))
+    assert cached * 10 < filtered
@@ -0,0 +1,197 @@
+import importlib.util
+import json
+import pickle
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Generator, List, Optional, get_type_hints
+
+import pytest
+
+from envcon import schema
+from envcon.schema import Schema, class_type_hints
+from envcon.schema_disk_cache import module_source_hash
+from envcon.utils import type_utils
+
+
+class Parent:
+    A: str
+    B: "List[int]"
+    C: Optional[int] = 42
+
+
+class Child(Parent):
+    B: "Dict[str, int]"  # type: ignore[assignment]
+    D: "Optional[str]"
+
+
+def test_class_type_hints() -> None:
+    assert class_type_hints(Parent) == get_type_hints(Parent)
+    assert class_type_hints(Child) == get_type_hints(Child)
+    assert list(class_type_hints(Child)) == list(get_type_hints(Child))
+
+
+@pytest.fixture
+def evaluated_classes(monkeypatch: pytest.MonkeyPatch) -> List[type]:
+    evaluated: List[type] = []
+    evaluate_own_type_hints = schema._evaluate_own_type_hints
+
+    def counting_evaluate_own_type_hints(cls: type, annotations: Dict[str, Any]) -> Dict[str, Any]:
+        evaluated.append(cls)
+        return evaluate_own_type_hints(cls, annotations)
+
+    monkeypatch.setattr(schema, "_evaluate_own_type_hints", counting_evaluate_own_type_hints)
+    return evaluated
+
+
+def test_subclass_reuses_base_hints(evaluated_classes: List[type]) -> None:
+    class Base:
+        A: "int"
+
+    class Derived(Base):
+        B: "str"
+
+    class_type_hints(Base)
+    class_type_hints(Derived)
+    class_type_hints(Derived)
+    assert evaluated_classes == [Base, Derived]
+
+
+def test_schema() -> None:
+    child_schema = Schema.from_class(Child, "PREFIX_")
+    assert [field.name for field in child_schema.fields] == ["A", "B", "C", "D"]
+    a, b, c, d = child_schema.fields
+    assert a.lookup_key == "PREFIX_A"
+    assert b.converter is type_utils.compile_converter(Dict[str, int])
+    assert (c.default, c.optional) == (42, True)
+    assert (d.default, d.optional) == (None, True)
+    assert child_schema.fields_by_name["A"] is a
+
+
+# built with type() since mypy resolves these annotations against the class attributes
+ShadowingHints = type(
+    "ShadowingHints",
+    (),
+    {
+        "__module__": __name__,
+        "__annotations__": {"Path": str, "ROOT": "Path", "COUNT": "Inner"},
+        "Path": "/",
+        "Inner": int,
+    },
+)
+
+
+def test_class_attributes_do_not_shadow_module_globals() -> None:
+    assert class_type_hints(ShadowingHints) == get_type_hints(ShadowingHints)
+    assert class_type_hints(ShadowingHints)["ROOT"] is Path
+
+
+@pytest.fixture
+def module_with_string_annotations(tmp_path: Path) -> Generator[ModuleType, None, None]:
+    path = tmp_path / "envcon_schema_disk_cache_module.py"
+    path.write_text("from __future__ import annotations\nfrom typing import List\n\nclass Config:\n    A: List[int]\n")
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    yield module
+    del sys.modules[path.stem]
+
+
+@pytest.fixture
+def disk_cache_path(tmp_path: Path) -> Generator[str, None, None]:
+    path = str(tmp_path / "schema.cache")
+    schema.enable_disk_cache(path)
+    yield path
+    schema.disable_disk_cache()
+
+
+def test_disk_cache(
+    module_with_string_annotations: ModuleType, disk_cache_path: str, evaluated_classes: List[type]
+) -> None:
+    config = module_with_string_annotations.Config
+    assert class_type_hints(config) == {"A": List[int]}
+    schema.disable_disk_cache()  # flushes
+
+    # a new process: empty memory cache, hints are read from the disk cache
+    schema._own_type_hints_cache.clear()
+    schema.enable_disk_cache(disk_cache_path)
+    assert class_type_hints(config) == {"A": List[int]}
+    assert evaluated_classes == [config]
+
+    # the module source changed: the entry is stale
+    Path(module_with_string_annotations.__file__).write_text("# changed\n")  # type: ignore[arg-type]
+    schema.disable_disk_cache()
+    schema._own_type_hints_cache.clear()
+    schema.enable_disk_cache(disk_cache_path)
+    class_type_hints(config)
+    assert evaluated_classes == [config, config]
+
+
+def test_disk_cache_is_read_as_data(
+    module_with_string_annotations: ModuleType, tmp_path: Path, evaluated_classes: List[type]
+) -> None:
+    config = module_with_string_annotations.Config
+    source_hash = module_source_hash(config.__module__)
+    calls: List[str] = []
+    setattr(module_with_string_annotations, "record", calls.append)  # a function the tampered entry tries to call
+    hint = {"alias": [config.__module__, "record"], "args": [{"value": "called"}]}
+    path = tmp_path / "schema.cache"
+    path.write_text(json.dumps({"version": 2, "entries": [[config.__module__, "Config", source_hash, {"A": hint}]]}))
+
+    schema.enable_disk_cache(str(path))
+    try:
+        assert class_type_hints(config) == {"A": List[int]}
+    finally:
+        schema.disable_disk_cache()
+    assert calls == []
+    assert evaluated_classes == [config]
+
+
+pickled_calls: List[str] = []
+
+
+def record_pickled_call(name: str) -> None:
+    pickled_calls.append(name)
+
+
+class _PickledCall:
+    def __reduce__(self) -> Any:
+        return record_pickled_call, ("called",)
+
+
+def test_pickled_disk_cache_is_not_loaded(tmp_path: Path) -> None:
+    path = tmp_path / "schema.cache"
+    path.write_bytes(pickle.dumps({"version": 1, "entries": _PickledCall()}))
+    schema.enable_disk_cache(str(path))
+    schema.disable_disk_cache()
+    assert pickled_calls == []
+
+
+def test_disk_cache_directory_is_created(module_with_string_annotations: ModuleType, tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "schema.cache"
+    schema.enable_disk_cache(str(path))
+    class_type_hints(module_with_string_annotations.Config)
+    schema.disable_disk_cache()
+    assert [file.name for file in path.parent.iterdir()] == ["schema.cache"]
+    assert path.parent.stat().st_mode & 0o077 == 0
+
+
+def test_disk_cache_skips_local_classes(disk_cache_path: str) -> None:
+    class Local:
+        A: "int"
+
+    class_type_hints(Local)
+    schema.disable_disk_cache()
+    assert not Path(disk_cache_path).exists()
+
+
+def test_disk_cache_corrupted_file(tmp_path: Path) -> None:
+    path = tmp_path / "schema.cache"
+    path.write_bytes(b"not a pickle")
+    schema.enable_disk_cache(str(path))
+    try:
+        assert class_type_hints(Parent) == get_type_hints(Parent)
+    finally:
+        schema.disable_disk_cache()
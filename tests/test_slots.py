@@ -0,0 +1,172 @@
+import gc
+import sys
+import timeit
+import weakref
+from dataclasses import FrozenInstanceError
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+import envcon
+from envcon import configuration
+from helpers import perf_test
+
+
+@pytest.fixture
+def source() -> Dict[str, str]:
+    return {"DB_HOST": "localhost", "DB_PORT": "5432", "DB_TAGS": "a,b"}
+
+
+class Database:
+    """database configuration"""
+
+    HOST: str
+    PORT: int
+    TAGS: List[str]
+    USER: Optional[str]
+    TIMEOUT: float = 4.2
+
+    @property
+    def address(self) -> str:
+        return f"{self.HOST}:{self.PORT}"
+
+
+def test_slots(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    assert not isinstance(database, type)
+    assert (database.HOST, database.PORT, database.TAGS, database.USER) == ("localhost", 5432, ["a", "b"], None)
+    assert database.TIMEOUT == 4.2
+    assert database.address == "localhost:5432"
+    assert not hasattr(database, "__dict__")
+    assert type(database).__slots__ == ("HOST", "PORT", "TAGS", "USER", "TIMEOUT", "__weakref__")
+    assert type(database).__qualname__ == Database.__qualname__
+    assert type(database).__doc__ == Database.__doc__
+    assert repr(database) == "Database(HOST=localhost,PORT=5432,TAGS=['a', 'b'],USER=None,TIMEOUT=4.2)"
+    # the decorated class itself is left as is
+    assert not hasattr(Database, "HOST")
+
+
+class Described:
+    def describe(self) -> str:
+        return "configuration"
+
+    @classmethod
+    def kind(cls) -> str:
+        return "settings"
+
+
+class DescribedDatabase(Described):
+    HOST: str
+
+    def describe(self) -> str:
+        return f"database {super().describe()}"
+
+    @property
+    def title(self) -> str:
+        return super().describe().title()
+
+    @classmethod
+    def kind(cls) -> str:
+        return f"database {super().kind()}"
+
+
+@pytest.mark.parametrize("frozen", [True, False])
+def test_zero_argument_super(source: Dict[str, str], frozen: bool) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True, frozen=frozen)(DescribedDatabase)
+    assert (database.describe(), database.title, database.kind()) == (
+        "database configuration",
+        "Configuration",
+        "database settings",
+    )
+    # the methods of the decorated class still work with its own instances
+    assert DescribedDatabase().describe() == "database configuration"
+
+
+def test_frozen(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    with pytest.raises(FrozenInstanceError):
+        database.HOST = "remotehost"
+    with pytest.raises(FrozenInstanceError):
+        del database.HOST
+    with pytest.raises(FrozenInstanceError):
+        type(database).HOST = "remotehost"
+
+
+def test_not_frozen(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True, frozen=False)(Database)
+    database.HOST = "remotehost"
+    assert database.HOST == "remotehost"
+    with pytest.raises(AttributeError):
+        database.NOT_A_FIELD = 42
+    with pytest.raises(TypeError):
+        hash(database)
+
+
+def test_eq_and_hash(source: Dict[str, str]) -> None:
+    class Tenant:
+        HOST: str
+        PORT: int
+
+    first: Any = configuration(prefix="DB_", source=source, slots=True)(Tenant)
+    tenant_class = type(first)
+    second = tenant_class(HOST="localhost", PORT=5432)
+    third = tenant_class(HOST="localhost", PORT=5433)
+    assert first == second and hash(first) == hash(second)
+    assert first != third
+    assert first != (Tenant, "localhost", 5432)
+    assert len({first, second, third}) == 2
+
+
+def test_init_arguments(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    another = type(database)(HOST="remotehost", PORT=1, TAGS=[])
+    assert (another.HOST, another.USER, another.TIMEOUT) == ("remotehost", None, 4.2)
+    with pytest.raises(TypeError):
+        type(database)(HOST="remotehost")
+    with pytest.raises(TypeError):
+        type(database)("remotehost", 1, [])
+
+
+def test_reload(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    source["DB_PORT"] = "6543"
+    assert envcon.reload(database) == {"PORT"}
+    assert database.PORT == 6543
+    assert envcon.reload(type(database)) == set()
+
+
+def test_instance_is_not_kept_alive(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    reference = weakref.ref(database)
+    del database
+    gc.collect()
+    assert reference() is None
+
+
+def test_lazy_is_not_supported(source: Dict[str, str]) -> None:
+    with pytest.raises(ValueError, match="slots"):
+        configuration(prefix="DB_", source=source, slots=True, lazy=True)(Database)
+
+
+class _Plain:
+    HOST = "localhost"
+
+
+def test_instance_size(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    assert not hasattr(database, "__dict__")
+
+    plain = _Plain()
+    plain.__dict__.update(HOST="localhost", PORT=5432, TAGS=["a", "b"], USER=None, TIMEOUT=4.2)
+    assert sys.getsizeof(database) < sys.getsizeof(plain) + sys.getsizeof(plain.__dict__)
+
+
+@perf_test
+def test_access_time(source: Dict[str, str]) -> None:
+    database: Any = configuration(prefix="DB_", source=source, slots=True)(Database)
+    plain = _Plain()
+    plain.__dict__.update(HOST="localhost")
+
+    slotted = min(timeit.repeat(lambda: database.HOST, number=20_000, repeat=7))
+    instance = min(timeit.repeat(lambda: plain.HOST, number=20_000, repeat=7))
+    assert slotted < instance * 1.5
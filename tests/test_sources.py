@@ -0,0 +1,75 @@
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import pytest
+
+import envcon
+from envcon import BulkSource, configuration
+from helpers import sample_configuration
+
+
+class CountingBulkSource(Dict[str, str]):
+    def __init__(self, values: Mapping[str, str]) -> None:
+        super().__init__(values)
+        self.get_calls = 0
+        self.get_many_calls: List[Sequence[str]] = []
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:  # type: ignore[override]
+        self.get_calls += 1
+        return super().get(key, default)
+
+    def get_many(self, keys: Sequence[str]) -> Mapping[str, Optional[str]]:
+        self.get_many_calls.append(keys)
+        return {key: super(CountingBulkSource, self).get(key) for key in keys if key in self}
+
+
+def test_bulk_source_protocol() -> None:
+    assert isinstance(CountingBulkSource({}), BulkSource)
+    assert not isinstance(sample_configuration, BulkSource)
+
+
+def test_one_call_per_class() -> None:
+    source = CountingBulkSource(sample_configuration)
+
+    @configuration(prefix="SOME_", source=source)
+    class Test:
+        A: str
+        B: str
+        INT: int
+        NOT_EXIST: int = 42
+
+    assert (Test.A, Test.B, Test.INT, Test.NOT_EXIST) == ("value_a", "value_b", 42, 42)
+    assert source.get_many_calls == [["SOME_A", "SOME_B", "SOME_INT", "SOME_NOT_EXIST"]]
+    assert source.get_calls == 0
+
+
+def test_missing_variable() -> None:
+    with pytest.raises(LookupError):
+
+        @configuration(prefix="", source=CountingBulkSource(sample_configuration))
+        class Test:
+            NOT_EXIST: str
+
+
+def test_reload_one_call() -> None:
+    source = CountingBulkSource(sample_configuration)
+
+    @configuration(prefix="", source=source)
+    class Test:
+        SOME_A: str
+        SOME_INT: int
+
+    source["SOME_INT"] = "420"
+    assert envcon.reload(Test) == {"SOME_INT"}
+    assert Test.SOME_INT == 420
+    assert len(source.get_many_calls) == 2
+    assert source.get_calls == 0
+
+
+def test_empty_class() -> None:
+    source = CountingBulkSource(sample_configuration)
+
+    @configuration(prefix="", source=source)
+    class Test:
+        pass
+
+    assert source.get_many_calls == []
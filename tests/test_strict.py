@@ -0,0 +1,86 @@
+from typing import NoReturn
+
+import pytest
+
+from envcon import PrefixIndex, UnknownVariablesError, UnknownVariablesWarning, configuration
+
+source = {
+    "MONGO_USER": "user",
+    "MONGO_PASWORD": "typo",
+    "MONGO_PORT": "27017",
+    "REDIS_HOST": "localhost",
+}
+
+
+def test_strict() -> None:
+    with pytest.raises(UnknownVariablesError, match="MONGO_PASWORD \\(did you mean MONGO_PASSWORD\\?\\)") as exc_info:
+
+        @configuration(prefix="MONGO_", source=source, strict=True)
+        class Mongo:
+            USER: str
+            PORT: int
+            PASSWORD: str = ""
+
+    assert exc_info.value.keys == ("MONGO_PASWORD",)
+
+
+def test_strict_warn() -> None:
+    with pytest.warns(UnknownVariablesWarning, match="MONGO_PASWORD"):
+
+        @configuration(prefix="MONGO_", source=source, strict="warn")
+        class Mongo:
+            USER: str
+            PORT: int
+
+    assert Mongo.USER == "user"
+
+
+@pytest.mark.parametrize("strict", (True, "warn"))
+def test_strict_without_unknown_variables(strict: bool) -> None:
+    @configuration(prefix="REDIS_", source=source, strict=strict)
+    class Redis:
+        HOST: str
+
+    assert Redis.HOST == "localhost"
+
+
+def test_strict_lazy() -> None:
+    with pytest.raises(UnknownVariablesError):
+
+        @configuration(prefix="MONGO_", source=source, strict=True, lazy=True)
+        class Mongo:
+            USER: str
+
+
+def test_strict_prefix_index() -> None:
+    with pytest.raises(UnknownVariablesError, match="MONGO_PASWORD"):
+
+        @configuration(prefix="MONGO_", source=PrefixIndex(source), strict=True)
+        class Mongo:
+            USER: str
+            PORT: int
+
+
+@pytest.mark.parametrize("prefix, strict", [("", True), ("MONGO_", "raise")])
+def test_strict_invalid_arguments(prefix: str, strict: str) -> None:
+    with pytest.raises(ValueError):
+
+        @configuration(prefix=prefix, source=source, strict=strict)
+        class Mongo:
+            pass
+
+
+class _NotIterableIndex(PrefixIndex):
+    def __iter__(self) -> NoReturn:
+        raise AssertionError("the whole source is scanned")
+
+
+def test_strict_with_prefix_index_does_not_scan_the_source() -> None:
+    index = _NotIterableIndex({**{f"UNRELATED_{i}": str(i) for i in range(1_000)}, **source})
+
+    with pytest.warns(UnknownVariablesWarning, match="MONGO_PASWORD"):
+
+        @configuration(prefix="MONGO_", source=index, strict="warn")
+        class Mongo:
+            USER: str
+            PORT: int
@@ -1,9 +1,13 @@
-from typing import Optional, Union, List, Dict, Callable, Sequence, TypeVar, Any
+import functools
+import timeit
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional, Union, List, Dict, Callable, Sequence, TypeVar, Any, Tuple, Set, FrozenSet
 
 import pytest
 
 from envcon.utils import type_utils, inspections, functional
-from helpers import skip_if_python38_is_presented, is_python_38
+from helpers import skip_if_python38_is_presented, is_python_38, perf_test
 
 T = TypeVar("T")
 
@@ -86,6 +90,173 @@ def test_is_list39(type_: type, expected: bool) -> None:
     assert type_utils._is_list(type_) == expected
 
 
+@pytest.mark.parametrize(
+    "type_, value, expected",
+    [
+        (str, "value", "value"),
+        (int, "42", 42),
+        (bool, "true", True),
+        (List[int], "1,2,3", [1, 2, 3]),
+        (Optional[dict], '{"a": 42}', {"a": 42}),
+    ],
+)
+def test_compiled_converter(type_: type, value: str, expected: Any) -> None:
+    converter = type_utils.compile_converter(type_)
+    assert converter is type_utils.compile_converter(type_)
+    assert converter(value) == type_utils.convert(value, type_) == expected
+
+
+@perf_test
+@pytest.mark.parametrize("type_, value", [(str, "value"), (int, "42"), (List[int], "1,2,3")])
+def test_compiled_converter_throughput(type_: type, value: str) -> None:
+    converter = type_utils.compile_converter(type_)
+    compiled = min(timeit.repeat(lambda: converter(value), number=2_000, repeat=5))
+    dispatched = min(timeit.repeat(lambda: type_utils._compile_converter(type_)(value), number=2_000, repeat=5))
+    assert compiled < dispatched
+
+
+def test_compile_unsupported_type() -> None:
+    converter = type_utils.compile_converter(bytes)
+    with pytest.raises(ValueError):
+        converter("value")
+
+
+@pytest.mark.parametrize(
+    "type_, value, expected",
+    [
+        (list, "a,b", ["a", "b"]),
+        (List[bool], "true,no", [True, False]),
+        (List[float], "4.2,42", [4.2, 42.0]),
+        (tuple, "a,b", ("a", "b")),
+        (Tuple[int, ...], "1,2,3", (1, 2, 3)),
+        (Tuple[str, int, bool], "a,1,yes", ("a", 1, True)),
+        (Set[int], "1,2,2", {1, 2}),
+        (FrozenSet[str], "a,b,a", frozenset({"a", "b"})),
+        (Dict[str, int], '{"a": 1, "b": 2}', {"a": 1, "b": 2}),
+        (Dict[int, float], '{"1": 1, "2": 2.5}', {1: 1.0, 2: 2.5}),
+        (Dict[str, List[int]], '{"a": [1, 2]}', {"a": [1, 2]}),
+        (Dict[str, Dict[int, Optional[str]]], '{"a": {"1": null, "2": "b"}}', {"a": {1: None, 2: "b"}}),
+        (Dict[str, Any], '{"a": [1, {"b": null}]}', {"a": [1, {"b": None}]}),
+        (Optional[Dict[str, bool]], '{"a": true}', {"a": True}),
+        (List[Decimal], "1.10,2", [Decimal("1.10"), Decimal("2")]),
+        (Set[Path], "/a,/b", {Path("/a"), Path("/b")}),
+        (Tuple[Path, Decimal], "/a,1.5", (Path("/a"), Decimal("1.5"))),
+        (Decimal, "1.10", Decimal("1.10")),
+        (Optional[Path], "/a", Path("/a")),
+    ],
+)
+def test_convert_collections(type_: type, value: str, expected: Any) -> None:
+    converted = type_utils.convert(value, type_)
+    assert converted == expected
+    assert type(converted) is type(expected)
+
+
+@skip_if_python38_is_presented
+@pytest.mark.parametrize(
+    "type_, value, expected",
+    (
+        lambda: ()
+        if is_python_38
+        else (
+            (tuple[int, ...], "1,2", (1, 2)),  # type: ignore[misc]
+            (set[str], "a,b", {"a", "b"}),  # type: ignore[misc]
+            (frozenset[float], "1,2", frozenset({1.0, 2.0})),  # type: ignore[misc]
+            (dict[str, int], '{"a": 1}', {"a": 1}),  # type: ignore[misc]
+        )
+    )(),
+)
+def test_convert_collections39(type_: type, value: str, expected: Any) -> None:
+    assert type_utils.convert(value, type_) == expected
+
+
+@pytest.mark.parametrize(
+    "type_, value",
+    [
+        (Tuple[int, int], "1,2,3"),
+        (List[bool], "true,maybe"),
+        (Dict[str, int], '{"a": "1"}'),
+        (Dict[str, int], '{"a": true}'),
+        (Dict[str, float], '{"a": "1.0"}'),
+        (Dict[str, List[int]], '{"a": 1}'),
+        (Dict[int, str], '{"a": "b"}'),
+        (Dict[str, str], '["a"]'),
+        (Dict[str, set], '{"a": []}'),
+        (Decimal, "1.x"),
+        (List[Decimal], "1,1.x"),
+        (Tuple[int, Decimal], "1,1.x"),
+    ],
+)
+def test_convert_collections_invalid_values(type_: type, value: str) -> None:
+    with pytest.raises(ValueError):
+        type_utils.convert(value, type_)
+
+
+@pytest.mark.parametrize("type_", [bytes, Any, List[bytes], List[Any], Tuple[str, bytes], Set[object]])
+def test_convert_classes_not_created_from_strings(type_: type) -> None:
+    with pytest.raises(ValueError, match="unsupported type"):
+        type_utils.convert("a,b", type_)
+
+
+@pytest.mark.parametrize(
+    "value, separator, escape, expected",
+    [
+        ("a;b;c", ";", None, ["a", "b", "c"]),
+        ("a::b", "::", None, ["a", "b"]),
+        ("a\\,b,c", ",", "\\", ["a,b", "c"]),
+        ("a\\\\,b", ",", "\\", ["a\\", "b"]),
+        ("a\\,b\\,c", ",", "\\", ["a,b,c"]),
+        ("a^::b::c", "::", "^", ["a::b", "c"]),
+        ("a,b", ",", "\\", ["a", "b"]),
+    ],
+)
+def test_convert_list_separator_and_escape(value: str, separator: str, escape: Optional[str], expected: list) -> None:
+    assert type_utils.convert(value, List[str], separator, escape) == expected
+    assert type_utils.convert(value, Tuple[str, ...], separator, escape) == tuple(expected)  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("value", ["a,b\\", "\\", "a\\,b\\"])
+def test_convert_list_dangling_escape(value: str) -> None:
+    with pytest.raises(ValueError, match="escape"):
+        type_utils.convert(value, List[str], ",", "\\")
+
+
+@pytest.mark.parametrize("separator, escape", [("", None), (",", "\\\\"), (",", ",")])
+def test_invalid_separator_and_escape(separator: str, escape: Optional[str]) -> None:
+    with pytest.raises(ValueError):
+        type_utils.compile_converter(List[str], separator, escape)
+
+
+_LARGE_COLLECTIONS = [
+    (List[int], lambda value: [int(element) for element in value.split(",")]),
+    (List[str], lambda value: list(value.split(","))),
+    (FrozenSet[str], lambda value: frozenset([element for element in value.split(",")])),
+]
+
+
+@pytest.mark.parametrize("type_, baseline", _LARGE_COLLECTIONS)
+def test_large_collection(type_: type, baseline: Callable[[str], Any]) -> None:
+    value = ",".join(str(i) for i in range(100_000))
+    assert type_utils.compile_converter(type_)(value) == baseline(value)
+
+
+@perf_test
+@pytest.mark.parametrize("type_, baseline", _LARGE_COLLECTIONS)
+def test_large_collection_throughput(type_: type, baseline: Callable[[str], Any]) -> None:
+    value = ",".join(str(i) for i in range(100_000))
+    converter = type_utils.compile_converter(type_)
+
+    converted = min(timeit.repeat(lambda: converter(value), number=3, repeat=5))
+    hand_written = min(timeit.repeat(lambda: baseline(value), number=3, repeat=5))
+    assert converted < hand_written * 1.5
+
+
+def test_large_dict_throughput() -> None:
+    value = "{" + ",".join(f'"{i}": {i}' for i in range(100_000)) + "}"
+    converted = type_utils.convert(value, Dict[int, float])
+    assert len(converted) == 100_000
+    assert converted[42] == 42.0
+
+
 def test_retrieve_name() -> None:
     vari: str = "some"
     able: str = "value"
@@ -102,6 +273,17 @@ def test_retrieve_name() -> None:
     assert inspections.retrieve_name(d) == "d"
 
 
+def _call_nested(depth: int, func: Callable[[], T]) -> T:
+    return _call_nested(depth - 1, func) if depth else func()
+
+
+def test_retrieve_name_max_depth() -> None:
+    variable: dict = {}
+
+    assert _call_nested(5, functools.partial(inspections.retrieve_name, variable, max_depth=10)) == "variable"
+    assert _call_nested(5, functools.partial(inspections.retrieve_name, variable, max_depth=3)) is None
+
+
 @pytest.mark.parametrize(
     "array, predicate, expected",
     [
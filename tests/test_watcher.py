@@ -0,0 +1,115 @@
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+
+import envcon
+from envcon import WatchedEnviron, configuration
+from helpers import rewrite
+
+
+@pytest.fixture
+def dot_env_file(tmp_path: Path, patch_environ: Dict[str, str]) -> Path:
+    patch_environ["OVERRIDDEN"] = "environ"
+    path = tmp_path / ".env"
+    path.write_text("SECRET=old\nPOOL_SIZE=4\nOVERRIDDEN=dot_env\n")
+    return path
+
+
+def test_poll(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    environ = WatchedEnviron(str(dot_env_file))
+    assert environ["SECRET"] == "old"
+    assert environ.poll() == set()
+
+    rewrite(dot_env_file, "SECRET=new\nPOOL_SIZE=4\nOVERRIDDEN=changed\nADDED=1\n")
+    assert environ.poll() == {"SECRET", "ADDED"}
+    assert environ["SECRET"] == "new"
+    assert environ["OVERRIDDEN"] == "environ"
+
+
+def test_subscribers(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    environ = WatchedEnviron(str(dot_env_file))
+    all_changes: List[Tuple[str, Optional[str], Optional[str]]] = []
+    secret_changes: List[Tuple[str, Optional[str], Optional[str]]] = []
+    environ.subscribe(lambda *change: all_changes.append(change))
+    unsubscribe = environ.subscribe(lambda *change: secret_changes.append(change), key="SECRET")
+
+    rewrite(dot_env_file, "SECRET=new\n")
+    environ.poll()
+    assert all_changes == [("POOL_SIZE", "4", None), ("SECRET", "old", "new")]
+    assert secret_changes == [("SECRET", "old", "new")]
+
+    unsubscribe()
+    rewrite(dot_env_file, "SECRET=newer\n")
+    environ.poll()
+    assert secret_changes == [("SECRET", "old", "new")]
+
+
+def test_failing_subscriber_does_not_stop_others(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    environ = WatchedEnviron(str(dot_env_file))
+    changes: List[str] = []
+    environ.subscribe(lambda *_: 1 / 0)
+    environ.subscribe(lambda key, *_: changes.append(key))
+    rewrite(dot_env_file, "SECRET=new\nPOOL_SIZE=4\nOVERRIDDEN=dot_env\n")
+    environ.poll()
+    assert changes == ["SECRET"]
+
+
+def test_reload_configurations(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    environ = WatchedEnviron(str(dot_env_file))
+
+    @configuration(prefix="", source=environ)
+    class Test:
+        SECRET: str
+        POOL_SIZE: int
+
+    rewrite(dot_env_file, "SECRET=rotated\nPOOL_SIZE=8\n")
+    environ.poll()
+    assert Test.SECRET == "rotated"
+    assert Test.POOL_SIZE == 8
+
+
+def test_changes_refreshed_by_a_reload_are_reported(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    environ = WatchedEnviron(str(dot_env_file), reload_configurations=False)
+    changes: List[str] = []
+    environ.subscribe(lambda key, *_: changes.append(key))
+
+    @configuration(prefix="", source=environ)
+    class Test:
+        SECRET: str
+
+    rewrite(dot_env_file, "SECRET=rotated\nPOOL_SIZE=4\nOVERRIDDEN=dot_env\n")
+    assert envcon.reload(Test) == {"SECRET"}  # refreshes the source before the watcher polls
+    assert environ.poll() == {"SECRET"}
+    assert changes == ["SECRET"]
+
+
+def test_subscribers_notified_when_reload_fails(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    environ = WatchedEnviron(str(dot_env_file))
+    changes: List[str] = []
+    environ.subscribe(lambda key, *_: changes.append(key))
+
+    @configuration(prefix="", source=environ)
+    class Test:
+        POOL_SIZE: int
+
+    rewrite(dot_env_file, "SECRET=new\nPOOL_SIZE=many\nOVERRIDDEN=dot_env\n")
+    with pytest.raises(ValueError):
+        environ.poll()
+    assert changes == ["POOL_SIZE", "SECRET"]
+    assert Test.POOL_SIZE == 4
+
+
+def test_background_thread(patch_environ: Dict[str, str], dot_env_file: Path) -> None:
+    changed = threading.Event()
+    with WatchedEnviron(str(dot_env_file), interval=0.01) as environ:
+        environ.subscribe(lambda *_: changed.set(), key="SECRET")
+        rewrite(dot_env_file, "SECRET=new\n")
+        assert changed.wait(timeout=5)
+    assert environ["SECRET"] == "new"
+
+
+def test_invalid_interval(dot_env_file: Path) -> None:
+    with pytest.raises(ValueError):
+        WatchedEnviron(str(dot_env_file), interval=0)